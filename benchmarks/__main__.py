@@ -0,0 +1,75 @@
+import sys
+import shutil
+import logging
+import argparse
+import tempfile
+from typing import Dict, List, Optional
+from benchmarks.generator import Generator
+from benchmarks.scenarios import SCENARIOS
+from benchmarks import runner
+
+
+def _parse_set(values: List[str]) -> Dict[str, Dict[str, str]]:
+    extra: Dict[str, Dict[str, str]] = {}
+    for value in values:
+        key, _, val = value.partition("=")
+        section, _, name = key.partition(".")
+        extra.setdefault(section, {})[name] = val
+    return extra
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="benchmark cdocs on generated roots"
+    )
+    defaults = Generator()
+    for name, value in defaults.settings().items():
+        parser.add_argument(f"--{name}", type=type(value), default=value)
+    parser.add_argument(
+        "--scenarios", default=None, help=f"csv of: {', '.join(SCENARIOS)}. default is all."
+    )
+    parser.add_argument("--passes", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        help="config for the roots as section.key=value, e.g. index.enabled=true",
+    )
+    parser.add_argument("--dir", default=None, help="generate here and keep the files")
+    parser.add_argument("--save", default=None, help="write the results as a baseline")
+    parser.add_argument("--compare", default=None, help="baseline to check against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="share worse that is a regression"
+    )
+    args = parser.parse_args(argv)
+    logging.getLogger("").setLevel(logging.WARNING)
+
+    settings = {name: getattr(args, name) for name in defaults.settings()}
+    generator = Generator(**settings)
+    path = args.dir if args.dir is not None else tempfile.mkdtemp(prefix="cdocs-bench")
+    try:
+        tree = generator.generate(path, _parse_set(args.set))
+        print(f"generated {tree.to_dict()} in {path}")
+        names = None if args.scenarios is None else args.scenarios.split(",")
+        results = runner.Runner(tree, args.passes, args.warmup).run(names)
+    finally:
+        if args.dir is None:
+            shutil.rmtree(path, ignore_errors=True)
+    runner.report(results)
+    if args.save is not None:
+        runner.save(args.save, settings, results)
+    if args.compare is not None:
+        baseline = runner.load(args.compare)
+        if baseline.get("settings") != settings:
+            print("warning: the baseline was made with other settings")
+        regressions = runner.compare(baseline, results, args.threshold)
+        for line in regressions:
+            print(f"regression: {line}")
+        if len(regressions) > 0:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
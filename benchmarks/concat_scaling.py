@@ -0,0 +1,72 @@
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+from typing import Dict, List, Optional
+from cdocs.cdocs import Cdocs
+from cdocs.simple_config import SimpleConfig
+
+#
+# times SimpleConcatter.concat over more and more parts. with the parts'
+# docs already rendered, the time per part should stay flat as the
+# number of parts grows.
+#
+
+
+def _root(path: str, parts: int, kind: str) -> Cdocs:
+    root = os.path.join(path, kind)
+    os.makedirs(os.path.join(root, "c"), exist_ok=True)
+    for n in range(parts):
+        with open(os.path.join(root, "c", f"p{n}.{kind}"), "w") as f:
+            if kind == "json":
+                f.write(json.dumps({f"key{n}": f"value {n}", "shared": n}))
+            else:
+                f.write(f"part {n} of the text " * 8)
+    config = os.path.join(path, f"{kind}.ini")
+    with open(config, "w") as f:
+        f.write(f"[docs]\n{kind} = {root}\n[formats]\n{kind} = {kind}\n")
+    return Cdocs(root, SimpleConfig(config))
+
+
+def measure(cdocs: Cdocs, parts: int, repeat: int) -> float:
+    """microseconds per part"""
+    paths = [f"/c#p{n}" for n in range(parts)]
+    cdocs.concatter.concat(paths)
+    start = time.perf_counter_ns()
+    for _ in range(repeat):
+        cdocs.concatter.concat(paths)
+    return (time.perf_counter_ns() - start) / 1000 / repeat / parts
+
+
+def run(sizes: List[int], repeat: int) -> Dict[str, Dict[int, float]]:
+    path = tempfile.mkdtemp(prefix="cdocs-concat")
+    try:
+        results: Dict[str, Dict[int, float]] = {}
+        for kind in ["xml", "json"]:
+            cdocs = _root(path, max(sizes), kind)
+            results[kind] = {n: measure(cdocs, n, repeat) for n in sizes}
+        return results
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.concat_scaling")
+    parser.add_argument("--sizes", default="10,100,1000", help="csv of part counts")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    logging.getLogger("").setLevel(logging.WARNING)
+    sizes = [int(n) for n in args.sizes.split(",")]
+    results = run(sizes, args.repeat)
+    print(f"{'parts':>8}" + "".join(f"{kind + ' us/part':>16}" for kind in results))
+    for n in sizes:
+        print(f"{n:>8}" + "".join(f"{results[kind][n]:>16.2f}" for kind in results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+import os
+import json
+import random
+from typing import Dict, List, Optional
+
+
+class Tree(object):
+    """
+    Tree is a generated set of roots: the config.ini that names them and
+    the docpaths the scenarios use. docpaths are the same in every root.
+    """
+
+    def __init__(self, path: str, config_path: str, rootnames: List[str]):
+        self.path = path
+        self.config_path = config_path
+        self.rootnames = rootnames
+        self.docpaths: List[str] = []
+        self.dirpaths: List[str] = []
+        self.pluspaths: List[str] = []
+        self.concatpaths: List[str] = []
+        self.misspaths: List[str] = []
+        # docs that only the last root has
+        self.lastpaths: List[str] = []
+
+    def to_dict(self) -> Dict:
+        return {
+            "roots": len(self.rootnames),
+            "docs": len(self.docpaths),
+            "dirs": len(self.dirpaths),
+            "pluspaths": len(self.pluspaths),
+            "concats": len(self.concatpaths),
+        }
+
+
+class Generator(object):
+    """
+    Generator writes synthetic roots for benchmarking. the same settings
+    and seed always give the same files.
+
+    depth: levels of directories below each root
+    fanout: directories in each directory
+    docs: docs in each directory
+    roots: number of roots
+    tokens: share of directories that have a tokens.json. labels the same.
+    keys: keys in each tokens and labels file
+    complexity: 0 for plain docs, 1 for docs using tokens and labels, 2 for
+        docs that also loop and pull in a sibling doc
+    plus: number of plus paths, each joining 2 to 4 docs
+    concat: share of directories that have a .concat file
+    parts: docs in each .concat file
+    """
+
+    def __init__(
+        self,
+        depth: int = 3,
+        fanout: int = 4,
+        docs: int = 4,
+        roots: int = 2,
+        tokens: float = 0.5,
+        labels: float = 0.5,
+        keys: int = 10,
+        complexity: int = 1,
+        plus: int = 50,
+        concat: float = 0.25,
+        parts: int = 4,
+        seed: int = 42,
+    ):
+        self.depth = depth
+        self.fanout = fanout
+        self.docs = docs
+        self.roots = roots
+        self.tokens = tokens
+        self.labels = labels
+        self.keys = keys
+        self.complexity = complexity
+        self.plus = plus
+        self.concat = concat
+        self.parts = parts
+        self.seed = seed
+
+    def settings(self) -> Dict:
+        return dict(vars(self))
+
+    def generate(self, path: str, extra: Optional[Dict[str, Dict[str, str]]] = None) -> Tree:
+        """
+        writes the roots and a config.ini under path. extra is more config,
+        by section, for trying out settings like [index] or [cache].
+        """
+        rootnames = [f"root{i}" for i in range(self.roots)]
+        tree = Tree(path, os.path.join(path, "config.ini"), rootnames)
+        for i, rootname in enumerate(rootnames):
+            # every root has the same shape. the content differs.
+            self._write_root(os.path.join(path, rootname), random.Random(self.seed + i), tree, i == 0)
+        rand = random.Random(self.seed)
+        for _ in range(self.plus):
+            dirpath = rand.choice(tree.dirpaths)
+            names = rand.sample(range(self.docs), min(self.docs, rand.randint(2, 4)))
+            tree.pluspaths.append(f"{dirpath}#" + "+".join(f"doc{n}" for n in names))
+        tree.misspaths = [f"{p}/nothing/here" for p in tree.dirpaths]
+        last = os.path.join(path, rootnames[-1], "only")
+        os.makedirs(last, exist_ok=True)
+        for n in range(self.docs):
+            self._write(os.path.join(last, f"doc{n}.xml"), f"only doc {n}")
+            tree.lastpaths.append(f"/only/doc{n}")
+        self._write_config(tree, extra)
+        return tree
+
+    def _write_root(self, root: str, rand: random.Random, tree: Tree, first: bool) -> None:
+        os.makedirs(root, exist_ok=True)
+        dirs = [""]
+        for _ in range(self.depth):
+            dirs = [f"{d}/d{i}" for d in dirs for i in range(self.fanout)]
+            for d in dirs:
+                os.makedirs(root + d, exist_ok=True)
+                self._write_dir(root, d, rand, tree if first else None)
+        self._write_dir(root, "", rand, None)
+
+    def _write_dir(self, root: str, d: str, rand: random.Random, tree: Optional[Tree]) -> None:
+        directory = root + d
+        if rand.random() < self.tokens:
+            self._write(os.path.join(directory, "tokens.json"), json.dumps(self._dict("token", rand)))
+        if rand.random() < self.labels:
+            self._write(os.path.join(directory, "labels.json"), json.dumps(self._dict("label", rand)))
+        for n in range(self.docs):
+            self._write(os.path.join(directory, f"doc{n}.xml"), self._doc(d, n, rand))
+        concat = rand.random() < self.concat
+        if concat:
+            lines = [f"{d}#doc{rand.randrange(self.docs)}" for _ in range(self.parts)]
+            self._write(os.path.join(directory, "page.concat"), "\n".join(lines))
+        if tree is not None and d != "":
+            tree.dirpaths.append(d)
+            tree.docpaths += [f"{d}/doc{n}" for n in range(self.docs)]
+            if concat:
+                tree.concatpaths.append(f"{d}/page.concat")
+
+    def _dict(self, kind: str, rand: random.Random) -> Dict[str, str]:
+        return {f"{kind}{k}": f"{kind} {k} {rand.randrange(10000)}" for k in range(self.keys)}
+
+    def _doc(self, d: str, n: int, rand: random.Random) -> str:
+        text = f"doc {n} in {d or '/'}. " * 4
+        if self.complexity == 0:
+            return text
+        k = rand.randrange(self.keys)
+        doc = text + f"{{{{ token{k} }}}} {{{{ label__label{k} }}}}"
+        if self.complexity > 1 and n > 0:
+            doc += "{% for i in range(3) %}{{ i }} {{ token" + str(k) + " }} {% endfor %}"
+            doc += "{{ get_doc('" + f"{d}#doc{n - 1}" + "') }}"
+        return doc
+
+    def _write_config(self, tree: Tree, extra: Optional[Dict[str, Dict[str, str]]]) -> None:
+        sections: Dict[str, Dict[str, str]] = {
+            "docs": {name: os.path.join(tree.path, name) for name in tree.rootnames},
+            "formats": {name: "xml" for name in tree.rootnames},
+            "filenames": {
+                "tokens": "tokens.json",
+                "labels": "labels.json",
+                "hashmark": "#",
+                "plus": "+",
+            },
+        }
+        for section, values in (extra or {}).items():
+            sections.setdefault(section, {}).update(values)
+        with open(tree.config_path, "w") as f:
+            for section, values in sections.items():
+                f.write(f"[{section}]\n")
+                for key, value in values.items():
+                    f.write(f"{key} = {value}\n")
+
+    def _write(self, path: str, content: str) -> None:
+        with open(path, "w") as f:
+            f.write(content)
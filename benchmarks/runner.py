@@ -0,0 +1,136 @@
+import gc
+import sys
+import json
+import time
+import platform
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+from benchmarks.generator import Tree
+from benchmarks.scenarios import SCENARIOS, Operation
+
+# the measures compared against a baseline, and whether bigger is better
+MEASURES = {"ops_per_sec": True, "p50_us": False, "p99_us": False, "peak_kb": False}
+
+
+def percentile(values: List[float], p: float) -> float:
+    if len(values) == 0:
+        return 0.0
+    ordered = sorted(values)
+    i = min(len(ordered) - 1, max(0, int(round(p / 100 * (len(ordered) - 1)))))
+    return ordered[i]
+
+
+class Runner(object):
+    """
+    Runner times scenarios against a generated tree. each scenario's
+    operations are run once to warm up, then timed for a number of
+    passes. peak memory is taken in a separate pass, so that tracing
+    allocations does not slow the timed passes.
+    """
+
+    def __init__(self, tree: Tree, passes: int = 5, warmup: int = 1):
+        self._tree = tree
+        self._passes = passes
+        self._warmup = warmup
+
+    def run(self, names: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+        results = {}
+        for name in names or list(SCENARIOS):
+            if name not in SCENARIOS:
+                raise KeyError(f"no scenario named {name}. try: {', '.join(SCENARIOS)}")
+            results[name] = self.measure(name)
+        return results
+
+    def measure(self, name: str) -> Dict[str, float]:
+        ops, reset = SCENARIOS[name](self._tree)
+        if len(ops) == 0:
+            return {"ops": 0, "ops_per_sec": 0.0, "p50_us": 0.0, "p99_us": 0.0, "peak_kb": 0.0}
+        for _ in range(self._warmup):
+            reset()
+            self._time(ops)
+        latencies: List[float] = []
+        gc.collect()
+        for _ in range(self._passes):
+            reset()
+            latencies += self._time(ops)
+        total = sum(latencies)
+        return {
+            "ops": len(latencies),
+            "ops_per_sec": len(latencies) / (total / 1e6) if total > 0 else 0.0,
+            "p50_us": percentile(latencies, 50),
+            "p99_us": percentile(latencies, 99),
+            "peak_kb": self._peak(ops, reset) / 1024,
+        }
+
+    def _time(self, ops: List[Operation]) -> List[float]:
+        latencies = []
+        clock = time.perf_counter_ns
+        for op in ops:
+            start = clock()
+            op()
+            latencies.append((clock() - start) / 1000)
+        return latencies
+
+    def _peak(self, ops: List[Operation], reset: Callable[[], None]) -> int:
+        reset()
+        tracemalloc.start()
+        try:
+            for op in ops:
+                op()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+
+def save(path: str, settings: Dict, results: Dict[str, Dict[str, float]]) -> None:
+    baseline = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": settings,
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=1)
+
+
+def load(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(
+    baseline: Dict, results: Dict[str, Dict[str, float]], threshold: float = 0.2
+) -> List[str]:
+    """
+    returns a line for each measure that is more than threshold worse
+    than in the baseline. scenarios missing from either side are skipped.
+    """
+    regressions = []
+    old_results = baseline.get("results", {})
+    for name, result in results.items():
+        old = old_results.get(name)
+        if old is None:
+            continue
+        for measure, bigger_is_better in MEASURES.items():
+            before = old.get(measure, 0)
+            after = result.get(measure, 0)
+            if before <= 0:
+                continue
+            change = (after - before) / before
+            worse = -change if bigger_is_better else change
+            if worse > threshold:
+                regressions.append(
+                    f"{name}: {measure} {before:.1f} -> {after:.1f} ({change:+.0%})"
+                )
+    return regressions
+
+
+def report(results: Dict[str, Dict[str, float]], out=sys.stdout) -> None:
+    out.write(
+        f"{'scenario':<20}{'ops':>8}{'ops/sec':>12}{'p50 us':>10}{'p99 us':>10}{'peak kb':>10}\n"
+    )
+    for name, r in results.items():
+        out.write(
+            f"{name:<20}{r['ops']:>8}{r['ops_per_sec']:>12.0f}"
+            + f"{r['p50_us']:>10.1f}{r['p99_us']:>10.1f}{r['peak_kb']:>10.0f}\n"
+        )
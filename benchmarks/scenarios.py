@@ -0,0 +1,124 @@
+from typing import Callable, Dict, Iterator, List, Tuple
+from cdocs.context import Context
+from cdocs.context_metadata import ContextMetadata
+from cdocs.simple_config import SimpleConfig
+from benchmarks.generator import Tree
+
+#
+# a scenario sets up against a tree and returns the operations to time.
+# each operation is one call. scenarios that want cold calls clear the
+# caches in their operations, outside of the timed call where they can.
+#
+Operation = Callable[[], object]
+Scenario = Callable[[Tree], Tuple[List[Operation], Callable[[], None]]]
+
+SCENARIOS: Dict[str, Scenario] = {}
+
+
+def scenario(name: str):
+    def register(fn: Scenario) -> Scenario:
+        SCENARIOS[name] = fn
+        return fn
+
+    return register
+
+
+def context_for(tree: Tree) -> Context:
+    return Context(ContextMetadata(SimpleConfig(tree.config_path)))
+
+
+def _clear(context: Context) -> Callable[[], None]:
+    def clear() -> None:
+        for cdocs in context.cdocs:
+            cdocs.render_cache.clear()
+
+    return clear
+
+
+def _nothing() -> None:
+    pass
+
+
+def _calls(fn: Callable, paths: List[str]) -> List[Operation]:
+    return [lambda p=p: fn(p) for p in paths]
+
+
+@scenario("get_doc")
+def get_doc(tree: Tree):
+    """warm: rendered docs come from the render cache"""
+    cdocs = context_for(tree).cdocs[0]
+    return _calls(cdocs.get_doc, tree.docpaths), _nothing
+
+
+@scenario("get_doc_cold")
+def get_doc_cold(tree: Tree):
+    """rendered docs are dropped before each pass"""
+    context = context_for(tree)
+    return _calls(context.cdocs[0].get_doc, tree.docpaths), _clear(context)
+
+
+@scenario("get_doc_plus")
+def get_doc_plus(tree: Tree):
+    context = context_for(tree)
+    return _calls(context.cdocs[0].get_doc, tree.pluspaths), _clear(context)
+
+
+@scenario("get_concat_doc")
+def get_concat_doc(tree: Tree):
+    context = context_for(tree)
+    return _calls(context.cdocs[0].get_concat_doc, tree.concatpaths), _clear(context)
+
+
+@scenario("get_labels")
+def get_labels(tree: Tree):
+    cdocs = context_for(tree).cdocs[0]
+    return _calls(cdocs.get_labels, tree.dirpaths), _nothing
+
+
+@scenario("get_tokens")
+def get_tokens(tree: Tree):
+    cdocs = context_for(tree).cdocs[0]
+    return _calls(cdocs.get_tokens, tree.dirpaths), _nothing
+
+
+@scenario("list_docs")
+def list_docs(tree: Tree):
+    cdocs = context_for(tree).cdocs[0]
+    return _calls(cdocs.list_docs, tree.dirpaths), _nothing
+
+
+@scenario("list_next_layer")
+def list_next_layer(tree: Tree):
+    cdocs = context_for(tree).cdocs[0]
+    return _calls(cdocs.list_next_layer, tree.dirpaths), _nothing
+
+
+@scenario("context_hit")
+def context_hit(tree: Tree):
+    """found in the first root asked"""
+    context = context_for(tree)
+    roots = list(tree.rootnames)
+    ops = [lambda p=p: context.get_doc_from_roots(roots, p) for p in tree.docpaths]
+    return ops, _clear(context)
+
+
+@scenario("context_last_root")
+def context_last_root(tree: Tree):
+    """found only after every other root is asked"""
+    context = context_for(tree)
+    roots = list(tree.rootnames)
+    ops = [lambda p=p: context.get_doc_from_roots(roots, p) for p in tree.lastpaths]
+    return ops, _clear(context)
+
+
+@scenario("context_miss")
+def context_miss(tree: Tree):
+    """in no root. every root is asked and the not found doc is returned"""
+    context = context_for(tree)
+    roots = list(tree.rootnames)
+    ops = [lambda p=p: context.get_doc_from_roots(roots, p, False) for p in tree.misspaths]
+    return ops, _clear(context)
+
+
+def names() -> Iterator[str]:
+    return iter(SCENARIOS)
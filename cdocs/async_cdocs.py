@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import functools
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from jinja2 import Environment
+from cdocs.contextual_docs import Doc, DocPath, JsonDict
+from cdocs.cdocs import Cdocs
+from cdocs.cdocs_loader import CdocsLoader
+from cdocs.template_cache import TemplateCache
+
+
+def create_executor(config, name: str) -> ThreadPoolExecutor:
+    workers = int(config.get("async", "workers", "8"))
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+
+
+class AsyncCdocs(object):
+    """
+    AsyncCdocs has the ContextualDocs methods of a Cdocs as coroutines.
+    the work, the stats and reads and rendering, is done on a bounded
+    thread pool so the event loop is never blocked. render() renders a
+    template on the loop in jinja's async mode, awaiting the docs it
+    pulls in.
+    """
+
+    def __init__(self, cdocs: Cdocs, executor: Optional[Executor] = None, context=None):
+        # can't type hint context because circular
+        self._cdocs = cdocs
+        self._context = context
+        self._owns_executor = executor is None
+        self._executor = (
+            create_executor(cdocs.config, f"cdocs-{cdocs.rootname}")
+            if executor is None
+            else executor
+        )
+        self._environment = None
+        self._templates = TemplateCache(int(cdocs.config.get("cache", "templates", "256")))
+
+    @property
+    def cdocs(self) -> Cdocs:
+        return self._cdocs
+
+    @property
+    def executor(self) -> Executor:
+        return self._executor
+
+    @property
+    def rootname(self) -> str:
+        return self._cdocs.rootname
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """runs fn on the executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(fn, *args, **kwargs)
+        )
+
+    def close(self) -> None:
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
+
+    # ===================
+    # ContextualDocs methods
+    # ===================
+
+    async def get_doc(self, path: DocPath, notfound: Optional[bool] = True) -> Optional[Doc]:
+        return await self.run(self._cdocs.get_doc, path, notfound)
+
+    async def get_compose_doc(self, path: DocPath) -> Optional[Doc]:
+        return await self.run(self._cdocs.get_compose_doc, path)
+
+    async def get_concat_doc(self, path: DocPath) -> Optional[Doc]:
+        return await self.run(self._cdocs.get_concat_doc, path)
+
+    async def get_labels(self, path: DocPath, recurse: Optional[bool] = True) -> JsonDict:
+        return await self.run(self._cdocs.get_labels, path, recurse)
+
+    async def get_tokens(self, path: DocPath, recurse: Optional[bool] = True) -> JsonDict:
+        return await self.run(self._cdocs.get_tokens, path, recurse)
+
+    async def list_docs(self, path: DocPath) -> List[Doc]:
+        return await self.run(self._cdocs.list_docs, path)
+
+    async def list_next_layer(self, path: DocPath) -> List[Doc]:
+        return await self.run(self._cdocs.list_next_layer, path)
+
+    # ===================
+    # async rendering
+    # ===================
+
+    @property
+    def environment(self) -> Environment:
+        if self._environment is None:
+            self._environment = self._create_environment()
+        return self._environment
+
+    def _create_environment(self) -> Environment:
+        # includes and imports are loaded by docpath, as they are for
+        # sync templates. jinja's loaders are not async, so those reads
+        # happen on the loop.
+        env = Environment(
+            loader=CdocsLoader(self._cdocs),
+            enable_async=True,
+            auto_reload=True,
+            cache_size=int(self._cdocs.config.get("cache", "templates", "256")),
+        )
+        transformer = getattr(self._cdocs.transformer, "environment", None)
+        if transformer is not None:
+            env.globals.update(transformer.globals)
+        env.globals.update(self._globals())
+        return env
+
+    def _globals(self) -> Dict[str, Callable]:
+        # in async mode jinja awaits what these return
+        functions = {
+            "get_doc": self.get_doc,
+            "get_compose_doc": self.get_compose_doc,
+            "get_concat_doc": self.get_concat_doc,
+        }
+        if self._context is not None:
+            functions["get_doc_from_roots"] = self._context.get_doc_from_roots
+            functions["get_compose_doc_from_roots"] = self._context.get_compose_doc_from_roots
+            functions["get_concat_doc_from_roots"] = self._context.get_concat_doc_from_roots
+            functions["get_labels_from_roots"] = self._context.get_labels_from_roots
+        return functions
+
+    async def render(
+        self, content: str, path: DocPath, tokens: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        renders content as a template for path. if tokens are not given
+        the tokens and labels for path are used. get_doc and the other
+        doc methods used in the template are awaited, not blocked on.
+        """
+        if tokens is None:
+            tokens = await self.get_tokens(path)
+        key = self._templates.key_for(content)
+        template = self._templates.get(key)
+        if template is None:
+            template = self.environment.from_string(content)
+            self._templates.put(key, template)
+        logging.info("AsyncCdocs.render: rendering for %s", path)
+        return await template.render_async(tokens)
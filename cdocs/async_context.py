@@ -0,0 +1,232 @@
+import asyncio
+import logging
+import functools
+from typing import Any, Dict, List, Optional
+from cdocs.contextual_docs import Doc, DocPath, JsonDict
+from cdocs.context import Context
+from cdocs.context_metadata import ContextMetadata
+from cdocs.async_cdocs import AsyncCdocs, create_executor
+
+
+class AsyncContext(object):
+    """
+    AsyncContext has the ContextualDocs and MultiContextDocs methods of
+    a Context as coroutines. the roots share one bounded thread pool.
+    multi-root lookups ask every root at once and keep the result of
+    the first root in order, so the answer is the same as Context's.
+    """
+
+    def __init__(
+        self,
+        metadata: Optional[ContextMetadata] = None,
+        context: Optional[Context] = None,
+    ):
+        if context is None:
+            context = Context(ContextMetadata() if metadata is None else metadata)
+        self._context = context
+        self._executor = create_executor(context.metadata.config, "cdocs")
+        self._keyed_cdocs = {
+            k: AsyncCdocs(v, self._executor, self)
+            for k, v in context.keyed_cdocs.items()
+        }
+
+    @property
+    def context(self) -> Context:
+        return self._context
+
+    @property
+    def metadata(self) -> ContextMetadata:
+        return self._context.metadata
+
+    @property
+    def keyed_cdocs(self) -> Dict[str, AsyncCdocs]:
+        return self._keyed_cdocs
+
+    async def run(self, fn, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(fn, *args, **kwargs)
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
+
+    # ==== ContextualDocs ==================
+
+    async def get_concat_doc(self, path: DocPath) -> Optional[Doc]:
+        return await self.get_concat_doc_from_roots(self.metadata.root_names, path)
+
+    async def get_compose_doc(self, path: DocPath) -> Optional[Doc]:
+        return await self.get_compose_doc_from_roots(self.metadata.root_names, path)
+
+    async def get_doc(
+        self,
+        path: DocPath,
+        notfound: Optional[bool] = True,
+        splitplus: Optional[bool] = True,
+    ) -> Optional[Doc]:
+        return await self.get_doc_from_roots(
+            self.metadata.root_names, path, notfound, splitplus
+        )
+
+    async def get_labels(
+        self, path: DocPath, recurse: Optional[bool] = True
+    ) -> Optional[JsonDict]:
+        return await self.get_labels_from_roots(self.metadata.root_names, path, recurse)
+
+    async def get_tokens(
+        self, path: DocPath, recurse: Optional[bool] = True
+    ) -> Optional[JsonDict]:
+        return await self.get_tokens_from_roots(self.metadata.root_names, path, recurse)
+
+    async def list_docs(self, path: DocPath) -> List[Doc]:
+        return await self.list_docs_from_roots(self.metadata.root_names, path)
+
+    async def list_next_layer(self, path: DocPath) -> List[Doc]:
+        return await self.list_next_layer_from_roots(self.metadata.root_names, path)
+
+    # ==== MultiContextDocs ==================
+    #
+    # these only look at config, so they are not coroutines
+    #
+
+    def get_filetype(self, path: DocPath) -> str:
+        return self._context.get_filetype(path)
+
+    def get_root_names_accepting_path(self, path: DocPath) -> List[str]:
+        return self._context.get_root_names_accepting_path(path)
+
+    def filter_root_names_for_path(self, roots: List[str], path: DocPath) -> List[str]:
+        return self._context.filter_root_names_for_path(roots, path)
+
+    async def list_docs_from_roots(self, rootnames: List[str], path: DocPath) -> List[Doc]:
+        rootnames = self.filter_root_names_for_path(rootnames, path)
+        found = await asyncio.gather(
+            *[self.keyed_cdocs[_].list_docs(path) for _ in rootnames]
+        )
+        return self._union(found)
+
+    async def list_next_layer_from_roots(self, rootnames: List[str], path: DocPath) -> List[Doc]:
+        rootnames = self.filter_root_names_for_path(rootnames, path)
+        found = await asyncio.gather(
+            *[self.keyed_cdocs[_].list_next_layer(path) for _ in rootnames]
+        )
+        return self._union(found)
+
+    def _union(self, found: List[List[Doc]]) -> List[Doc]:
+        docs = []
+        for somedocs in found:
+            for doc in somedocs if somedocs is not None else []:
+                if doc not in docs:
+                    docs.append(doc)
+        return docs
+
+    async def get_labels_from_roots(
+        self, rootnames: List[str], path: DocPath, recurse: Optional[bool] = True
+    ) -> Optional[JsonDict]:
+        rootnames = self.filter_root_names_for_path(rootnames, path)
+        found = await asyncio.gather(
+            *[self.keyed_cdocs[_].get_labels(path, recurse) for _ in rootnames]
+        )
+        labels = {}
+        for some in found:
+            labels = {**some, **labels}
+        return labels
+
+    async def get_tokens_from_roots(
+        self, rootnames: List[str], path: DocPath, recurse: Optional[bool] = True
+    ) -> Optional[JsonDict]:
+        rootnames = self.filter_root_names_for_path(rootnames, path)
+        found = await asyncio.gather(
+            *[self.keyed_cdocs[_].get_tokens(path, recurse) for _ in rootnames]
+        )
+        tokens = {}
+        for some in found:
+            tokens = {**some, **tokens}
+        return tokens
+
+    async def get_compose_doc_from_roots(
+        self, rootnames: List[str], path: DocPath, notfound: Optional[bool] = True
+    ) -> Optional[Doc]:
+        rootnames = self.filter_root_names_for_path(rootnames, path)
+        doc = await self._first(
+            [self.keyed_cdocs[_].get_compose_doc(path) for _ in rootnames]
+        )
+        if doc is None and notfound:
+            return await self.run(self._context._get_default_not_found)
+        return doc
+
+    async def get_concat_doc_from_roots(
+        self, rootnames: List[str], path: DocPath, notfound: Optional[bool] = True
+    ) -> Optional[Doc]:
+        rootnames = self.filter_root_names_for_path(rootnames, path)
+        doc = await self._first(
+            [self.keyed_cdocs[_].get_concat_doc(path) for _ in rootnames]
+        )
+        if doc is None and notfound:
+            return await self.run(self._context._get_default_not_found)
+        return doc
+
+    async def get_doc_from_roots(
+        self,
+        rootnames: List[str],
+        path: DocPath,
+        notfound: Optional[bool] = True,
+        splitplus: Optional[bool] = True,
+    ) -> Optional[Doc]:
+        """see Context.get_doc_from_roots"""
+        plusmark = self.metadata.config.get("filenames", "plus")
+        if splitplus and path.find(plusmark) > -1:
+            # each part is looked up across the roots. the sync version
+            # already does that, so it runs as one unit of work.
+            return await self.run(
+                self._context.get_doc_from_roots, rootnames, path, notfound, splitplus
+            )
+        rootnames = self.filter_root_names_for_path(rootnames, path)
+        doc = await self._first(
+            [self.keyed_cdocs[_].get_doc(path, False) for _ in rootnames]
+        )
+        if doc is None and notfound:
+            return await self.run(self._context._get_default_not_found)
+        return doc
+
+    async def _first(self, lookups: List) -> Optional[Doc]:
+        """
+        runs the lookups at once and returns the first not-None result in
+        the order given. lookups after the winner that have not started
+        are cancelled.
+        """
+        tasks = [asyncio.ensure_future(lookup) for lookup in lookups]
+        try:
+            for task in tasks:
+                doc = await task
+                if doc is not None:
+                    return doc
+            return None
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            logging.debug("AsyncContext._first: checked %s roots", len(tasks))
+
+    # ==== async rendering ==================
+
+    async def render(
+        self,
+        content: str,
+        path: DocPath,
+        rootname: Optional[str] = None,
+        tokens: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """renders content in jinja's async mode using the named root, or the first root"""
+        if rootname is None:
+            rootname = self.metadata.root_names[0]
+        if tokens is None:
+            tokens = await self.get_tokens(path)
+        return await self.keyed_cdocs[rootname].render(content, path, tokens)
@@ -0,0 +1,190 @@
+import os
+import stat
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from cdocs.contextual_docs import DocPath, FilePath
+from cdocs.index import Index, Stamp
+from cdocs.simple_index import SimpleIndex
+import cdocs.render_scope as render_scope
+
+#
+# the batch indexes in use on this thread, by id of the cdocs they are for
+#
+_local = threading.local()
+
+
+def batch_index(cdocs) -> Optional[Index]:
+    indexes = getattr(_local, "indexes", None)
+    if not indexes:
+        return None
+    return indexes.get(id(cdocs))
+
+
+class BatchResult(object):
+    """the result for one path in a batch: a value or the error that stopped it"""
+
+    __slots__ = ("path", "value", "error")
+
+    def __init__(self, path: DocPath, value: Any = None, error: Optional[Exception] = None):
+        self.path = path
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        return f"BatchResult(path={self.path!r}, value={self.value!r}, error={self.error!r})"
+
+
+class BatchIndex(Index):
+    """
+    BatchIndex remembers what it is told for the length of a batch, so
+    the tokens and labels files in the chains that paths share are stat'd
+    once. over the filesystem, a directory is scanned once and every
+    question about its entries is answered from that scan.
+    """
+
+    def __init__(self, index: Index):
+        self._index = index
+        self._scans = isinstance(index, SimpleIndex)
+        # directory -> {name: (is a directory, stamp)}, or None if no directory
+        self._dirs: Dict[str, Optional[Dict[str, Tuple[bool, Optional[Stamp]]]]] = {}
+        self._answers: Dict[Tuple[str, FilePath], Any] = {}
+
+    def exists(self, filepath: FilePath) -> bool:
+        if self._scans:
+            return self._entry(filepath) is not None
+        return self._ask("exists", filepath)
+
+    def isfile(self, filepath: FilePath) -> bool:
+        if self._scans:
+            entry = self._entry(filepath)
+            return entry is not None and not entry[0]
+        return self._ask("isfile", filepath)
+
+    def isdir(self, filepath: FilePath) -> bool:
+        if self._scans:
+            entry = self._entry(filepath)
+            return entry is not None and entry[0]
+        return self._ask("isdir", filepath)
+
+    def listdir(self, filepath: FilePath) -> List[str]:
+        if self._scans:
+            entries = self._scan(filepath)
+            if entries is None:
+                raise FileNotFoundError(f"BatchIndex.listdir: no directory {filepath}")
+            return list(entries)
+        return list(self._ask("listdir", filepath))
+
+    def stat(self, filepath: FilePath) -> Optional[Stamp]:
+        if self._scans:
+            entry = self._entry(filepath)
+            return None if entry is None else entry[1]
+        return self._ask("stat", filepath)
+
+    def refresh(self, filepath: Optional[FilePath] = None) -> None:
+        self._dirs = {}
+        self._answers = {}
+        self._index.refresh(filepath)
+
+    def _ask(self, method: str, filepath: FilePath) -> Any:
+        key = (method, filepath)
+        if key not in self._answers:
+            self._answers[key] = getattr(self._index, method)(filepath)
+        return self._answers[key]
+
+    def _entry(self, filepath: FilePath) -> Optional[Tuple[bool, Optional[Stamp]]]:
+        path = os.path.normpath(filepath)
+        entries = self._scan(os.path.dirname(path) or ".")
+        return None if entries is None else entries.get(os.path.basename(path))
+
+    def _scan(self, directory: FilePath) -> Optional[Dict]:
+        directory = os.path.normpath(directory)
+        if directory in self._dirs:
+            return self._dirs[directory]
+        entries = None
+        try:
+            entries = {}
+            with os.scandir(directory) as scan:
+                for entry in scan:
+                    # an entry that can't be looked at, like a dangling link
+                    # or a file removed since the listing, is not there. the
+                    # rest of the directory still is.
+                    try:
+                        if entry.is_dir():
+                            entries[entry.name] = (True, None)
+                        else:
+                            st = entry.stat()
+                            regular = stat.S_ISREG(st.st_mode)
+                            entries[entry.name] = (
+                                False,
+                                (st.st_mtime_ns, st.st_size) if regular else None,
+                            )
+                    except OSError:
+                        continue
+        except OSError:
+            entries = None
+        self._dirs[directory] = entries
+        return entries
+
+
+def batch_directory(path: DocPath, hashmark: str = "#", plus: str = "+") -> str:
+    """the directory whose tokens and labels a path uses"""
+    for mark in [plus, hashmark]:
+        i = path.find(mark)
+        if i > -1:
+            path = path[0:i]
+    return path.strip("/")
+
+
+@contextmanager
+def batch(list_of_cdocs: List) -> Iterator[None]:
+    """while in a batch, the cdocs answer path questions from batch indexes"""
+    indexes = getattr(_local, "indexes", None)
+    if indexes is None:
+        indexes = {}
+        _local.indexes = indexes
+    added = []
+    for cdocs in list_of_cdocs:
+        if id(cdocs) not in indexes:
+            indexes[id(cdocs)] = BatchIndex(cdocs.index)
+            added.append(id(cdocs))
+    try:
+        yield
+    finally:
+        for key in added:
+            indexes.pop(key, None)
+
+
+def run_batch(
+    list_of_cdocs: List,
+    paths: List[DocPath],
+    fn: Callable[[DocPath], Any],
+    directory: Callable[[DocPath], str],
+) -> List[BatchResult]:
+    """
+    calls fn once for each distinct path. paths in the same directory are
+    done together, as they share their tokens and labels. results are in
+    the order of paths. an error is kept in its path's result and does not
+    stop the batch.
+    """
+    groups: Dict[str, List[DocPath]] = {}
+    for path in dict.fromkeys(paths):
+        groups.setdefault(directory(path), []).append(path)
+    results: Dict[DocPath, BatchResult] = {}
+    # the paths share one render scope, so docs and tokens and labels
+    # that paths have in common are found once
+    with batch(list_of_cdocs), render_scope.scope():
+        for adir, members in groups.items():
+            logging.debug("run_batch: %s paths in %s", len(members), adir)
+            for path in members:
+                try:
+                    results[path] = BatchResult(path, fn(path))
+                except Exception as e:
+                    logging.warning("run_batch: %s failed: %s", path, e)
+                    results[path] = BatchResult(path, None, e)
+    return [results[path] for path in paths]
@@ -0,0 +1,143 @@
+import os
+import mmap
+import mimetypes
+from typing import BinaryIO, Iterator, Optional, Tuple
+from cdocs.contextual_docs import DocPath, FilePath
+
+BLOCKSIZE = 64 * 1024
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    reads an http Range header of one range, like bytes=0-99, bytes=100-
+    or bytes=-100, into a start and an end, end not included. returns
+    None if there is no header or it can't be read, in which case the
+    whole file should be sent. raises ValueError if the range is not in
+    the file, which is a 416.
+    """
+    if header is None or not header.strip().startswith("bytes="):
+        return None
+    spec = header.strip()[6:]
+    if spec.find(",") > -1 or spec.find("-") == -1:
+        return None
+    first, _, last = spec.partition("-")
+    first, last = first.strip(), last.strip()
+    if first == last == "" or not all(p == "" or p.isdigit() for p in (first, last)):
+        return None
+    if first == "":
+        length = int(last)
+        if length == 0:
+            raise ValueError(f"range {header} is empty")
+        return (max(0, size - length), size)
+    start = int(first)
+    if last != "" and int(last) < start:
+        return None
+    end = size if last == "" else min(size, int(last) + 1)
+    if start >= size:
+        raise ValueError(f"range {header} is not in {size} bytes")
+    return (start, end)
+
+
+class BinaryDoc(object):
+    """
+    BinaryDoc is a file to be sent as it is. it holds where the file
+    is, its size and mtime, and the range of it wanted, and is not read
+    into memory. the bytes can be had as an open file, a file
+    descriptor for os.sendfile, an mmap backed memoryview, or chunks.
+    """
+
+    __slots__ = ("docpath", "filepath", "size", "mtime", "start", "end", "content_type")
+
+    def __init__(
+        self,
+        docpath: DocPath,
+        filepath: FilePath,
+        size: int,
+        mtime: float,
+        start: int = 0,
+        end: Optional[int] = None,
+    ):
+        self.docpath = docpath
+        self.filepath = filepath
+        self.size = size
+        self.mtime = mtime
+        self.start = start
+        self.end = size if end is None else end
+        self.content_type = mimetypes.guess_type(filepath)[0] or "application/octet-stream"
+
+    def __repr__(self):
+        return f"BinaryDoc({self.filepath}, {self.start}-{self.end} of {self.size})"
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start
+
+    @property
+    def partial(self) -> bool:
+        return self.start != 0 or self.end != self.size
+
+    def range(self, start: int, end: Optional[int] = None) -> "BinaryDoc":
+        """the same file limited to bytes start to end, end not included"""
+        end = self.size if end is None else min(end, self.size)
+        if start < 0 or start > end:
+            raise ValueError(f"bad range {start}-{end} of {self.size}")
+        return BinaryDoc(self.docpath, self.filepath, self.size, self.mtime, start, end)
+
+    def open(self) -> BinaryIO:
+        """an unbuffered file, at the start of the range"""
+        f = open(self.filepath, "rb", buffering=0)
+        if self.start > 0:
+            f.seek(self.start)
+        return f
+
+    def open_fd(self) -> int:
+        """a file descriptor, for os.sendfile. the caller closes it."""
+        return os.open(self.filepath, os.O_RDONLY)
+
+    def memoryview(self) -> memoryview:
+        """
+        the range as a read-only memoryview of an mmap of the file. the
+        map is released when the view and any slices of it are gone.
+        """
+        if self.length == 0:
+            return memoryview(b"")
+        offset = self.start - self.start % mmap.ALLOCATIONGRANULARITY
+        with open(self.filepath, "rb") as f:
+            mapped = mmap.mmap(
+                f.fileno(), self.end - offset, access=mmap.ACCESS_READ, offset=offset
+            )
+        return memoryview(mapped)[self.start - offset :]
+
+    def chunks(self, blocksize: int = BLOCKSIZE) -> Iterator[bytes]:
+        with self.open() as f:
+            left = self.length
+            while left > 0:
+                chunk = f.read(min(blocksize, left))
+                if not chunk:
+                    break
+                left -= len(chunk)
+                yield chunk
+
+    def sendfile(self, out_fd: int) -> int:
+        """sends the range to a socket with os.sendfile. returns the bytes sent."""
+        fd = self.open_fd()
+        try:
+            sent = 0
+            while sent < self.length:
+                n = os.sendfile(out_fd, fd, self.start + sent, self.length - sent)
+                if n == 0:
+                    break
+                sent += n
+            return sent
+        finally:
+            os.close(fd)
+
+    def wsgi(self, environ: dict):
+        """
+        a wsgi response body. the server's wsgi.file_wrapper is used for
+        a whole file, so it can use sendfile.
+        """
+        wrapper = environ.get("wsgi.file_wrapper")
+        if wrapper is not None and not self.partial:
+            return wrapper(self.open(), BLOCKSIZE)
+        return self.chunks()
@@ -1,4 +1,4 @@
-from typing import Optional, List, Dict
+from typing import Any, BinaryIO, Optional, List, Dict, Iterator
 from datetime import datetime
 from jinja2 import Template
 import logging
@@ -12,9 +12,10 @@ from cdocs.finder import Finder
 from cdocs.filer import Filer
 from cdocs.transformer import Transformer
 from cdocs.concatter import Concatter
-from cdocs.simple_transformer import SimpleTransformer
+from cdocs.simple_transformer import SimpleTransformer, is_template
 from cdocs.simple_concatter import SimpleConcatter
 from cdocs.simple_config import SimpleConfig
+from cdocs.config_snapshot import snapshot
 from cdocs.simple_reader import SimpleReader
 from cdocs.simple_lister import SimpleLister
 from cdocs.simple_pather import SimplePather
@@ -24,6 +25,23 @@ from cdocs.physical import Physical
 from cdocs.multi_context_docs import MultiContextDocs
 from cdocs.context_metadata import ContextMetadata
 from cdocs.changer import Changer
+from cdocs.index import Index
+from cdocs.simple_index import SimpleIndex
+from cdocs.root_index import RootIndex
+from cdocs.manifest_index import ManifestIndex, ManifestException, manifest_path
+from cdocs.render_cache import RenderCache
+from cdocs.json_cache import JsonCache, deep_merge, freeze, thaw
+from cdocs.json_codec import JsonCodec, create_codec
+from cdocs.binary_doc import BinaryDoc
+from cdocs.change_tree import ChangeTree
+from cdocs.batch import BatchResult, batch_directory, batch_index, run_batch
+from cdocs.watcher import Watcher, WatcherException
+from cdocs.polling_watcher import PollingWatcher
+import cdocs.inotify_watcher as inotify
+import cdocs.render_cache as dependencies
+import cdocs.render_scope as render_scope
+import cdocs.tracer as tracer
+from contextlib import contextmanager
 
 
 class DocNotFoundException(Exception):
@@ -42,6 +60,10 @@ class ComposeDocException(Exception):
     pass
 
 
+class JsonDocException(Exception):
+    pass
+
+
 class Cdocs(ContextualDocs, Physical, Changer):
     def __init__(
         self,
@@ -50,11 +72,12 @@ class Cdocs(ContextualDocs, Physical, Changer):
         context: Optional[MultiContextDocs] = None,
     ):
         super().__init__()
-        cfg = SimpleConfig(None) if config is None else config
+        # in a context, every root shares the context's snapshot
+        cfg = snapshot(SimpleConfig(None) if config is None else config)
         self._config = cfg
         self._context: MultiContextDocs = context
         self._docs_path: FilePath = docspath
-        logging.info(f"get_matching_key_for_value: {docspath}")
+        logging.info("get_matching_key_for_value: %s", docspath)
         self._rootname = cfg.get_matching_key_for_value("docs", docspath)
         if self._rootname is None:
             raise ConfigException(f"Cdocs.__init__: no rootname for {docspath}")
@@ -64,7 +87,18 @@ class Cdocs(ContextualDocs, Physical, Changer):
         self._hashmark: str = cfg.get("filenames", "hashmark", "#")
         self._plus: str = cfg.get("filenames", "plus", "+")
         self._accepts = None
+        self._index = self._create_index()
+        tracer.configure(cfg)
+        self._render_cache = RenderCache(
+            self._index,
+            int(cfg.get("cache", "rendered", "1024")),
+            float(cfg.get("cache", "check_interval", "0")),
+        )
+        self._json_cache = JsonCache(int(cfg.get("cache", "json", "1024")))
+        self._codec = create_codec(cfg.get("json", "codec", "auto"))
+        self._changes = ChangeTree(self)
 
+        self._watcher: Optional[Watcher] = None
         self._track_last_change = False
         self._last_change = None
         self._last_change = self.get_last_change()
@@ -79,14 +113,15 @@ class Cdocs(ContextualDocs, Physical, Changer):
         self._finder = SimpleFinder(self) if cfg.finder is None else cfg.finder
 
         if cfg.pather is None:
-            logging.info("Cdocs.__init__: config's pather is None: {cfg}")
-            metadata = ContextMetadata(cfg)
-            # metadata.config = cfg
+            logging.info("Cdocs.__init__: config's pather is None: %s", cfg)
+            metadata = getattr(context, "metadata", None)
+            if metadata is None or metadata.config is not cfg:
+                metadata = ContextMetadata(cfg)
             self._pather = SimplePather(metadata, self)
             pass
         else:
             self._pather = cfg.pather
-        logging.info(f"Cdocs.__init__: completed init. Cdocs is:\n{str(self)}")
+        logging.info("Cdocs.__init__: completed init. Cdocs is:\n%s", self)
 
     def __str__(self):
         return (
@@ -110,18 +145,120 @@ class Cdocs(ContextualDocs, Physical, Changer):
         )
 
     def _set_ext(self) -> None:
-        ext = self.config.get("defaults", "ext", "xml")
-        logging.info(f"cdocs._set_ext 1: {ext}")
-        ext = self.config.get("formats", self.rootname, ext)
-        logging.info(f"cdocs._set_ext 2: {ext}")
-        if ext.find(",") > -1:
-            self._exts = ext.split(",")
-        else:
-            self._exts = [ext]
+        self._exts = self.config.get_exts(self.rootname)
+        logging.info("cdocs._set_ext: %s", self._exts)
 
     def get_doc_root(self) -> FilePath:
         return FilePath(self._docs_path)
 
+    def _create_index(self) -> Index:
+        manifests = self.config.get("index", "manifests", None)
+        if manifests is not None and manifests.strip() != "":
+            path = manifest_path(manifests, self._rootname)
+            if os.path.exists(path):
+                try:
+                    return ManifestIndex(self._docs_path, path)
+                except ManifestException as e:
+                    logging.warning(f"Cdocs._create_index: cannot use {path}: {e}")
+            else:
+                logging.warning(f"Cdocs._create_index: no manifest at {path}")
+        enabled = self.config.get("index", "enabled", "false")
+        if enabled.strip().lower() == "true":
+            logging.info("Cdocs._create_index: indexing %s", self._docs_path)
+            return RootIndex(self._docs_path)
+        return SimpleIndex()
+
+    @property
+    def index(self) -> Index:
+        # in a batch, this thread shares what is learned about paths
+        # across the batch's docs
+        index = batch_index(self)
+        return self._index if index is None else index
+
+    @index.setter
+    def index(self, val: Index) -> None:
+        self._index = val
+        self._render_cache.index = val
+
+    @property
+    def render_cache(self) -> RenderCache:
+        return self._render_cache
+
+    @property
+    def json_cache(self) -> JsonCache:
+        return self._json_cache
+
+    @property
+    def codec(self) -> JsonCodec:
+        return self._codec
+
+    @property
+    def changes(self) -> ChangeTree:
+        return self._changes
+
+    def invalidate(self, filepaths: List[FilePath]) -> None:
+        """
+        drops what is held about these files, or about everything below
+        them when they are directories: index entries, tokens and labels,
+        and rendered docs that used them.
+        """
+        for filepath in filepaths:
+            self._index.refresh(filepath)
+        self._finder.invalidate(filepaths)
+        self._render_cache.invalidate(filepaths)
+        self._json_cache.invalidate(filepaths)
+        self._changes.invalidate(filepaths)
+
+    @property
+    def watcher(self) -> Optional[Watcher]:
+        return self._watcher
+
+    def watch(self, method: Optional[str] = None) -> Watcher:
+        """starts a watcher on this root, if one is not already running"""
+        if self._watcher is None or not self._watcher.running:
+            self._watcher = self._create_watcher(method)
+            self._watcher.start()
+        return self._watcher
+
+    def stop_watching(self) -> None:
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+    def _create_watcher(self, method: Optional[str] = None) -> Watcher:
+        if method is None:
+            method = self.config.get("watch", "method", "auto")
+        method = method.strip().lower()
+        interval = float(self.config.get("watch", "interval", "1"))
+        debounce = float(self.config.get("watch", "debounce", "0.1"))
+        if method in ["auto", "inotify"]:
+            if inotify.available():
+                return inotify.InotifyWatcher(self, interval, debounce)
+            if method == "inotify":
+                raise WatcherException("Cdocs._create_watcher: inotify is not available")
+            logging.info("Cdocs._create_watcher: no inotify. polling instead.")
+        elif method != "poll":
+            raise WatcherException(f"Cdocs._create_watcher: unknown method {method}")
+        return PollingWatcher(self, interval)
+
+    def _render_key(self, path: DocPath, method: str, notfound=None) -> tuple:
+        return (self._rootname, path.strip("/"), method, notfound)
+
+    def _render(self, key: tuple, render):
+        # a top-level call starts a scope. nested calls share it.
+        with render_scope.scope() as scope:
+            return scope.render(key, lambda: self._render_cache.render(key, render))
+
+    @contextmanager
+    def session(self):
+        """
+        calls made in a session share one render scope. each doc, and the
+        tokens and labels for each path, are found once, and are not
+        checked for changes until the session ends.
+        """
+        with render_scope.scope() as scope:
+            yield scope
+
     @property
     def concatter(self) -> Concatter:
         return self._concatter
@@ -205,20 +342,26 @@ class Cdocs(ContextualDocs, Physical, Changer):
     @property
     def accepts(self):
         if self._accepts is None:
-            logging.info(f"Cdocs.accepts: rootname: {self.rootname}")
-            a = self.config.get("accepts", self.rootname)
-            if a is None:
-                self._accepts = ["cdocs"]
-            else:
-                self._accepts = a.split(",")
-            logging.info(f"Cdocs.accepts: accepts: {self._accepts}")
+            logging.info("Cdocs.accepts: rootname: %s", self.rootname)
+            a = self.config.get_accepts(self.rootname)
+            self._accepts = ["cdocs"] if a is None else a
+            logging.info("Cdocs.accepts: accepts: %s", self._accepts)
         return self._accepts
 
     # ===================
     # abc methods
     # ===================
 
-    def get_last_change(self) -> datetime:
+    def get_last_change(self, path: Optional[DocPath] = None) -> datetime:
+        """
+        with a path, the last change of that docpath: its doc files, the
+        directories below it, and the tokens and labels files above it.
+        None if there is nothing at path. without a path, the last change
+        of the whole root, if it is tracked.
+        """
+        if path is not None:
+            version = self._changes.last_change(path)
+            return None if version is None else datetime.fromtimestamp(version / 1e9)
         if self.track_last_change:
             lcf = self._get_last_change_file_path()
             if os.path.exists(lcf):
@@ -235,7 +378,7 @@ class Cdocs(ContextualDocs, Physical, Changer):
     def _get_last_change_file_path(self):
         if self.track_last_change:
             path = f"{self.get_doc_root()}/.last_change"
-            logging.info(f"Cdocs._get_last_change_file_path: path: {path}")
+            logging.info("Cdocs._get_last_change_file_path: path: %s", path)
             if not os.path.exists(path):
                 try:
                     os.makedirs(self.get_doc_root())
@@ -305,21 +448,36 @@ class Cdocs(ContextualDocs, Physical, Changer):
         return docs
 
     def get_labels(self, path: DocPath, recurse: Optional[bool] = True) -> JsonDict:
+        scope = render_scope.current()
+        if scope is None:
+            return self._get_labels(path, recurse)
+        key = (self._rootname, path.strip("/"), "get_labels", recurse)
+        return JsonDict(dict(scope.memo(key, lambda: self._get_labels(path, recurse))))
+
+    def _get_labels(self, path: DocPath, recurse: Optional[bool] = True) -> JsonDict:
         labels = self._get_dict(path, self._labels_filename, recurse)
         return self._transform_labels(path, labels)
 
     def get_compose_doc(self, path: DocPath) -> Doc:
         if path is None:
             raise DocNotFoundException("path can not be None")
+        return self._render(
+            self._render_key(path, "get_compose_doc"),
+            lambda: self._get_compose_doc(path),
+        )
+
+    def _get_compose_doc(self, path: DocPath) -> Doc:
         filepath: FilePath = self._pather.get_full_file_path(path)
         try:
-            print(f"Cdocs.get_compose_doc: fp: {filepath}")
+            logging.debug("Cdocs.get_compose_doc: fp: %s", filepath)
             content = self._read_doc(filepath)
             tokens: dict = self.get_tokens(path[0 : path.rindex("/")])
-            content = self.transformer.transform(content, path, tokens, True)
+            content = self.transformer.transform(
+                content, path, tokens, True, filepath=filepath
+            )
             return Doc(content)
         except Exception as e:
-            logging.error(f"Cdocs.get_compose_doc: cannot compose {path}: {e}")
+            logging.error("Cdocs.get_compose_doc: cannot compose %s: %s", path, e)
             raise ComposeDocException(f"{path} failed to compose")
 
     def get_concat_doc(self, path: DocPath) -> Doc:
@@ -327,18 +485,108 @@ class Cdocs(ContextualDocs, Physical, Changer):
             raise DocNotFoundException("path can not be None")
         if path.find(".concat") == -1:
             raise BadDocPath("path must have a .concat file extension")
+        return self._render(
+            self._render_key(path, "get_concat_doc"),
+            lambda: self._get_concat_doc(path),
+        )
+
+    def _get_concat_doc(self, path: DocPath) -> Doc:
         paths = self._get_concat_paths(path)
         if paths is None:
             raise DocNotFoundException(f"No concat instruction file at {path}")
         content = self.concatter.concat(paths)
         return Doc(content)
 
+    def get_json(self, path: DocPath, readonly: Optional[bool] = False) -> Optional[Any]:
+        """
+        returns the parsed json at path, or None if there is none. the
+        docs of a plus path are deep merged, later docs winning. each
+        file is parsed once per version and the result is cached. with
+        readonly the cached structure is returned as it is, with dicts
+        that can't be changed and lists as tuples. otherwise it is a copy.
+        """
+        if path is None:
+            raise DocNotFoundException("path can not be None")
+        with tracer.span("get_json", root=self._rootname, docpath=path):
+            value = self._render(
+                self._render_key(path, "get_json"), lambda: self._get_json(path)
+            )
+        if value is None or readonly:
+            return value
+        return thaw(value)
+
+    def _get_json(self, path: DocPath) -> Optional[Any]:
+        pluspaths = self._get_plus_paths(path)
+        if len(pluspaths) > 0:
+            path = path[0 : path.find(self._plus)]
+        value = None
+        for apath in [path] + pluspaths:
+            part = self._get_json_part(apath)
+            if part is not None:
+                value = part if value is None else deep_merge(value, part)
+        return None if value is None else freeze(value)
+
+    def _get_json_part(self, path: DocPath) -> Optional[Any]:
+        filepath = self._pather.get_full_file_path(path)
+        if filepath is None:
+            return None
+        stamp = self.index.stat(filepath)
+        dependencies.record(filepath, stamp)
+        value = self._json_cache.load(filepath, stamp)
+        if value is not None:
+            return value
+        content = self._read_doc(filepath)
+        if content is None:
+            return None
+        # a template's json depends on its tokens, so only the render is kept
+        template = is_template(content)
+        if template:
+            content = self.transformer.transform(content, path, None, True, filepath=filepath)
+        try:
+            value = freeze(self._codec.loads(content))
+        except ValueError as e:
+            raise JsonDocException(f"{path} is not json: {e}")
+        if not template:
+            self._json_cache.keep(filepath, stamp, value)
+        return value
+
+    def get_binary(self, path: DocPath) -> Optional[BinaryDoc]:
+        """
+        finds the file at path without reading it, for sending as it is.
+        the transformer is not used. returns None if there is no file.
+        """
+        if path is None:
+            raise DocNotFoundException("path can not be None")
+        with tracer.span("get_binary", root=self._rootname, docpath=path):
+            filepath = self._pather.get_full_file_path(path)
+            if filepath is None or not self.index.isfile(filepath):
+                return None
+            stamp = self.index.stat(filepath)
+            dependencies.record(filepath, stamp)
+            if stamp is None:
+                return None
+            return BinaryDoc(path, filepath, stamp[1], stamp[0] / 1e9)
+
+    def open_doc(self, path: DocPath) -> Optional[BinaryIO]:
+        """opens the file at path for reading bytes, or returns None"""
+        doc = self.get_binary(path)
+        return None if doc is None else doc.open()
+
     def get_doc(self, path: DocPath, notfound: Optional[bool] = True) -> Doc:
-        return self._get_doc(path, notfound)
+        if path is None:
+            raise DocNotFoundException("path can not be None")
+        with tracer.span("get_doc", root=self._rootname, docpath=path):
+            return self._render(
+                self._render_key(path, "get_doc", notfound),
+                lambda: self._get_doc(path, notfound),
+            )
 
     def _get_doc(self, path: DocPath, notfound) -> Optional[Doc]:
         logging.info(
-            f"Cdocs._get_doc: looking for path: {path} in root: {self.rootname}. notfound: {notfound}"
+            "Cdocs._get_doc: looking for path: %s in root: %s. notfound: %s",
+            path,
+            self.rootname,
+            notfound,
         )
         if path is None:
             raise DocNotFoundException("path can not be None")
@@ -350,17 +598,123 @@ class Cdocs(ContextualDocs, Physical, Changer):
                 "Cdocs._get_doc: notfound is None. you should fix this unless you want None returns."
             )
             notfound = False
-        logging.info(f"Cdocs._get_doc: path: {path}")
+        logging.info("Cdocs._get_doc: path: %s", path)
         pluspaths = self._get_plus_paths(path)
-        logging.info(f"Cdocs._get_doc: pluspaths to concationate: {pluspaths}")
+        logging.info("Cdocs._get_doc: pluspaths to concationate: %s", pluspaths)
         root = self.get_doc_root()
-        logging.info(f"Cdocs._get_doc: root {root}")
+        logging.info("Cdocs._get_doc: root %s", root)
         doc = self._get_doc_for_root(path, pluspaths, root)
-        logging.info(f"Cdocs._get_doc: found doc {doc}")
+        logging.info("Cdocs._get_doc: found doc %s", doc)
         if doc is None and notfound:
             doc = self.get_404()
         return doc
 
+    # ===================
+    # stream methods
+    # ===================
+
+    def get_doc_stream(
+        self, path: DocPath, notfound: Optional[bool] = True
+    ) -> Optional[Iterator[str]]:
+        """
+        returns the doc as an iterator of chunks, or None if there is no
+        doc, as get_doc would. the file is read and tokens found before
+        returning. the template is rendered as the chunks are taken.
+        plus paths are yielded as they are rendered. a doc already in the
+        render cache comes in one chunk. streamed docs are not cached.
+        """
+        if path is None:
+            raise DocNotFoundException("path can not be None")
+        cached = self._render_cache.cached(self._render_key(path, "get_doc", notfound))
+        if cached is not None:
+            return iter([cached])
+        if path.find(".") > -1:
+            if self.filer.get_filetype(path) == "cdocs":
+                raise BadDocPath("dots are not allowed in cdoc paths")
+        pluspaths = self._get_plus_paths(path)
+        base = path[0 : path.find(self._plus)] if len(pluspaths) > 0 else path
+        filepath = self._pather.get_full_file_path_for_root(base, self.get_doc_root())
+        content = self._read_doc(filepath)
+        if content is None:
+            if len(pluspaths) > 0:
+                return self.concatter.concat_stream(pluspaths)
+            doc = self.get_404() if notfound else None
+            return None if doc is None else iter([doc])
+        if isinstance(content, bytes):
+            return iter([content])
+        stream = self.transformer.transform_stream(
+            content, base, None, True, filepath=filepath
+        )
+        if len(pluspaths) > 0:
+            return self.concatter.join_stream(
+                [stream, self.concatter.concat_stream(pluspaths)]
+            )
+        return stream
+
+    def get_concat_doc_stream(self, path: DocPath) -> Iterator[str]:
+        if path is None:
+            raise DocNotFoundException("path can not be None")
+        if path.find(".concat") == -1:
+            raise BadDocPath("path must have a .concat file extension")
+        cached = self._render_cache.cached(self._render_key(path, "get_concat_doc"))
+        if cached is not None:
+            return iter([cached])
+        paths = self._get_concat_paths(path)
+        if paths is None:
+            raise DocNotFoundException(f"No concat instruction file at {path}")
+        return self.concatter.concat_stream(paths)
+
+    def get_compose_doc_stream(self, path: DocPath) -> Iterator[str]:
+        if path is None:
+            raise DocNotFoundException("path can not be None")
+        cached = self._render_cache.cached(self._render_key(path, "get_compose_doc"))
+        if cached is not None:
+            return iter([cached])
+        filepath: FilePath = self._pather.get_full_file_path(path)
+        try:
+            content = self._read_doc(filepath)
+            tokens: dict = self.get_tokens(path[0 : path.rindex("/")])
+            return self.transformer.transform_stream(
+                content, path, tokens, True, filepath=filepath
+            )
+        except Exception as e:
+            logging.error(f"Cdocs.get_compose_doc_stream: cannot compose {path}: {e}")
+            raise ComposeDocException(f"{path} failed to compose")
+
+    # ===================
+    # batch methods
+    # ===================
+
+    def get_docs(
+        self, paths: List[DocPath], notfound: Optional[bool] = True
+    ) -> List[BatchResult]:
+        """
+        gets many docs at once. each distinct path is done once, and
+        paths that share a directory share the work of finding their
+        tokens and labels. results are in the order of paths. a path
+        that fails has its error in its result.
+        """
+        return run_batch(
+            [self], paths, lambda path: self.get_doc(path, notfound), self._batch_directory
+        )
+
+    def get_labels_many(
+        self, paths: List[DocPath], recurse: Optional[bool] = True
+    ) -> List[BatchResult]:
+        return run_batch(
+            [self], paths, lambda path: self.get_labels(path, recurse), self._batch_directory
+        )
+
+    def get_tokens_many(
+        self, paths: List[DocPath], recurse: Optional[bool] = True
+    ) -> List[BatchResult]:
+        return run_batch(
+            [self], paths, lambda path: self.get_tokens(path, recurse), self._batch_directory
+        )
+
+    def _batch_directory(self, path: DocPath) -> str:
+        return batch_directory(path, self._hashmark, self._plus)
+
     # ===================
     # internal methods
     # ===================
@@ -368,7 +722,7 @@ class Cdocs(ContextualDocs, Physical, Changer):
     def get_404(self) -> Optional[Doc]:
         config = self.config
         _404 = config.get("notfound", self._rootname, None)
-        logging.info(f"Cdocs.get_404: notfound in {self._rootname} is {_404}")
+        logging.info("Cdocs.get_404: notfound in %s is %s", self._rootname, _404)
         if _404 is None:
             return None
         doc = self.get_doc(_404, False)
@@ -376,14 +730,17 @@ class Cdocs(ContextualDocs, Physical, Changer):
             logging.error(
                 f"Cdocs.get_404: {self._rootname}'s notfound: {_404} is None. you shouldl fix this."
             )
-        logging.info(f"Cdocs.get_404: doc: {doc}")
+        logging.info("Cdocs.get_404: doc: %s", doc)
         return doc
 
     def _get_doc_for_root(
         self, path: DocPath, pluspaths: List[DocPath], root: FilePath
     ) -> Doc:
         logging.info(
-            f"Cdocs._get_doc_for_root: path: {path}. plus paths: {pluspaths}. root: {root}"
+            "Cdocs._get_doc_for_root: path: %s. plus paths: %s. root: %s",
+            path,
+            pluspaths,
+            root,
         )
         if len(pluspaths) > 0:
             logging.info(
@@ -391,17 +748,24 @@ class Cdocs(ContextualDocs, Physical, Changer):
             )
             plus = path.find(self._plus)
             path = path[0:plus]
-            logging.info(f"Cdocs._get_doc_for_root: base path is now {path}")
+            logging.info("Cdocs._get_doc_for_root: base path is now %s", path)
         logging.info(
-            f"Cdocs._get_doc_for_root: checking pather: {self._pather} for path: {path}"
+            "Cdocs._get_doc_for_root: checking pather: %s for path: %s",
+            self._pather,
+            path,
         )
         filepath = self._pather.get_full_file_path_for_root(path, root)
-        logging.info(f"Cdocs._get_doc_for_root: filepath from pather: {filepath}")
+        logging.info("Cdocs._get_doc_for_root: filepath from pather: %s", filepath)
         content = self._read_doc(filepath)
         logging.info(
-            f"Cdocs._get_doc_for_root: content from {filepath} is {len(content) if content is not None else 0} chars. transforming with: {self.transformer}."
+            "Cdocs._get_doc_for_root: content from %s is %s chars. transforming with: %s.",
+            filepath,
+            len(content) if content is not None else 0,
+            self.transformer,
+        )
+        content = self.transformer.transform(
+            content, path, None, True, filepath=filepath
         )
-        content = self.transformer.transform(content, path, None, True)
         if len(pluspaths) > 0:
             content = self.concatter.join(content, self.concatter.concat(pluspaths))
         return Doc(content)
@@ -455,21 +819,33 @@ class Cdocs(ContextualDocs, Physical, Changer):
 
     def _read_doc(self, path: FilePath) -> str:
         content = None
+        if dependencies.tracking():
+            dependencies.record(path, self.index.stat(path))
         available = self._reader.is_available(path)
-        logging.info(f"Cdocs._read_doc: {path} is available: {available}")
+        logging.info("Cdocs._read_doc: %s is available: %s", path, available)
         if available:
-            content = self.reader.read(path)
-            if self.filer.is_probably_not_binary(path):
+            with tracer.span("read", root=self._rootname, filepath=path) as span:
+                content = self.reader.read(path)
+                if content is not None:
+                    span.set("bytes", len(content))
+            if content is not None and self.filer.is_probably_not_binary(path):
                 content = content.decode("utf-8")
             if content is None:
-                logging.warning(f"Cdocs._read_doc: cannot read {path}. returning None.")
+                logging.warning("Cdocs._read_doc: cannot read %s. returning None.", path)
         else:
-            logging.debug(f"Cdocs._read_doc: No such doc {path}. returning None.")
-        logging.info(f"Cdocs._read_doc: returning: {content}")
+            logging.debug("Cdocs._read_doc: No such doc %s. returning None.", path)
+        logging.info(
+            "Cdocs._read_doc: returning %s chars", None if content is None else len(content)
+        )
         return content
 
     def _get_dict(
         self, path: str, filename: str, recurse: Optional[bool] = True
     ) -> JsonDict:
         path = path.strip("/\\")
-        return JsonDict(self.finder.find_tokens(path, filename, recurse))
+        scope = render_scope.current()
+        if scope is None:
+            return JsonDict(self.finder.find_tokens(path, filename, recurse))
+        key = (self._rootname, path, filename, recurse)
+        found = scope.memo(key, lambda: self.finder.find_tokens(path, filename, recurse))
+        return JsonDict(dict(found))
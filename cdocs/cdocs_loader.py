@@ -0,0 +1,45 @@
+import logging
+from typing import Callable, Optional, Tuple
+from jinja2 import BaseLoader, Environment, TemplateNotFound
+from cdocs.contextual_docs import DocPath, FilePath
+from cdocs.index import Stamp
+import cdocs.render_cache as dependencies
+
+
+class CdocsLoader(BaseLoader):
+    """
+    CdocsLoader lets jinja load templates by docpath. names are resolved
+    to physical files by the cdocs' pather and read by its reader, so
+    templates can {% include %} and {% import %} other docs in the same
+    root. jinja's template cache and auto_reload use the file's stamp.
+    """
+
+    def __init__(self, cdocs):  # can't type hint cdocs because circular
+        self._cdocs = cdocs
+
+    def get_source(
+        self, environment: Environment, template: str
+    ) -> Tuple[str, Optional[str], Callable[[], bool]]:
+        filepath: FilePath = self._cdocs.pather.get_full_file_path(DocPath(template))
+        stamp = None if filepath is None else self._stamp(filepath)
+        if filepath is None or not self._cdocs.reader.is_available(filepath):
+            logging.info("CdocsLoader.get_source: no template at %s", template)
+            raise TemplateNotFound(template)
+        content = self._cdocs.reader.read(filepath)
+        if content is None:
+            raise TemplateNotFound(template)
+        if isinstance(content, bytes):
+            content = content.decode("utf-8")
+
+        def uptodate() -> bool:
+            # jinja asks on every use of a cached template, so this is
+            # also where an include is recorded as a render dependency
+            return self._stamp(filepath) == stamp
+
+        return content, filepath, uptodate
+
+    def _stamp(self, filepath: FilePath) -> Optional[Stamp]:
+        stamp = self._cdocs.index.stat(filepath)
+        if dependencies.tracking():
+            dependencies.record(filepath, stamp)
+        return stamp
@@ -0,0 +1,48 @@
+import json
+import base64
+import binascii
+from typing import Dict, List, Optional, Tuple
+from cdocs.contextual_docs import DocPath
+
+# rootname -> (epoch, seq)
+Marks = Dict[str, Tuple[str, int]]
+
+
+class ChangeSet(object):
+    """
+    what changed in a context since a token. changes holds, by root,
+    the docpaths to fetch again. roots in full could not be compared to
+    the token, because it is from before the root was loaded or from
+    another process. their changes list every docpath, and a client
+    should drop what it holds for them. token is passed to the next
+    changes_since.
+    """
+
+    __slots__ = ("changes", "full", "token")
+
+    def __init__(self, changes: Dict[str, List[DocPath]], full: List[str], token: str):
+        self.changes = changes
+        self.full = full
+        self.token = token
+
+    def __repr__(self) -> str:
+        return f"ChangeSet(changes={self.changes!r}, full={self.full!r}, token={self.token!r})"
+
+    def to_dict(self) -> Dict:
+        return {"changes": self.changes, "full": self.full, "token": self.token}
+
+
+def encode_token(marks: Marks) -> str:
+    data = json.dumps({name: [epoch, seq] for name, (epoch, seq) in marks.items()})
+    return base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii")
+
+
+def decode_token(token: Optional[str]) -> Marks:
+    """the marks in a token. a token that can't be read has none."""
+    if token is None or token.strip() == "":
+        return {}
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        return {name: (str(mark[0]), int(mark[1])) for name, mark in data.items()}
+    except (ValueError, TypeError, KeyError, IndexError, AttributeError, binascii.Error):
+        return {}
@@ -0,0 +1,296 @@
+import os
+import time
+import uuid
+import hashlib
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from cdocs.contextual_docs import DocPath, FilePath
+from cdocs.index import Stamp, normalize, is_under
+
+
+class _Node(object):
+    """one directory: the stamps of its files, its subdirectories, and its version"""
+
+    __slots__ = ("files", "hashes", "dirs", "version", "checked")
+
+    def __init__(self, files: Dict[str, Stamp], dirs: List[str], version: int):
+        self.files = files
+        # content hashes, for files whose stamp has changed since they were first seen
+        self.hashes: Dict[str, Optional[str]] = {}
+        self.dirs = dirs
+        self.version = version
+        self.checked = time.monotonic()
+
+
+class ChangeTree(object):
+    """
+    ChangeTree knows when each part of a root last changed. every
+    directory has a version: the newest mtime of the files in it, in
+    nanoseconds. a file that goes away, or one replaced by an older
+    file, moves the version to the time the change was seen. versions
+    never go back.
+
+    the last change of a docpath is the newest of: its doc files, every
+    directory below it, and the tokens and labels files from the root
+    down to it. a change anywhere else in the root leaves it alone.
+
+    the tree also keeps a log of the files that changed, numbered by a
+    sequence that goes up with each change seen. a file whose stamp
+    changes but whose content hash does not, like one that was only
+    touched, is not logged after the first time it is hashed.
+
+    directories are looked at again at most every [changes]
+    check_interval seconds, and at once for paths given to invalidate,
+    which is what a watcher calls. while a watcher runs, a directory is not looked at
+    again until the watcher says it changed.
+    """
+
+    def __init__(self, cdocs):  # can't type hint cdocs
+        self._cdocs = cdocs
+        self._root = os.path.normpath(cdocs.get_doc_root())
+        self._check_interval = float(cdocs.config.get("changes", "check_interval", "5"))
+        self._nodes: Dict[FilePath, _Node] = {}
+        # directories that appeared after their parent was first scanned
+        self._appeared: Set[FilePath] = set()
+        # filepath -> the sequence number of its last change
+        self._log: Dict[FilePath, int] = {}
+        self._seq = 0
+        # sequence numbers only mean something to this tree
+        self._epoch = uuid.uuid4().hex[:12]
+        self._lock = threading.Lock()
+
+    @property
+    def epoch(self) -> str:
+        return self._epoch
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    def last_change(self, path: DocPath) -> Optional[int]:
+        """
+        the last change of a docpath in nanoseconds, or None if nothing
+        is there. the parts of a plus path count together.
+        """
+        plus = self._cdocs._plus
+        parts = path.split(plus)
+        versions = [self._last_change(parts[0])]
+        base = parts[0].split(self._cdocs._hashmark)[0].rstrip("/")
+        for part in parts[1:]:
+            versions.append(self._last_change(f"{base}/{part}"))
+        versions = [v for v in versions if v is not None]
+        return max(versions) if len(versions) > 0 else None
+
+    def _last_change(self, path: DocPath) -> Optional[int]:
+        hashmark = self._cdocs._hashmark
+        dirpath, _, name = path.partition(hashmark)
+        segments = [s for s in dirpath.strip("/").split("/") if s != ""]
+        index = self._cdocs.index
+        versions = []
+        # the tokens and labels files from the root down to the doc
+        names = [self._cdocs._tokens_filename, self._cdocs._labels_filename]
+        pointer = self._root
+        for segment in [None] + segments:
+            if segment is not None:
+                pointer = os.path.join(pointer, segment)
+            for filename in names:
+                stamp = index.stat(os.path.join(pointer, filename))
+                if stamp is not None:
+                    versions.append(stamp[0])
+        exts = self._cdocs.exts
+        if name != "":
+            docfiles = [os.path.join(pointer, f"{name}.{ext}") for ext in exts]
+            found = [index.stat(f) for f in docfiles]
+        else:
+            docfiles = [f"{pointer}.{ext}" for ext in exts]
+            found = [index.stat(f) for f in docfiles]
+            subtree = self.subtree(pointer) if index.isdir(pointer) else 0
+            if subtree > 0:
+                found.append((subtree, 0))
+        found = [stamp[0] for stamp in found if stamp is not None]
+        if len(found) == 0:
+            return None
+        return max(versions + found)
+
+    def subtree(self, dirpath: FilePath) -> int:
+        """the newest version of a directory and every directory below it"""
+        node = self._node(dirpath)
+        version = node.version
+        for d in node.dirs:
+            version = max(version, self.subtree(os.path.join(dirpath, d)))
+        return version
+
+    def changed_since(self, seq: int) -> Tuple[List[FilePath], int]:
+        """
+        brings the tree up to date and returns the files that changed
+        after seq, including removed files, and the sequence now
+        """
+        self.subtree(self._root)
+        with self._lock:
+            changed = [f for f, s in self._log.items() if s > seq]
+            return sorted(changed), self._seq
+
+    def docpaths(self, filepaths: Optional[Iterable[FilePath]] = None) -> List[DocPath]:
+        """
+        the docpaths that depend on filepaths: the doc each file is, or
+        for a tokens or labels file, its directory and every doc below
+        it. without filepaths, every docpath in the root.
+        """
+        if filepaths is None:
+            self.subtree(self._root)
+            return sorted(self._below(self._root))
+        names = [self._cdocs._tokens_filename, self._cdocs._labels_filename]
+        docpaths = set()
+        for filepath in filepaths:
+            dirpath, name = os.path.split(os.path.normpath(filepath))
+            if name in names:
+                docpaths.add(self._docpath(dirpath))
+                docpaths |= self._below(dirpath)
+            else:
+                docpaths.add(self._docpath(dirpath, name))
+        return sorted(docpaths)
+
+    def _below(self, dirpath: FilePath) -> Set[DocPath]:
+        """the docpaths of the docs in and below a directory, as last seen"""
+        node = self._nodes.get(dirpath)
+        if node is None:
+            return set()
+        names = [self._cdocs._tokens_filename, self._cdocs._labels_filename]
+        docpaths = {self._docpath(dirpath, name) for name in node.files if name not in names}
+        for d in node.dirs:
+            docpaths |= self._below(os.path.join(dirpath, d))
+        return docpaths
+
+    def _docpath(self, dirpath: FilePath, name: Optional[str] = None) -> DocPath:
+        rel = os.path.relpath(dirpath, self._root)
+        base = "" if rel == "." else "/" + rel.replace(os.sep, "/")
+        if name is None:
+            return "/" if base == "" else base
+        stem, ext = os.path.splitext(name)
+        # docs are asked for without their extension. binary files keep theirs.
+        if ext[1:] in self._cdocs.exts and self._cdocs._filer.is_probably_not_binary(name):
+            name = stem
+        return f"{base}/{name}"
+
+    def invalidate(self, filepaths: List[FilePath]) -> None:
+        """marks the directories at, holding, or below filepaths to be looked at again"""
+        paths = normalize(filepaths)
+        paths |= {os.path.dirname(p) for p in paths}
+        with self._lock:
+            for dirpath, node in self._nodes.items():
+                if is_under(dirpath, paths):
+                    node.checked = float("-inf")
+
+    def _is_fresh(self, node: _Node) -> bool:
+        if node.checked == float("-inf"):
+            return False
+        watcher = self._cdocs.watcher
+        if watcher is not None and watcher.running:
+            return True
+        return time.monotonic() - node.checked < self._check_interval
+
+    def _node(self, dirpath: FilePath) -> _Node:
+        node = self._nodes.get(dirpath)
+        if node is not None and self._is_fresh(node):
+            return node
+        files, dirs = self._scan(dirpath)
+        newest = max([stamp[0] for stamp in files.values()], default=0)
+        if node is None:
+            node = _Node(files, dirs, newest)
+            with self._lock:
+                appeared = dirpath in self._appeared
+                self._appeared.discard(dirpath)
+            if appeared:
+                self._changed(dirpath, list(files))
+        elif files != node.files or dirs != node.dirs:
+            changed, hashes = self._compare(dirpath, node, files)
+            removed = [f for f in node.files if f not in files]
+            for d in node.dirs:
+                if d not in dirs:
+                    removed += self._drop(os.path.join(dirpath, d))
+            with self._lock:
+                self._appeared |= {os.path.join(dirpath, d) for d in dirs if d not in node.dirs}
+            version = node.version
+            if len(changed) > 0 or len(removed) > 0:
+                if len(removed) > 0 or newest <= node.version:
+                    # a removal or an older file has no mtime of its own to go by
+                    newest = max(newest, time.time_ns())
+                logging.info("ChangeTree._node: %s changed", dirpath)
+                version = max(version, newest)
+                self._changed(dirpath, changed + removed)
+            node = _Node(files, dirs, version)
+            node.hashes = hashes
+        else:
+            node.checked = time.monotonic()
+        with self._lock:
+            self._nodes[dirpath] = node
+        return node
+
+    def _compare(self, dirpath: FilePath, node: _Node, files: Dict[str, Stamp]):
+        """the names of the files that changed, and the hashes known after"""
+        changed = []
+        hashes = {}
+        for name, stamp in files.items():
+            old = node.files.get(name)
+            if old == stamp:
+                if name in node.hashes:
+                    hashes[name] = node.hashes[name]
+                continue
+            digest = None if old is None else self._hash(os.path.join(dirpath, name))
+            hashes[name] = digest
+            if digest is None or node.hashes.get(name) != digest:
+                changed.append(name)
+        return changed, hashes
+
+    def _changed(self, dirpath: FilePath, names: List[str]) -> None:
+        if len(names) == 0:
+            return
+        with self._lock:
+            self._seq += 1
+            for name in names:
+                self._log[os.path.join(dirpath, name)] = self._seq
+
+    def _drop(self, dirpath: FilePath) -> List[str]:
+        """forgets a directory that is gone. returns the paths of the files it had, relative to its parent."""
+        with self._lock:
+            node = self._nodes.pop(dirpath, None)
+        if node is None:
+            return []
+        name = os.path.basename(dirpath)
+        removed = [os.path.join(name, f) for f in node.files]
+        for d in node.dirs:
+            removed += [os.path.join(name, f) for f in self._drop(os.path.join(dirpath, d))]
+        return removed
+
+    def _hash(self, filepath: FilePath) -> Optional[str]:
+        index = self._cdocs.index
+        if hasattr(index, "hash"):
+            digest = index.hash(filepath)
+            if digest is not None:
+                return digest
+        try:
+            with open(filepath, "rb") as f:
+                return hashlib.sha1(f.read()).hexdigest()
+        except OSError:
+            return None
+
+    def _scan(self, dirpath: FilePath):
+        index = self._cdocs.index
+        files: Dict[str, Stamp] = {}
+        dirs: List[str] = []
+        try:
+            names = index.listdir(dirpath)
+        except OSError:
+            return files, dirs
+        for name in sorted(names):
+            # dot files, like .last_change, are not docs
+            if name.startswith("."):
+                continue
+            path = os.path.join(dirpath, name)
+            stamp = index.stat(path)
+            if stamp is not None:
+                files[name] = stamp
+            elif index.isdir(path):
+                dirs.append(name)
+        return files, dirs
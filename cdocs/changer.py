@@ -1,14 +1,16 @@
 import abc
 from typing import Optional
 import datetime
+from cdocs.contextual_docs import DocPath
 
 class Changer(metaclass=abc.ABCMeta):
     """
-    Changer knows how to hold a last change date
+    Changer knows how to hold a last change date, for a root or for
+    the part of it at a docpath
     """
 
     @abc.abstractmethod
-    def get_last_change(self) -> datetime:
+    def get_last_change(self, path:Optional[DocPath]=None) -> datetime:
         pass
 
     @abc.abstractmethod
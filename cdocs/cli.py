@@ -0,0 +1,142 @@
+import argparse
+import logging
+import sys
+from typing import List, Optional
+from cdocs.simple_config import SimpleConfig
+from cdocs.context_metadata import ContextMetadata
+from cdocs.context import Context
+from cdocs.compiler import Compiler
+from cdocs.manifest_index import build_manifest, manifest_path
+from cdocs.exporter import Exporter
+import cdocs.tracer as tracer
+
+
+class Cli(object):
+    """
+    Cli is the cdocs command line. commands work against the roots
+    in a config.ini, by default config/config.ini.
+    """
+
+    def __init__(self):
+        self._parser = argparse.ArgumentParser(prog="cdocs")
+        self._parser.add_argument(
+            "--config", default=None, help="path to config.ini"
+        )
+        self._parser.add_argument(
+            "--debug", action="store_true", help="log at debug level"
+        )
+        self._parser.add_argument(
+            "--trace",
+            default=None,
+            help="write a chrome trace of this process's work to this file",
+        )
+        self._commands = self._parser.add_subparsers(dest="command")
+        self._add_commands()
+
+    def _add_commands(self) -> None:
+        compiler = self._commands.add_parser(
+            "compile", help="precompile the templates under each root"
+        )
+        compiler.add_argument(
+            "--roots", default=None, help="csv of root names. default is all."
+        )
+        compiler.set_defaults(func=self.compile)
+        index = self._commands.add_parser("index", help="work with root manifests")
+        actions = index.add_subparsers(dest="action")
+        build = actions.add_parser("build", help="write a manifest for each root")
+        build.add_argument(
+            "--roots", default=None, help="csv of root names. default is all."
+        )
+        build.add_argument(
+            "--out",
+            default=None,
+            help="manifest directory. default is [index][manifests].",
+        )
+        build.set_defaults(func=self.build_index)
+        export = self._commands.add_parser(
+            "export", help="render every doc to static files"
+        )
+        export.add_argument("--out", required=True, help="directory to export to")
+        export.add_argument(
+            "--roots", default=None, help="csv of root names. default is all."
+        )
+        export.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="number of processes. default is the number of cores.",
+        )
+        export.add_argument(
+            "--full",
+            action="store_true",
+            help="render every doc, not only those whose files changed",
+        )
+        export.set_defaults(func=self.export)
+
+    def run(self, argv: Optional[List[str]] = None) -> int:
+        args = self._parser.parse_args(argv)
+        if args.debug:
+            logging.getLogger("").setLevel(level=logging.DEBUG)
+        if args.command is None:
+            self._parser.print_help()
+            return 1
+        if not hasattr(args, "func"):
+            self._parser.print_help()
+            return 1
+        if args.trace is None:
+            return args.func(args)
+        recorder = tracer.RecordingTracer()
+        old = tracer.set_tracer(recorder)
+        try:
+            return args.func(args)
+        finally:
+            tracer.set_tracer(old)
+            recorder.write_chrome(args.trace)
+
+    def _get_context(self, args) -> Context:
+        config = SimpleConfig(args.config)
+        return Context(ContextMetadata(config))
+
+    def _get_cdocs(self, context: Context, roots: Optional[str]) -> List:
+        if roots is None:
+            return context.cdocs
+        return [context.keyed_cdocs[name] for name in roots.split(",")]
+
+    def compile(self, args) -> int:
+        context = self._get_context(args)
+        cdocs = self._get_cdocs(context, args.roots)
+        count = Compiler(cdocs).compile()
+        print(f"compiled {count} templates")
+        return 0
+
+    def build_index(self, args) -> int:
+        context = self._get_context(args)
+        out = args.out
+        if out is None:
+            out = context.metadata.config.get("index", "manifests", None)
+        if out is None:
+            print("no manifest directory. use --out or set [index][manifests].")
+            return 1
+        for cdocs in self._get_cdocs(context, args.roots):
+            path = manifest_path(out, cdocs.rootname)
+            count = build_manifest(cdocs.get_doc_root(), path)
+            print(f"{cdocs.rootname}: wrote {count} entries to {path}")
+        return 0
+
+    def export(self, args) -> int:
+        roots = None if args.roots is None else args.roots.split(",")
+        exporter = Exporter(args.out, args.config, roots, args.workers)
+        counts = exporter.export(args.full)
+        print(
+            f"wrote {counts['written']}, skipped {counts['skipped']}, "
+            + f"removed {counts['removed']}, failed {counts['failed']}"
+        )
+        return 0 if counts["failed"] == 0 else 1
+
+
+def main() -> None:
+    sys.exit(Cli().run())
+
+
+if __name__ == "__main__":
+    main()
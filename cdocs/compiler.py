@@ -0,0 +1,69 @@
+import os
+import logging
+from typing import List, Optional
+from cdocs.contextual_docs import FilePath
+from cdocs.simple_transformer import TEMPLATE_TYPES
+from cdocs.transformer import Transformer
+
+
+class Compiler(object):
+    """
+    Compiler compiles every template under the roots of a list of Cdocs
+    ahead of their first use. when [cache] bytecode names a directory
+    the compiled code is written there, so that workers started later
+    load it instead of compiling. when there is no bytecode cache the
+    compile just warms the in-process template cache.
+    """
+
+    def __init__(self, cdocs: List):  # can't type hint cdocs because circular
+        self._cdocs = cdocs
+
+    def compile(self) -> int:
+        count = 0
+        for cdocs in self._cdocs:
+            count += self.compile_root(cdocs)
+        return count
+
+    def compile_root(self, cdocs) -> int:
+        root = cdocs.get_doc_root()
+        if type(cdocs.transformer).compile is Transformer.compile:
+            logging.info("Compiler.compile_root: the transformer of %s does not compile. skipping.", root)
+            return 0
+        logging.info("Compiler.compile_root: compiling templates in %s", root)
+        count = 0
+        skip = [cdocs._tokens_filename, cdocs._labels_filename]
+        for filepath in self.list_templates(root, skip):
+            content = cdocs.reader.read(filepath)
+            if content is None:
+                continue
+            try:
+                cdocs.transformer.compile(content.decode("utf-8"), filepath)
+                count += 1
+            except Exception as e:
+                logging.warning("Compiler.compile_root: cannot compile %s: %s", filepath, e)
+        logging.info("Compiler.compile_root: compiled %s templates in %s", count, root)
+        return count
+
+    def list_templates(
+        self, root: FilePath, skip: Optional[List[str]] = None
+    ) -> List[FilePath]:
+        # walks the tree the way SimpleLister lists it: dot files are skipped
+        templates = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if d[0:1] != ".")
+            for f in sorted(filenames):
+                if f[0:1] == "." or (skip is not None and f in skip):
+                    continue
+                if self._get_ext(f) in TEMPLATE_TYPES:
+                    templates.append(FilePath(os.path.join(dirpath, f)))
+        return templates
+
+    def _get_ext(self, filename: str) -> Optional[str]:
+        dot = filename.rfind(".")
+        if dot == -1:
+            return None
+        ext = filename[dot + 1 :]
+        # concat files are lists of docpaths that are never transformed
+        if ext == "concat":
+            return None
+        return ext
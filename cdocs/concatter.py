@@ -1,6 +1,6 @@
 import abc
 from cdocs.contextual_docs import Doc, DocPath
-from typing import List
+from typing import Iterable, Iterator, List
 
 
 class Concatter(metaclass=abc.ABCMeta):
@@ -12,3 +12,15 @@ class Concatter(metaclass=abc.ABCMeta):
     def concat(self, paths:List[DocPath]) -> Doc:
         path
 
+    def join_all(self, parts:List[str]) -> str:
+        """ joins the parts. by default with a space. """
+        return " ".join(part for part in parts if part is not None)
+
+    def concat_stream(self, paths:List[DocPath]) -> Iterator[str]:
+        """ yields the concatenation in chunks. by default in one chunk. """
+        yield self.concat(paths)
+
+    def join_stream(self, streams:Iterable[Iterator[str]]) -> Iterator[str]:
+        """ yields the parts of streams joined. by default in one chunk. """
+        yield " ".join("".join(stream) for stream in streams)
+
@@ -26,3 +26,17 @@ class Config(Physical, metaclass=abc.ABCMeta):
     @abc.abstractmethod
     def get_matching_key_for_value(self, group:str, value:str) -> Optional[str]:
         pass
+
+    def get_sections(self) -> Optional[List[str]]:
+        """ the names of the groups, or None if they can't be listed """
+        return None
+
+    def get_exts(self, rootname:str) -> List[str]:
+        """ the extensions a root's docs use, from [formats] or [defaults] ext """
+        ext = self.get("formats", rootname, self.get("defaults", "ext", "xml"))
+        return ext.split(",")
+
+    def get_accepts(self, rootname:str) -> Optional[List[str]]:
+        """ the types a root accepts, or None if the root is not in [accepts] """
+        accepts = self.get("accepts", rootname)
+        return None if accepts is None else accepts.split(",")
@@ -0,0 +1,98 @@
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+import logging
+from cdocs.config import Config
+
+
+def snapshot(config: Config) -> Config:
+    """
+    returns a snapshot of the config, or the config itself if it is
+    already a snapshot or its groups can't be listed
+    """
+    if isinstance(config, ConfigSnapshot):
+        return config
+    if config.get_sections() is None:
+        return config
+    return ConfigSnapshot(config)
+
+
+class ConfigSnapshot(Config):
+    """
+    ConfigSnapshot is a frozen copy of a config. every value is read and
+    interpolated once, so gets are dict lookups. each group also has a
+    reverse map of values to keys, for finding a root's name from its
+    path, and each root's exts and accepts are split once. a Context
+    shares one snapshot with all of its Cdocs.
+
+    changes to the config file are not seen. build a new Context to pick
+    them up.
+    """
+
+    def __init__(self, config: Config):
+        super().__init__()
+        self._path = config.get_config_path()
+        self._reader = config.reader
+        self._finder = config.finder
+        self._pather = config.pather
+        sections: Dict[str, Mapping[str, str]] = {}
+        items: Dict[str, Tuple[Tuple[str, str], ...]] = {}
+        keys: Dict[str, Mapping[str, str]] = {}
+        for section in config.get_sections():
+            pairs = tuple(config.get_items(section))
+            items[section] = pairs
+            sections[section] = MappingProxyType(dict(pairs))
+            reverse: Dict[str, str] = {}
+            for key, value in pairs:
+                # the first key with a value wins, as in a scan
+                reverse.setdefault(value, key)
+            keys[section] = MappingProxyType(reverse)
+        self._sections = MappingProxyType(sections)
+        self._items = MappingProxyType(items)
+        self._keys = MappingProxyType(keys)
+        rootnames = [key for key, value in items.get("docs", ())]
+        self._exts = MappingProxyType(
+            {name: tuple(Config.get_exts(self, name)) for name in rootnames}
+        )
+        self._accepts = MappingProxyType(
+            {name: self._split(self.get("accepts", name)) for name in rootnames}
+        )
+        logging.debug("ConfigSnapshot.__init__: %s groups from %s", len(sections), self._path)
+
+    def _split(self, value: Optional[str]) -> Optional[Tuple[str, ...]]:
+        return None if value is None else tuple(value.split(","))
+
+    def __str__(self):
+        return f"ConfigSnapshot: path: {self._path}"
+
+    def get_config_path(self):
+        return self._path
+
+    def get_sections(self) -> Optional[List[str]]:
+        return list(self._sections)
+
+    def get(self, group: str, name: str, default: Optional[str] = None) -> str:
+        values = self._sections.get(group)
+        if values is None:
+            return default
+        # configparser keys are lower case
+        return values.get(name.lower(), default)
+
+    def get_items(self, group: str, exceptnot: List[str] = None) -> List[Tuple[str, str]]:
+        items = self._items.get(group, ())
+        if exceptnot is not None:
+            return [_ for _ in items if _[0] not in exceptnot]
+        return list(items)
+
+    def get_matching_key_for_value(self, group: str, value: str) -> Optional[str]:
+        keys = self._keys.get(group)
+        return None if keys is None else keys.get(value)
+
+    def get_exts(self, rootname: str) -> List[str]:
+        exts = self._exts.get(rootname)
+        return Config.get_exts(self, rootname) if exts is None else list(exts)
+
+    def get_accepts(self, rootname: str) -> Optional[List[str]]:
+        if rootname not in self._accepts:
+            return Config.get_accepts(self, rootname)
+        accepts = self._accepts[rootname]
+        return None if accepts is None else list(accepts)
@@ -1,6 +1,9 @@
 import abc
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, BinaryIO, Iterator, Tuple
 import logging
+import threading
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from cdocs.config import Config
 from cdocs.simple_config import SimpleConfig
 from cdocs.simple_filer import SimpleFiler
@@ -8,6 +11,18 @@ from cdocs.cdocs import Cdocs
 from cdocs.contextual_docs import Doc, DocPath, FilePath, JsonDict, ContextualDocs
 from cdocs.multi_context_docs import MultiContextDocs
 from cdocs.context_metadata import ContextMetadata
+from cdocs.batch import BatchResult, batch_directory, run_batch
+from cdocs.json_cache import deep_merge, freeze, thaw
+from cdocs.binary_doc import BinaryDoc
+from cdocs.change_feed import ChangeSet, encode_token, decode_token
+from cdocs.index import normalize
+import cdocs.render_cache as dependencies
+import cdocs.render_scope as render_scope
+
+# set on the threads of a context's pool. a template that asks for docs
+# from roots while it is being rendered on the pool is answered on its
+# own thread, so the pool can't deadlock waiting on itself.
+_local = threading.local()
 
 
 class Context(ContextualDocs, MultiContextDocs):
@@ -18,13 +33,30 @@ class Context(ContextualDocs, MultiContextDocs):
     in any of the Cdocs. The value of first use of a label name wins.
     """
 
-    def __init__(self, metadata: ContextMetadata):
+    def __init__(self, metadata: ContextMetadata, concurrency: Optional[int] = None):
         self._metadata = metadata
         self._keyed_cdocs = {
             k: Cdocs(v, metadata.config, self) for k, v in metadata.keyed_roots.items()
         }
         self._cdocs = [v for k, v in self.keyed_cdocs.items()]
         self._nosplitplus = None
+        if concurrency is None:
+            concurrency = int(metadata.config.get("context", "concurrency", "0"))
+        self._concurrency = concurrency
+        self._executor = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_shared(cls, config_path: Optional[str] = None) -> "Context":
+        """
+        returns the process's warm context for a config file. when the
+        file changes a new context is built in the background and swapped
+        in. see ContextRegistry.
+        """
+        from cdocs.context_registry import registry
+
+        return registry.get(config_path)
 
     @property
     def cdocs(self) -> List[Cdocs]:
@@ -42,6 +74,65 @@ class Context(ContextualDocs, MultiContextDocs):
     def metadata(self) -> ContextMetadata:
         return self._metadata
 
+    def session(self):
+        """
+        a context manager. calls made in it share one render scope across
+        the roots. see Cdocs.session.
+        """
+        return render_scope.scope()
+
+    @property
+    def concurrency(self) -> int:
+        """
+        the number of roots get_doc_from_roots probes at once. 0 or 1
+        probes them one after another.
+        """
+        return self._concurrency
+
+    @concurrency.setter
+    def concurrency(self, concurrency: int) -> None:
+        with self._lock:
+            self._concurrency = concurrency
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Context._get_executor: the context is closed")
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._concurrency,
+                    thread_name_prefix="cdocs-context",
+                    initializer=self._mark_pool_thread,
+                )
+            return self._executor
+
+    def _mark_pool_thread(self) -> None:
+        _local.in_pool = True
+
+    def watch(self, method: Optional[str] = None) -> None:
+        """starts a watcher on every root"""
+        for cdocs in self.cdocs:
+            cdocs.watch(method)
+
+    def stop_watching(self) -> None:
+        for cdocs in self.cdocs:
+            cdocs.stop_watching()
+
+    def close(self) -> None:
+        """
+        stops the watchers and the thread pool. calls that are under way
+        finish. after this, roots are probed one after another.
+        """
+        self.stop_watching()
+        with self._lock:
+            self._closed = True
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
     # ==== ContextualDocs ==================
 
     def get_concat_doc(self, path: DocPath) -> Optional[Doc]:
@@ -90,28 +181,33 @@ class Context(ContextualDocs, MultiContextDocs):
 
     def filter_root_names_for_path(self, roots: List[str], path: DocPath) -> List[str]:
         logging.info(
-            f"Context.filter_root_names_for_path: starting roots: {roots}, path: {path}"
+            "Context.filter_root_names_for_path: starting roots: %s, path: %s",
+            roots,
+            path,
         )
         filetype = None
         hashmark = self.metadata.config.get("filenames", "hashmark", "#")
-        logging.info(f"Context.filter_root_names_for_path: hashmark: {hashmark}")
+        logging.info("Context.filter_root_names_for_path: hashmark: %s", hashmark)
         if path.find(hashmark) > -1:
             filetype = "cdocs"
         else:
             filetype = self.get_filetype(path)
-        logging.info(f"Context.filter_root_names_for_path: filetype: {filetype}")
+        logging.info("Context.filter_root_names_for_path: filetype: %s", filetype)
         ab = self.metadata.accepted_by
-        logging.info(f"Context.filter_root_names_for_path: ab: {ab}")
+        logging.info("Context.filter_root_names_for_path: ab: %s", ab)
         aroots = ab.get(filetype)
         if aroots is None:
             aroots = []
         logging.info(
-            f"Context.filter_root_names_for_path: found {aroots} for filetype. filtering roots using that list."
+            "Context.filter_root_names_for_path: found %s for filetype. filtering roots using that list.",
+            aroots,
         )
         filtered = [item for item in roots if item in aroots]
         if roots != filtered:
             logging.info(
-                f"Context.filter_root_names_for_path: filtered (by accepted) {roots} to {filtered}"
+                "Context.filter_root_names_for_path: filtered (by accepted) %s to %s",
+                roots,
+                filtered,
             )
         return filtered
 
@@ -120,19 +216,20 @@ class Context(ContextualDocs, MultiContextDocs):
         self, rootnames: List[str], path: DocPath
     ) -> Optional[JsonDict]:
         logging.info(
-            f"Context.list_docs_from_roots: rootnames: {rootnames}, path: {path}"
+            "Context.list_docs_from_roots: rootnames: %s, path: %s", rootnames, path
         )
         docs = []
         rootnames = self.filter_root_names_for_path(rootnames, path)
         logging.info(
-            f"Context.list_docs_from_roots: filtered rootnames for path: {rootnames}"
+            "Context.list_docs_from_roots: filtered rootnames for path: %s", rootnames
         )
         for _ in rootnames:
             cdocs = self.keyed_cdocs[_]
-            logging.info(f"Context.list_docs_from_roots: cdocs: {cdocs.rootname}")
+            logging.info("Context.list_docs_from_roots: cdocs: %s", cdocs.rootname)
             somedocs = cdocs.list_docs(path)
             logging.info(
-                f"Context.list_docs_from_roots: found {len(somedocs) if somedocs is not None else '0'}"
+                "Context.list_docs_from_roots: found %s",
+                len(somedocs) if somedocs is not None else '0',
             )
             for doc in somedocs:
                 if doc not in docs:
@@ -143,19 +240,20 @@ class Context(ContextualDocs, MultiContextDocs):
         self, rootnames: List[str], path: DocPath
     ) -> Optional[JsonDict]:
         logging.info(
-            f"Context.list_docs_from_roots: rootnames: {rootnames}, path: {path}"
+            "Context.list_docs_from_roots: rootnames: %s, path: %s", rootnames, path
         )
         docs = []
         rootnames = self.filter_root_names_for_path(rootnames, path)
         logging.info(
-            f"Context.list_docs_from_roots: filtered rootnames for path: {rootnames}"
+            "Context.list_docs_from_roots: filtered rootnames for path: %s", rootnames
         )
         for _ in rootnames:
             cdocs = self.keyed_cdocs[_]
-            logging.info(f"Context.list_docs_from_roots: cdocs: {cdocs.rootname}")
+            logging.info("Context.list_docs_from_roots: cdocs: %s", cdocs.rootname)
             somedocs = cdocs.list_next_layer(path)
             logging.info(
-                f"Context.list_docs_from_roots: found {len(somedocs) if somedocs is not None else '0'}"
+                "Context.list_docs_from_roots: found %s",
+                len(somedocs) if somedocs is not None else '0',
             )
             for doc in somedocs:
                 if doc not in docs:
@@ -222,49 +320,19 @@ class Context(ContextualDocs, MultiContextDocs):
                    can all be on different roots.
         """
         logging.info(
-            f"Context.get_doc_from_roots: first match wins. rootnames: {rootnames}, path: {path}, notfound: {notfound}, splitplus: {splitplus}"
+            "Context.get_doc_from_roots: first match wins. rootnames: %s, path: %s, notfound: %s, splitplus: %s",
+            rootnames,
+            path,
+            notfound,
+            splitplus,
         )
         plusmark = self._metadata.config.get("filenames", "plus")
         plus = path.find(plusmark)
         if plus > -1 and splitplus:
-            if self._nosplitplus is None:
-                nsp = self._metadata.config.get("defaults", "nosplitplus", "")
-                self._nosplitplus = nsp.split(",")
-            if len(self._nosplitplus) > 0:
-                rootnames = [
-                    name for name in rootnames if name not in self._nosplitplus
-                ]
-                logging.info(
-                    f"Context.get_doc_from_roots: nsp filtered rootnames: {rootnames}"
-                )
-            # split into paths and call get_doc_from_roots on each, then concat
-            #
-            #  /r/o/o/t.html#fish
-            # needs to become /r/o/o
-            #
-            #  /r/o/o/t#fish
-            # needs to become /r/o/o/t
-            #
-            #  /r/o/o/t
-            # needs to become /r/o/o/t
-            #
-            logging.info(f"Context.get_doc_from_roots: path: {path}")
-            logging.info(f"Context.get_doc_from_roots: rootnames: {rootnames}")
-            logging.info(f"Context.get_doc_from_roots: notfound: {notfound}")
-            logging.info(f"Context.get_doc_from_roots: splitplus: {splitplus}")
-            paths = path.split(plusmark)
-            logging.info(f"Context.get_doc_from_roots: paths: {paths}")
-            rootpath = paths[0]
-            logging.info(f"Context.get_doc_from_roots: rootpath: {rootpath}")
-            hashmark = self._metadata.config.get("filenames", "hashmark")
-            logging.info(f"Context.get_doc_from_roots: hashmark: {hashmark}")
-            rootpath = rootpath.split(hashmark)[0]
-            logging.info(f"Context.get_doc_from_roots: rootpath: {rootpath}")
-            paths = [p if p.find(rootpath) > -1 else rootpath + "/" + p for p in paths]
-            logging.info(f"Context.get_doc_from_roots: paths: {paths}")
+            rootnames, paths = self._split_plus(rootnames, path, notfound, splitplus)
             result = []
             for path in paths:
-                logging.info(f"Context.get_doc_from_roots: .... next path: {path}")
+                logging.info("Context.get_doc_from_roots: .... next path: %s", path)
                 r = self.get_doc_from_roots(rootnames, path, notfound)
                 if r is not None:
                     result.append(r)
@@ -274,20 +342,364 @@ class Context(ContextualDocs, MultiContextDocs):
         else:
             rootnames = self.filter_root_names_for_path(rootnames, path)
             logging.info(
-                f"Context.get_doc_from_roots: rootnames: {rootnames} - not spliting pluses, first root locks in the pluses"
+                "Context.get_doc_from_roots: rootnames: %s - not spliting pluses, first root locks in the pluses",
+                rootnames,
             )
-            for _ in rootnames:
-                cdocs = self.keyed_cdocs[_]
-                logging.info(
-                    f"Context.get_doc_from_roots: cdocs: {_} -> {cdocs.get_doc_root()}"
-                )
-                doc = cdocs.get_doc(path, False)
-                logging.info(f"found doc: {type(doc)}")
+            if self._parallel(rootnames):
+                doc = self._get_doc_in_parallel(rootnames, path)
                 if doc is not None:
                     return doc
+            else:
+                for _ in rootnames:
+                    cdocs = self.keyed_cdocs[_]
+                    logging.info(
+                        "Context.get_doc_from_roots: cdocs: %s -> %s",
+                        _,
+                        cdocs.get_doc_root(),
+                    )
+                    doc = cdocs.get_doc(path, False)
+                    logging.info("found doc: %s", type(doc))
+                    if doc is not None:
+                        return doc
             if notfound:
                 return self._get_default_not_found()
 
+    def get_binary(self, path: DocPath) -> Optional[BinaryDoc]:
+        return self.get_binary_from_roots(self.metadata.root_names, path)
+
+    def get_binary_from_roots(
+        self, rootnames: List[str], path: DocPath
+    ) -> Optional[BinaryDoc]:
+        """the file at path in the first root that accepts its type and has it"""
+        for name in self.filter_root_names_for_path(rootnames, path):
+            doc = self.keyed_cdocs[name].get_binary(path)
+            if doc is not None:
+                return doc
+        return None
+
+    def open_doc(self, path: DocPath) -> Optional[BinaryIO]:
+        doc = self.get_binary(path)
+        return None if doc is None else doc.open()
+
+    def changes_since(
+        self, token: Optional[str] = None, rootnames: Optional[List[str]] = None
+    ) -> ChangeSet:
+        """
+        the docpaths in each root that changed since token was given
+        out, and a new token. a docpath changed if its file did, if a
+        tokens or labels file above it did, or if a cached render of it
+        used a file that did. without a token, or with one that can't be
+        used for a root, every docpath of the root is listed and the
+        root is in the change set's full. each root's change tree keeps
+        what it has seen, so a call only looks again at the directories
+        that are due a check under [changes] check_interval or that
+        a watcher has reported.
+        """
+        rootnames = self.metadata.root_names if rootnames is None else rootnames
+        marks = decode_token(token)
+        changes: Dict[str, List[DocPath]] = {}
+        full: List[str] = []
+        changed: List[FilePath] = []
+        for name in rootnames:
+            tree = self.keyed_cdocs[name].changes
+            mark = marks.get(name)
+            if mark is None or mark[0] != tree.epoch or mark[1] > tree.seq:
+                # the sequence is taken first, so nothing seen while listing is missed
+                marks[name] = (tree.epoch, tree.seq)
+                changes[name] = tree.docpaths()
+                full.append(name)
+                continue
+            files, seq = tree.changed_since(mark[1])
+            changes[name] = tree.docpaths(files)
+            changed += files
+            marks[name] = (tree.epoch, seq)
+        # docs whose cached renders pulled in a changed file
+        if len(changed) > 0:
+            changed = normalize(changed)
+            for name in rootnames:
+                if name in full:
+                    continue
+                docpaths = set(changes[name])
+                for key, entry in self.keyed_cdocs[name].render_cache.items():
+                    if not normalize(entry.dependencies).isdisjoint(changed):
+                        docpaths.add("/" + key[1])
+                changes[name] = sorted(docpaths)
+        return ChangeSet(changes, full, encode_token(marks))
+
+    def get_json(
+        self,
+        path: DocPath,
+        readonly: Optional[bool] = False,
+        splitplus: Optional[bool] = True,
+    ) -> Optional[Any]:
+        return self.get_json_from_roots(
+            self.metadata.root_names, path, readonly, splitplus
+        )
+
+    def get_json_from_roots(
+        self,
+        rootnames: List[str],
+        path: DocPath,
+        readonly: Optional[bool] = False,
+        splitplus: Optional[bool] = True,
+    ) -> Optional[Any]:
+        """
+        returns the parsed json at path from the first of the roots that
+        accept json and have it. see Cdocs.get_json. with splitplus each
+        part of a plus path can come from a different root, and the parts
+        are deep merged. roots in [defaults] nosplitplus take the whole
+        plus path from one root.
+        """
+        accepts = self.metadata.accepted_by.get("json", [])
+        rootnames = [name for name in rootnames if name in accepts]
+        plusmark = self._metadata.config.get("filenames", "plus")
+        value = None
+        if splitplus and path.find(plusmark) > -1:
+            splitroots, paths = self._split_plus(rootnames, path, False, splitplus)
+            if len(splitroots) > 0:
+                for apath in paths:
+                    part = self._first_json(splitroots, apath)
+                    if part is not None:
+                        value = part if value is None else deep_merge(value, part)
+                value = None if value is None else freeze(value)
+                return value if value is None or readonly else thaw(value)
+        value = self._first_json(rootnames, path)
+        return value if value is None or readonly else thaw(value)
+
+    def _first_json(self, rootnames: List[str], path: DocPath) -> Optional[Any]:
+        for name in rootnames:
+            value = self.keyed_cdocs[name].get_json(path, True)
+            if value is not None:
+                return value
+        return None
+
+    def _split_plus(
+        self,
+        rootnames: List[str],
+        path: DocPath,
+        notfound: Optional[bool] = True,
+        splitplus: Optional[bool] = True,
+    ) -> Tuple[List[str], List[DocPath]]:
+        """returns the roots that allow split pluses and the paths a plus path splits into"""
+        plusmark = self._metadata.config.get("filenames", "plus")
+        if self._nosplitplus is None:
+            nsp = self._metadata.config.get("defaults", "nosplitplus", "")
+            self._nosplitplus = nsp.split(",")
+        if len(self._nosplitplus) > 0:
+            rootnames = [
+                name for name in rootnames if name not in self._nosplitplus
+            ]
+            logging.info(
+                "Context.get_doc_from_roots: nsp filtered rootnames: %s", rootnames
+            )
+        # split into paths. the caller gets each from the roots, then concats
+        #
+        #  /r/o/o/t.html#fish
+        # needs to become /r/o/o
+        #
+        #  /r/o/o/t#fish
+        # needs to become /r/o/o/t
+        #
+        #  /r/o/o/t
+        # needs to become /r/o/o/t
+        #
+        logging.info("Context.get_doc_from_roots: path: %s", path)
+        logging.info("Context.get_doc_from_roots: rootnames: %s", rootnames)
+        logging.info("Context.get_doc_from_roots: notfound: %s", notfound)
+        logging.info("Context.get_doc_from_roots: splitplus: %s", splitplus)
+        paths = path.split(plusmark)
+        logging.info("Context.get_doc_from_roots: paths: %s", paths)
+        rootpath = paths[0]
+        logging.info("Context.get_doc_from_roots: rootpath: %s", rootpath)
+        hashmark = self._metadata.config.get("filenames", "hashmark")
+        logging.info("Context.get_doc_from_roots: hashmark: %s", hashmark)
+        rootpath = rootpath.split(hashmark)[0]
+        logging.info("Context.get_doc_from_roots: rootpath: %s", rootpath)
+        paths = [p if p.find(rootpath) > -1 else rootpath + "/" + p for p in paths]
+        logging.info("Context.get_doc_from_roots: paths: %s", paths)
+        return rootnames, paths
+
+    def _parallel(self, rootnames: List[str]) -> bool:
+        return (
+            not self._closed
+            and self._concurrency > 1
+            and len(rootnames) > 1
+            and not getattr(_local, "in_pool", False)
+        )
+
+    def _get_doc_in_parallel(self, rootnames: List[str], path: DocPath) -> Optional[Doc]:
+        """
+        probes all the roots at once. results are taken in root order, so
+        the first root with the doc wins, as it does when probing one by
+        one. once a root answers, the probes of the roots after it that
+        have not started are cancelled. the files each probe used are
+        recorded on the probe's thread, so they are handed back and
+        recorded here for the winning root and every root before it, as
+        a render that probes one by one would.
+        """
+        try:
+            executor = self._get_executor()
+            futures = [
+                executor.submit(self._probe, self.keyed_cdocs[_], path) for _ in rootnames
+            ]
+        except RuntimeError:
+            # the context was closed under us
+            return self._get_doc_in_order(rootnames, path)
+        try:
+            for name, future in zip(rootnames, futures):
+                doc, deps = future.result()
+                dependencies.record_all(deps)
+                if doc is not None:
+                    logging.info(
+                        "Context._get_doc_in_parallel: %s found in %s", path, name
+                    )
+                    return doc
+            return None
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _probe(self, cdocs: Cdocs, path: DocPath):
+        with dependencies.track() as deps:
+            doc = cdocs.get_doc(path, False)
+        return doc, deps
+
+    def _get_doc_in_order(self, rootnames: List[str], path: DocPath) -> Optional[Doc]:
+        for name in rootnames:
+            doc = self.keyed_cdocs[name].get_doc(path, False)
+            if doc is not None:
+                return doc
+        return None
+
+    # ==== streams ==================
+
+    def get_doc_stream(
+        self,
+        path: DocPath,
+        notfound: Optional[bool] = True,
+        splitplus: Optional[bool] = True,
+    ) -> Optional[Iterator[str]]:
+        return self.get_doc_from_roots_stream(
+            self.metadata.root_names, path, notfound, splitplus
+        )
+
+    def get_concat_doc_stream(self, path: DocPath) -> Optional[Iterator[str]]:
+        return self.get_concat_doc_from_roots_stream(self.metadata.root_names, path)
+
+    def get_compose_doc_stream(self, path: DocPath) -> Optional[Iterator[str]]:
+        return self.get_compose_doc_from_roots_stream(self.metadata.root_names, path)
+
+    def get_doc_from_roots_stream(
+        self,
+        rootnames: List[str],
+        path: DocPath,
+        notfound: Optional[bool] = True,
+        splitplus: Optional[bool] = True,
+    ) -> Optional[Iterator[str]]:
+        """
+        the same doc as get_doc_from_roots, as an iterator of chunks. see
+        Cdocs.get_doc_stream. the roots are probed in order, without
+        rendering, to find the one that has the doc.
+        """
+        plusmark = self._metadata.config.get("filenames", "plus")
+        if path.find(plusmark) > -1 and splitplus:
+            rootnames, paths = self._split_plus(rootnames, path, notfound, splitplus)
+            streams = [self.get_doc_from_roots_stream(rootnames, p, notfound) for p in paths]
+            streams = [s for s in streams if s is not None]
+            if len(streams) == 0:
+                return self._get_default_not_found_stream(notfound)
+            return itertools.chain.from_iterable(streams)
+        rootnames = self.filter_root_names_for_path(rootnames, path)
+        for _ in rootnames:
+            stream = self.keyed_cdocs[_].get_doc_stream(path, False)
+            if stream is not None:
+                return stream
+        return self._get_default_not_found_stream(notfound)
+
+    def get_concat_doc_from_roots_stream(
+        self, rootnames: List[str], path: DocPath, notfound: Optional[bool] = True
+    ) -> Optional[Iterator[str]]:
+        rootnames = self.filter_root_names_for_path(rootnames, path)
+        for _ in rootnames:
+            stream = self.keyed_cdocs[_].get_concat_doc_stream(path)
+            if stream is not None:
+                return stream
+        return self._get_default_not_found_stream(notfound)
+
+    def get_compose_doc_from_roots_stream(
+        self, rootnames: List[str], path: DocPath, notfound: Optional[bool] = True
+    ) -> Optional[Iterator[str]]:
+        rootnames = self.filter_root_names_for_path(rootnames, path)
+        for _ in rootnames:
+            stream = self.keyed_cdocs[_].get_compose_doc_stream(path)
+            if stream is not None:
+                return stream
+        return self._get_default_not_found_stream(notfound)
+
+    def _get_default_not_found_stream(self, notfound: Optional[bool]) -> Optional[Iterator[str]]:
+        doc = self._get_default_not_found() if notfound else None
+        return None if doc is None else iter([doc])
+
+    # ==== batches ==================
+
+    def get_docs(
+        self,
+        paths: List[DocPath],
+        notfound: Optional[bool] = True,
+        splitplus: Optional[bool] = True,
+    ) -> List[BatchResult]:
+        return self.get_docs_from_roots(
+            self.metadata.root_names, paths, notfound, splitplus
+        )
+
+    def get_labels_many(
+        self, paths: List[DocPath], recurse: Optional[bool] = True
+    ) -> List[BatchResult]:
+        return self.get_labels_many_from_roots(self.metadata.root_names, paths, recurse)
+
+    def get_tokens_many(
+        self, paths: List[DocPath], recurse: Optional[bool] = True
+    ) -> List[BatchResult]:
+        return self.get_tokens_many_from_roots(self.metadata.root_names, paths, recurse)
+
+    def get_docs_from_roots(
+        self,
+        rootnames: List[str],
+        paths: List[DocPath],
+        notfound: Optional[bool] = True,
+        splitplus: Optional[bool] = True,
+    ) -> List[BatchResult]:
+        """
+        gets many docs at once. see Cdocs.get_docs. results are in the
+        order of paths and each is what get_doc_from_roots would return.
+        """
+        return self._run_batch(
+            paths,
+            lambda path: self.get_doc_from_roots(rootnames, path, notfound, splitplus),
+        )
+
+    def get_labels_many_from_roots(
+        self, rootnames: List[str], paths: List[DocPath], recurse: Optional[bool] = True
+    ) -> List[BatchResult]:
+        return self._run_batch(
+            paths, lambda path: self.get_labels_from_roots(rootnames, path, recurse)
+        )
+
+    def get_tokens_many_from_roots(
+        self, rootnames: List[str], paths: List[DocPath], recurse: Optional[bool] = True
+    ) -> List[BatchResult]:
+        return self._run_batch(
+            paths, lambda path: self.get_tokens_from_roots(rootnames, path, recurse)
+        )
+
+    def _run_batch(self, paths: List[DocPath], fn) -> List[BatchResult]:
+        config = self.metadata.config
+        hashmark = config.get("filenames", "hashmark", "#")
+        plus = config.get("filenames", "plus", "+")
+        return run_batch(
+            self.cdocs, paths, fn, lambda path: batch_directory(path, hashmark, plus)
+        )
+
     def _get_default_not_found(self) -> Optional[Doc]:
         notfound = self._metadata.config.get("defaults", "notfound")
         if notfound is None:
@@ -2,13 +2,14 @@ from typing import Optional, List, Dict
 import logging
 from cdocs.config import Config
 from cdocs.simple_config import SimpleConfig
+from cdocs.config_snapshot import snapshot
 from cdocs.contextual_docs import FilePath
 
 
 class ContextMetadata(object):
 
     def __init__(self, config:Optional[Config]=None):
-        self._config = SimpleConfig() if config is None else config
+        self._config = snapshot(SimpleConfig() if config is None else config)
         self._roots:List[str] = [ _[1] for _ in self.config.get_items("docs")]
         self._keyed_roots = { _[0]:_[1] for _ in self.config.get_items("docs")}
         self._root_names = [ _[0] for _ in self.config.get_items("docs")]
@@ -36,7 +37,7 @@ class ContextMetadata(object):
                 self._uses_format[av] = fs
 
     def _load_accepted_by(self):
-        logging.info(f"ContextMetadata._load_accepted_by: starting with: {self._accepts}")
+        logging.info("ContextMetadata._load_accepted_by: starting with: %s", self._accepts)
         for k,v in self._accepts.items():
             #v = self._accepts[k]
             for av in v:
@@ -81,6 +82,6 @@ class ContextMetadata(object):
 
     @config.setter
     def config(self, config:Config) -> None:
-        self._config = config
+        self._config = snapshot(config)
 
 
@@ -0,0 +1,140 @@
+import os
+import time
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+from cdocs.simple_config import SimpleConfig
+from cdocs.context_metadata import ContextMetadata
+from cdocs.context import Context
+
+DEFAULT_CONFIG = "config/config.ini"
+
+# the (mtime, size) of a config file, or None if there is no file
+Stamp = Optional[Tuple[int, int]]
+
+
+def _stamp(path: str) -> Stamp:
+    try:
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+
+class _Entry(object):
+    __slots__ = ("context", "stamp", "checked", "building", "lock")
+
+    def __init__(self):
+        self.context: Optional[Context] = None
+        self.stamp: Stamp = None
+        self.checked = 0.0
+        self.building = False
+        self.lock = threading.Lock()
+
+
+class ContextRegistry(object):
+    """
+    ContextRegistry keeps one warm Context per config file for the life
+    of the process. the first get for a config builds its context. after
+    that, a get at most every check_interval seconds looks at the config
+    file, and if it has changed a new context is built on a background
+    thread. the new context replaces the old one in one step when it is
+    ready. requests that already have the old context finish with it,
+    and no request waits for a build.
+    """
+
+    def __init__(self, check_interval: Optional[float] = None):
+        self._check_interval = check_interval
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, config_path: Optional[str]) -> str:
+        return os.path.abspath(DEFAULT_CONFIG if config_path is None else config_path)
+
+    def _entry(self, key: str) -> _Entry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _Entry()
+                self._entries[key] = entry
+            return entry
+
+    def get(self, config_path: Optional[str] = None) -> Context:
+        key = self._key(config_path)
+        entry = self._entry(key)
+        context = entry.context
+        if context is None:
+            with entry.lock:
+                if entry.context is None:
+                    self._build(key, entry)
+            return entry.context
+        now = time.monotonic()
+        if now - entry.checked >= self._interval(context):
+            entry.checked = now
+            if _stamp(key) != entry.stamp:
+                self._rebuild_in_background(key, entry)
+        return context
+
+    def reload(self, config_path: Optional[str] = None) -> Context:
+        """builds a new context for the config now and swaps it in"""
+        key = self._key(config_path)
+        entry = self._entry(key)
+        with entry.lock:
+            self._build(key, entry)
+        return entry.context
+
+    def clear(self) -> None:
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries = {}
+        for entry in entries:
+            if entry.context is not None:
+                entry.context.close()
+
+    def _interval(self, context: Context) -> float:
+        if self._check_interval is not None:
+            return self._check_interval
+        return float(context.metadata.config.get("context", "check_interval", "1"))
+
+    def _rebuild_in_background(self, key: str, entry: _Entry) -> None:
+        with entry.lock:
+            if entry.building:
+                return
+            entry.building = True
+        logging.info("ContextRegistry: %s changed. building a new context.", key)
+        thread = threading.Thread(
+            target=self._rebuild, args=(key, entry), name="cdocs-reload", daemon=True
+        )
+        thread.start()
+
+    def _rebuild(self, key: str, entry: _Entry) -> None:
+        try:
+            with entry.lock:
+                self._build(key, entry)
+        except Exception as e:
+            logging.error("ContextRegistry: cannot build a context for %s: %s", key, e)
+        finally:
+            entry.building = False
+
+    def _build(self, key: str, entry: _Entry) -> None:
+        # stamp first, so a change made during the build is seen next time
+        stamp = _stamp(key)
+        try:
+            context = Context(ContextMetadata(SimpleConfig(key)))
+        finally:
+            # a config that fails to build is not tried again until it changes
+            entry.stamp = stamp
+            entry.checked = time.monotonic()
+        old = entry.context
+        entry.context = context
+        if old is not None:
+            if any(c.watcher is not None for c in old.cdocs):
+                context.watch()
+            # requests still using the old context finish without its pool
+            old.close()
+
+
+#
+# the registry behind Context.get_shared
+#
+registry = ContextRegistry()
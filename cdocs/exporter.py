@@ -0,0 +1,210 @@
+import os
+import json
+import logging
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from cdocs.contextual_docs import DocPath, FilePath
+from cdocs.simple_config import SimpleConfig
+from cdocs.simple_index import SimpleIndex
+from cdocs.context_metadata import ContextMetadata
+from cdocs.context import Context
+import cdocs.render_cache as dependencies
+
+# docs that can be composed when their extension is not one of a root's formats
+COMPOSE_TYPES = ["xml", "html", "md"]
+MANIFEST = ".export.json"
+
+# one doc to export: root name, get_doc method, docpath, path relative to the out dir
+Job = Tuple[str, str, DocPath, str]
+
+#
+# each worker process has its own context, built from the config once
+#
+_context: Optional[Context] = None
+
+
+def _start_worker(config_path: Optional[str]) -> None:
+    global _context
+    _context = Context(ContextMetadata(SimpleConfig(config_path)))
+
+
+def _export(out: str, job: Job) -> Tuple[Job, Optional[Dict], Optional[str]]:
+    """renders one doc and writes it. returns the job, its dependencies and any error."""
+    rootname, method, docpath, rel = job
+    cdocs = _context.keyed_cdocs[rootname]
+    try:
+        with dependencies.track() as deps:
+            if method == "get_doc":
+                content = cdocs.get_doc(docpath, False)
+            else:
+                content = getattr(cdocs, method)(docpath)
+        if content is None:
+            return job, None, f"nothing at {docpath}"
+        write_atomically(os.path.join(out, rel), content)
+        return job, {f: list(s) if s is not None else None for f, s in deps.items()}, None
+    except Exception as e:
+        return job, None, f"{type(e).__name__}: {e}"
+
+
+def write_atomically(path: str, content) -> None:
+    """writes to a temp file next to path and renames it, so readers never see a partial file"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".export")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content if isinstance(content, bytes) else content.encode("utf-8"))
+        os.replace(tmp, path)
+    except Exception:
+        os.unlink(tmp)
+        raise
+
+
+class Exporter(object):
+    """
+    Exporter renders every doc in a set of roots to files under an out
+    directory, one directory per root, for serving as static files. docs
+    are rendered on a pool of processes. the files each doc used are kept
+    in a manifest in the out directory, and a doc whose files have not
+    changed since the last export is not rendered again.
+    """
+
+    def __init__(
+        self,
+        out: str,
+        config_path: Optional[str] = None,
+        roots: Optional[List[str]] = None,
+        workers: Optional[int] = None,
+    ):
+        self._out = out
+        self._config_path = config_path
+        self._context = Context(ContextMetadata(SimpleConfig(config_path)))
+        self._roots = self._context.metadata.root_names if roots is None else roots
+        self._workers = (os.cpu_count() or 1) if workers is None else workers
+        self._index = SimpleIndex()
+
+    @property
+    def context(self) -> Context:
+        return self._context
+
+    def export(self, full: bool = False) -> Dict[str, int]:
+        """exports the roots. returns counts of docs written, skipped, removed and failed."""
+        manifest = {} if full else self._read_manifest()
+        jobs = []
+        for rootname in self._roots:
+            jobs += self.list_jobs(rootname)
+        todo = [job for job in jobs if full or self._is_stale(job, manifest)]
+        counts = {"written": 0, "skipped": len(jobs) - len(todo), "removed": 0, "failed": 0}
+        logging.info("Exporter.export: %s of %s docs to render", len(todo), len(jobs))
+        entries = {job[3]: manifest[job[3]] for job in jobs if job[3] in manifest}
+        for job, deps, error in self._run(todo):
+            entry = {"root": job[0], "method": job[1], "docpath": job[2], "deps": deps}
+            if error is not None:
+                logging.warning("Exporter.export: %s:%s failed: %s", job[0], job[2], error)
+                counts["failed"] += 1
+                # the last good output stays. the entry is kept, marked
+                # failed, so the next export tries the doc again.
+                entry["deps"] = {}
+                entry["failed"] = True
+            else:
+                counts["written"] += 1
+            entries[job[3]] = entry
+        # outputs of docs that are gone go too
+        current = {job[3] for job in jobs}
+        for rel in manifest:
+            if rel not in current and manifest[rel].get("root") in self._roots:
+                path = os.path.join(self._out, rel)
+                if os.path.exists(path):
+                    os.remove(path)
+                    counts["removed"] += 1
+            elif rel not in entries:
+                entries[rel] = manifest[rel]
+        self._write_manifest(entries)
+        return counts
+
+    def _run(self, jobs: List[Job]):
+        if len(jobs) == 0:
+            return []
+        if self._workers <= 1:
+            _start_worker(self._config_path)
+            return [_export(self._out, job) for job in jobs]
+        with ProcessPoolExecutor(
+            max_workers=self._workers,
+            initializer=_start_worker,
+            initargs=(self._config_path,),
+        ) as pool:
+            chunksize = max(1, len(jobs) // (self._workers * 4))
+            return list(pool.map(_export, [self._out] * len(jobs), jobs, chunksize=chunksize))
+
+    def list_jobs(self, rootname: str) -> List[Job]:
+        """finds every doc in a root with the method that renders it"""
+        cdocs = self._context.keyed_cdocs[rootname]
+        root = os.path.normpath(cdocs.get_doc_root())
+        skip = [cdocs._tokens_filename, cdocs._labels_filename]
+        jobs = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if d[0:1] != ".")
+            for f in sorted(filenames):
+                if f[0:1] == "." or f in skip:
+                    continue
+                filepath = os.path.join(dirpath, f)
+                rel = os.path.relpath(filepath, root).replace(os.sep, "/")
+                job = self._job_for(cdocs, filepath, rel)
+                if job is None:
+                    logging.info("Exporter.list_jobs: no docpath reaches %s", filepath)
+                else:
+                    jobs.append(job)
+        return jobs
+
+    def _job_for(self, cdocs, filepath: FilePath, rel: str) -> Optional[Job]:
+        dot = rel.rfind(".")
+        ext = rel[dot + 1 :] if dot > -1 else ""
+        out = cdocs.rootname + "/" + rel
+        if ext == "concat":
+            return (cdocs.rootname, "get_concat_doc", DocPath("/" + rel), out)
+        if ext in cdocs.exts and "cdocs" in cdocs.accepts:
+            docpath = DocPath("/" + rel[0:dot])
+            if self._reaches(cdocs, docpath, filepath):
+                return (cdocs.rootname, "get_doc", docpath, out)
+        if ext in COMPOSE_TYPES and "cdocs" in cdocs.accepts:
+            return (cdocs.rootname, "get_compose_doc", DocPath("/" + rel), out)
+        docpath = DocPath("/" + rel)
+        if self._reaches(cdocs, docpath, filepath):
+            return (cdocs.rootname, "get_doc", docpath, out)
+        return None
+
+    def _reaches(self, cdocs, docpath: DocPath, filepath: FilePath) -> bool:
+        try:
+            found = cdocs.pather.get_full_file_path(docpath)
+        except Exception:
+            return False
+        return found is not None and os.path.normpath(found) == os.path.normpath(filepath)
+
+    def _is_stale(self, job: Job, manifest: Dict) -> bool:
+        entry = manifest.get(job[3])
+        if entry is None or entry.get("method") != job[1] or entry.get("docpath") != job[2]:
+            return True
+        if entry.get("failed"):
+            return True
+        if not os.path.exists(os.path.join(self._out, job[3])):
+            return True
+        for filepath, stamp in entry.get("deps", {}).items():
+            now = self._index.stat(filepath)
+            if (list(now) if now is not None else None) != stamp:
+                return True
+        return False
+
+    def _read_manifest(self) -> Dict:
+        path = os.path.join(self._out, MANIFEST)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except Exception as e:
+            logging.warning("Exporter._read_manifest: cannot read %s: %s. exporting everything.", path, e)
+            return {}
+
+    def _write_manifest(self, entries: Dict) -> None:
+        write_atomically(os.path.join(self._out, MANIFEST), json.dumps(entries, indent=1))
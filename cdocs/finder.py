@@ -1,6 +1,6 @@
 import abc
-from cdocs.contextual_docs import DocPath, JsonDict
-from typing import Optional
+from cdocs.contextual_docs import DocPath, FilePath, JsonDict
+from typing import Optional, List
 
 
 class Finder(metaclass=abc.ABCMeta):
@@ -12,3 +12,7 @@ class Finder(metaclass=abc.ABCMeta):
     def find_tokens(self, path:DocPath=None, filename:str="tokens.json", recurse:Optional[bool]=True) -> JsonDict:
         pass
 
+    def invalidate(self, filepaths:List[FilePath]) -> None:
+        """ forget anything held about these files or anything below them """
+        pass
+
@@ -0,0 +1,58 @@
+import abc
+import os
+from typing import Iterable, List, Optional, Set, Tuple
+from cdocs.contextual_docs import FilePath
+
+# a stamp is the (mtime in nanoseconds, size) of a file
+Stamp = Tuple[int, int]
+
+
+def normalize(filepaths: Iterable[FilePath]) -> Set[str]:
+    return {os.path.normpath(f) for f in filepaths if f is not None}
+
+
+def is_under(filepath: FilePath, paths: Set[str]) -> bool:
+    """true if filepath is one of paths, or is in a directory in paths.
+    paths must be normalized."""
+    path = os.path.normpath(filepath)
+    while True:
+        if path in paths:
+            return True
+        parent = os.path.dirname(path)
+        if parent == path or parent == "":
+            return False
+        path = parent
+
+
+class Index(metaclass=abc.ABCMeta):
+    """
+    Index answers questions about the files under a root: does a path
+    exist, is it a file, what is in a directory. the default index asks
+    the filesystem every time. other indexes may answer from memory.
+    """
+
+    @abc.abstractmethod
+    def exists(self, filepath: FilePath) -> bool:
+        pass
+
+    @abc.abstractmethod
+    def isfile(self, filepath: FilePath) -> bool:
+        pass
+
+    @abc.abstractmethod
+    def isdir(self, filepath: FilePath) -> bool:
+        pass
+
+    @abc.abstractmethod
+    def listdir(self, filepath: FilePath) -> List[str]:
+        pass
+
+    @abc.abstractmethod
+    def stat(self, filepath: FilePath) -> Optional[Stamp]:
+        """returns the stamp of a file or None if there is no such file"""
+        pass
+
+    @abc.abstractmethod
+    def refresh(self, filepath: Optional[FilePath] = None) -> None:
+        """refresh the whole index, or only the part at filepath"""
+        pass
@@ -0,0 +1,171 @@
+import os
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import logging
+from typing import Dict, List, Optional, Set
+from cdocs.contextual_docs import FilePath
+from cdocs.watcher import Watcher, WatcherException
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+# wd, mask, cookie, length of name
+EVENT = struct.Struct("iIII")
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        name = ctypes.util.find_library("c") or "libc.so.6"
+        libc = ctypes.CDLL(name, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise WatcherException("InotifyWatcher: libc has no inotify")
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        _libc = libc
+    return _libc
+
+
+def available() -> bool:
+    try:
+        _load_libc()
+        return True
+    except (OSError, AttributeError, WatcherException):
+        return False
+
+
+class InotifyWatcher(Watcher):
+    """
+    InotifyWatcher asks linux to tell it when anything under the root
+    changes. every directory gets a watch, and new directories are
+    watched as they appear. events are gathered until the root has been
+    quiet for the debounce seconds, so a pipeline writing many files
+    causes one dispatch. if the kernel's queue overflows the whole root
+    is invalidated.
+    """
+
+    def __init__(self, cdocs, interval: float = 1.0, debounce: float = 0.1):
+        super().__init__(cdocs, interval)
+        self._debounce = debounce
+        self._fd: Optional[int] = None
+        self._paths: Dict[int, FilePath] = {}
+
+    def _prepare(self) -> None:
+        libc = _load_libc()
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            e = ctypes.get_errno()
+            raise WatcherException(f"InotifyWatcher: inotify_init1 failed: {os.strerror(e)}")
+        self._fd = fd
+        self._paths = {}
+        self._add_tree(self._root)
+
+    def _cleanup(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._paths = {}
+
+    def _watch(self) -> None:
+        ready, _, _ = select.select([self._fd], [], [], self._interval)
+        if not ready or self._stopping.is_set():
+            return
+        changed: Set[FilePath] = set()
+        while True:
+            self._read(changed)
+            # keep reading while events keep coming
+            ready, _, _ = select.select([self._fd], [], [], self._debounce)
+            if not ready or self._stopping.is_set():
+                break
+        self._dispatch(list(changed))
+
+    def _read(self, changed: Set[FilePath]) -> None:
+        try:
+            data = os.read(self._fd, 65536)
+        except OSError as e:
+            if e.errno == errno.EAGAIN:
+                return
+            raise
+        offset = 0
+        while offset + EVENT.size <= len(data):
+            wd, mask, cookie, length = EVENT.unpack_from(data, offset)
+            offset += EVENT.size
+            name = data[offset : offset + length].rstrip(b"\0").decode("utf-8", "replace")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                logging.warning("InotifyWatcher._read: queue overflow on %s", self._root)
+                changed.add(self._root)
+                continue
+            if mask & IN_IGNORED:
+                self._paths.pop(wd, None)
+                continue
+            directory = self._paths.get(wd)
+            if directory is None:
+                continue
+            path = FilePath(os.path.join(directory, name)) if name else directory
+            changed.add(path)
+            if mask & IN_ISDIR and mask & IN_MOVED_FROM:
+                # the watches go with the directory. they are dropped here
+                # and added again if it turns up under the root.
+                self._remove_tree(path)
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                # anything written into the directory before its watch
+                # was added is found by the walk
+                changed.update(self._add_tree(path))
+
+    def _add_tree(self, path: FilePath) -> List[FilePath]:
+        found = []
+        self._add(path)
+        for directory, dirs, files in os.walk(path):
+            for d in dirs:
+                sub = FilePath(os.path.join(directory, d))
+                self._add(sub)
+                found.append(sub)
+            found += [FilePath(os.path.join(directory, f)) for f in files]
+        return found
+
+    def _remove_tree(self, path: FilePath) -> None:
+        below = path + os.sep
+        for wd, watched in list(self._paths.items()):
+            if watched == path or watched.startswith(below):
+                _load_libc().inotify_rm_watch(self._fd, wd)
+                self._paths.pop(wd, None)
+
+    def _add(self, path: FilePath) -> None:
+        wd = _load_libc().inotify_add_watch(self._fd, os.fsencode(path), MASK)
+        if wd < 0:
+            e = ctypes.get_errno()
+            logging.warning("InotifyWatcher._add: cannot watch %s: %s", path, os.strerror(e))
+            return
+        self._paths[wd] = path
@@ -0,0 +1,86 @@
+from typing import Any, Iterable, Optional
+from cdocs.contextual_docs import FilePath
+from cdocs.index import Stamp, normalize, is_under
+from cdocs.lru_cache import LruCache
+
+
+class ReadOnlyDict(dict):
+    """
+    a dict that can't be changed. it is still a dict, so it can be
+    dumped as json or read like any other dict.
+    """
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("this json is read-only. ask for it without readonly to change it.")
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    __ior__ = _read_only
+    clear = _read_only
+    pop = _read_only
+    popitem = _read_only
+    setdefault = _read_only
+    update = _read_only
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def freeze(value: Any) -> Any:
+    """returns value with dicts made read-only and lists made tuples"""
+    if isinstance(value, ReadOnlyDict):
+        return value
+    if isinstance(value, dict):
+        return ReadOnlyDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """returns a copy of value that can be changed"""
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, (tuple, list)):
+        return [thaw(v) for v in value]
+    return value
+
+
+def deep_merge(base: Any, more: Any) -> Any:
+    """
+    merges more over base. dicts are merged key by key, all the way
+    down. anything else in more replaces what is in base. neither is
+    changed. parts that are not merged are shared with the originals.
+    """
+    if not isinstance(base, dict) or not isinstance(more, dict):
+        return more
+    merged = dict(base)
+    for key, value in more.items():
+        merged[key] = deep_merge(merged[key], value) if key in merged else value
+    return merged
+
+
+class JsonCache(LruCache):
+    """
+    JsonCache holds the parsed, read-only json of files, each with the
+    stamp its file had when it was parsed. a file is parsed again only
+    when its stamp changes.
+    """
+
+    def load(self, filepath: FilePath, stamp: Optional[Stamp]) -> Optional[Any]:
+        entry = self.get(filepath)
+        if entry is None or entry[0] != stamp:
+            return None
+        return entry[1]
+
+    def keep(self, filepath: FilePath, stamp: Optional[Stamp], value: Any) -> None:
+        self.put(filepath, (stamp, value))
+
+    def invalidate(self, filepaths: Iterable[FilePath]) -> None:
+        paths = normalize(filepaths)
+        for filepath, entry in self.items():
+            if is_under(filepath, paths):
+                self.remove(filepath)
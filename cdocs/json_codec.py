@@ -0,0 +1,54 @@
+import json
+import logging
+from typing import Any, Union
+
+#
+# orjson is optional. when it is installed it parses and writes json
+# several times faster than the json module.
+#
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def available() -> bool:
+    """true if orjson can be used"""
+    return orjson is not None
+
+
+class JsonCodec(object):
+    """JsonCodec parses and writes json with the json module"""
+
+    name = "json"
+
+    def loads(self, content: Union[str, bytes]) -> Any:
+        return json.loads(content)
+
+    def dumps(self, value: Any) -> str:
+        return json.dumps(value)
+
+
+class OrjsonCodec(JsonCodec):
+    """OrjsonCodec parses and writes json with orjson"""
+
+    name = "orjson"
+
+    def loads(self, content: Union[str, bytes]) -> Any:
+        return orjson.loads(content)
+
+    def dumps(self, value: Any) -> str:
+        return orjson.dumps(value).decode("utf-8")
+
+
+def create_codec(name: str = "auto") -> JsonCodec:
+    """
+    name is auto, to use orjson when it is installed, json or orjson.
+    asking for orjson when it is not installed falls back to json.
+    """
+    name = name.strip().lower()
+    if name in ["auto", "orjson"] and available():
+        return OrjsonCodec()
+    if name == "orjson":
+        logging.warning("json_codec.create_codec: orjson is not installed. using json.")
+    return JsonCodec()
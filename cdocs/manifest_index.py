@@ -0,0 +1,246 @@
+import os
+import mmap
+import struct
+import hashlib
+import logging
+import tempfile
+from typing import List, Optional, Tuple
+from cdocs.contextual_docs import FilePath
+from cdocs.index import Index, Stamp
+from cdocs.simple_index import SimpleIndex
+
+
+class ManifestException(Exception):
+    pass
+
+
+#
+# a manifest is:
+#   a header: magic, version, record size, record count
+#   a table of fixed size records, sorted by key
+#   a blob of keys
+#
+# a key is the parent directory, a NUL byte and the name, all relative
+# to the root. sorting on that key keeps each directory's entries
+# together, so a lookup or a listing is a binary search.
+#
+MAGIC = b"CDXM"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+# key offset, key length, kind, mtime ns, size, sha1 of content
+RECORD = struct.Struct("<IHBxQQ20s")
+FILE = 0
+DIR = 1
+SUFFIX = ".cdx"
+
+
+def manifest_path(directory: str, rootname: str) -> str:
+    return os.path.join(directory, rootname + SUFFIX)
+
+
+def build_manifest(root: FilePath, path: str) -> int:
+    """
+    walks root and writes its manifest to path. the file is written
+    to a temp file and renamed, so readers never see a partial one.
+    returns the number of entries.
+    """
+    entries = []
+    _walk(os.path.normpath(root), "", entries)
+    entries.sort(key=lambda e: e[0])
+    blob = bytearray()
+    table = bytearray()
+    for key, kind, mtime, size, digest in entries:
+        table += RECORD.pack(len(blob), len(key), kind, mtime, size, digest)
+        blob += key
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".cdx")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, len(entries)))
+            f.write(table)
+            f.write(blob)
+        os.replace(tmp, path)
+    except Exception:
+        os.unlink(tmp)
+        raise
+    logging.info(f"build_manifest: wrote {len(entries)} entries for {root} to {path}")
+    return len(entries)
+
+
+def _walk(root: str, rel: str, entries: List) -> None:
+    with os.scandir(root if rel == "" else os.path.join(root, rel)) as scan:
+        for entry in scan:
+            key = _key(rel, entry.name)
+            sub = entry.name if rel == "" else rel + "/" + entry.name
+            if entry.is_dir():
+                entries.append((key, DIR, 0, 0, b"\0" * 20))
+                _walk(root, sub, entries)
+            elif entry.is_file():
+                st = entry.stat()
+                entries.append(
+                    (key, FILE, st.st_mtime_ns, st.st_size, _digest(entry.path))
+                )
+
+
+def _key(parent: str, name: str) -> bytes:
+    return parent.encode("utf-8") + b"\0" + name.encode("utf-8")
+
+
+def _digest(path: str) -> bytes:
+    sha = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            sha.update(chunk)
+    return sha.digest()
+
+
+class Manifest(object):
+    """
+    Manifest is a read-only, mmap'd view of one manifest file. lookups
+    only touch the pages they need and every worker on a host shares
+    the same page cache.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, size, count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or size != RECORD.size:
+            self._map.close()
+            raise ManifestException(f"Manifest: {path} is not a version {VERSION} manifest")
+        self._count = count
+        self._blob = HEADER.size + RECORD.size * count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def find(self, rel: str) -> Optional[Tuple]:
+        """returns the record for a path relative to the root, or None"""
+        sep = rel.rfind("/")
+        key = _key(rel[0:sep] if sep > -1 else "", rel[sep + 1 :])
+        i = self._lower_bound(key)
+        if i < self._count:
+            record = self._record(i)
+            if self._key(record) == key:
+                return record
+        return None
+
+    def children(self, rel: str) -> List[str]:
+        prefix = rel.encode("utf-8") + b"\0"
+        names = []
+        i = self._lower_bound(prefix)
+        while i < self._count:
+            key = self._key(self._record(i))
+            if not key.startswith(prefix):
+                break
+            names.append(key[len(prefix) :].decode("utf-8"))
+            i += 1
+        return names
+
+    def _record(self, i: int) -> Tuple:
+        return RECORD.unpack_from(self._map, HEADER.size + RECORD.size * i)
+
+    def _key(self, record: Tuple) -> bytes:
+        start = self._blob + record[0]
+        return self._map[start : start + record[1]]
+
+    def _lower_bound(self, key: bytes) -> int:
+        lo = 0
+        hi = self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(self._record(mid)) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+
+class ManifestIndex(Index):
+    """
+    ManifestIndex answers from a manifest written by 'cdocs index build'.
+    refresh() reopens the manifest, for example after a rebuild. paths
+    outside the root are passed through to the filesystem.
+    """
+
+    def __init__(self, root: FilePath, path: str):
+        self._root = FilePath(os.path.normpath(root))
+        self._path = path
+        self._passthrough = SimpleIndex()
+        self._manifest = Manifest(path)
+
+    @property
+    def root(self) -> FilePath:
+        return self._root
+
+    def __len__(self) -> int:
+        return len(self._manifest)
+
+    # ===================
+    # Index methods
+    # ===================
+
+    def exists(self, filepath: FilePath) -> bool:
+        rel = self._relative(filepath)
+        if rel is None:
+            return self._passthrough.exists(filepath)
+        return rel == "" or self._manifest.find(rel) is not None
+
+    def isfile(self, filepath: FilePath) -> bool:
+        rel = self._relative(filepath)
+        if rel is None:
+            return self._passthrough.isfile(filepath)
+        record = self._manifest.find(rel)
+        return record is not None and record[2] == FILE
+
+    def isdir(self, filepath: FilePath) -> bool:
+        rel = self._relative(filepath)
+        if rel is None:
+            return self._passthrough.isdir(filepath)
+        if rel == "":
+            return True
+        record = self._manifest.find(rel)
+        return record is not None and record[2] == DIR
+
+    def listdir(self, filepath: FilePath) -> List[str]:
+        rel = self._relative(filepath)
+        if rel is None:
+            return self._passthrough.listdir(filepath)
+        if not self.isdir(filepath):
+            raise FileNotFoundError(f"ManifestIndex.listdir: no directory {filepath}")
+        return self._manifest.children(rel)
+
+    def stat(self, filepath: FilePath) -> Optional[Stamp]:
+        rel = self._relative(filepath)
+        if rel is None:
+            return self._passthrough.stat(filepath)
+        record = self._manifest.find(rel)
+        if record is None or record[2] != FILE:
+            return None
+        return (record[3], record[4])
+
+    def hash(self, filepath: FilePath) -> Optional[str]:
+        """returns the sha1 of a file's content when the manifest was built"""
+        rel = self._relative(filepath)
+        record = None if rel is None else self._manifest.find(rel)
+        if record is None or record[2] != FILE:
+            return None
+        return record[5].hex()
+
+    def refresh(self, filepath: Optional[FilePath] = None) -> None:
+        # the manifest is the truth until it is rebuilt, so changes to
+        # single files are ignored. readers holding the old manifest
+        # finish with it. it is closed when the last reference goes away.
+        if filepath is None:
+            self._manifest = Manifest(self._path)
+
+    def _relative(self, filepath: FilePath) -> Optional[str]:
+        if filepath is None:
+            return None
+        path = os.path.normpath(filepath)
+        if path == self._root:
+            return ""
+        if path.startswith(self._root + os.sep):
+            return path[len(self._root) + 1 :].replace(os.sep, "/")
+        return None
@@ -0,0 +1,57 @@
+import os
+import logging
+from typing import Dict, List, Tuple
+from cdocs.contextual_docs import FilePath
+from cdocs.watcher import Watcher
+
+# what we know about a path: is it a directory, mtime ns, size
+Entry = Tuple[bool, int, int]
+
+
+class PollingWatcher(Watcher):
+    """
+    PollingWatcher walks the root with os.scandir every interval and
+    compares what it finds with the last walk. it works everywhere, but
+    a walk costs a stat per file, so use a longer interval for big roots.
+    """
+
+    def __init__(self, cdocs, interval: float = 1.0):
+        super().__init__(cdocs, interval)
+        self._snapshot: Dict[FilePath, Entry] = {}
+
+    def _prepare(self) -> None:
+        self._snapshot = self.snapshot()
+
+    def _watch(self) -> None:
+        if self._stopping.wait(self._interval):
+            return
+        snapshot = self.snapshot()
+        changed = self.diff(self._snapshot, snapshot)
+        self._snapshot = snapshot
+        self._dispatch(changed)
+
+    def snapshot(self) -> Dict[FilePath, Entry]:
+        entries: Dict[FilePath, Entry] = {}
+        self._walk(self._root, entries)
+        return entries
+
+    @classmethod
+    def diff(cls, old: Dict[FilePath, Entry], new: Dict[FilePath, Entry]) -> List[FilePath]:
+        changed = [path for path, entry in new.items() if old.get(path) != entry]
+        changed += [path for path in old if path not in new]
+        return changed
+
+    def _walk(self, path: FilePath, entries: Dict[FilePath, Entry]) -> None:
+        try:
+            with os.scandir(path) as scan:
+                for entry in scan:
+                    if entry.is_dir():
+                        # a directory's mtime changes when it gains or loses
+                        # a name. its contents are compared one by one.
+                        entries[FilePath(entry.path)] = (True, 0, 0)
+                        self._walk(FilePath(entry.path), entries)
+                    elif entry.is_file():
+                        st = entry.stat()
+                        entries[FilePath(entry.path)] = (False, st.st_mtime_ns, st.st_size)
+        except OSError as e:
+            logging.info(f"PollingWatcher._walk: cannot scan {path}: {e}")
@@ -0,0 +1,152 @@
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, Optional
+from cdocs.contextual_docs import FilePath
+from cdocs.index import Index, Stamp, normalize, is_under
+from cdocs.lru_cache import LruCache
+
+#
+# renders in progress on this thread. each is a dict of the files the
+# render has touched so far, by filepath, with the stamp each file had
+# when it was used. a stamp of None means the file did not exist.
+#
+_local = threading.local()
+
+
+def _stack() -> list:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = []
+        _local.stack = stack
+    return stack
+
+
+def tracking() -> bool:
+    """true if a render on this thread is recording its dependencies"""
+    return len(_stack()) > 0
+
+
+def record(filepath: FilePath, stamp: Optional[Stamp]) -> None:
+    """records that the render in progress used filepath"""
+    stack = _stack()
+    if len(stack) > 0 and filepath is not None:
+        stack[-1].setdefault(filepath, stamp)
+
+
+def record_all(dependencies: Dict[FilePath, Optional[Stamp]]) -> None:
+    stack = _stack()
+    if len(stack) > 0:
+        deps = stack[-1]
+        for filepath, stamp in dependencies.items():
+            deps.setdefault(filepath, stamp)
+
+
+def cut() -> None:
+    """records that a render on this thread was cut short, so that the
+    renders in progress around it are not kept"""
+    _local.cuts = cuts() + 1
+
+
+def cuts() -> int:
+    """the count of renders cut short on this thread"""
+    return getattr(_local, "cuts", 0)
+
+
+@contextmanager
+def track() -> Iterator[Dict[FilePath, Optional[Stamp]]]:
+    """
+    collects the dependencies of a render. when the render is nested
+    in another, its dependencies are also dependencies of the outer
+    render.
+    """
+    deps: Dict[FilePath, Optional[Stamp]] = {}
+    stack = _stack()
+    stack.append(deps)
+    try:
+        yield deps
+    finally:
+        stack.pop()
+        record_all(deps)
+
+
+class RenderEntry(object):
+    __slots__ = ("value", "dependencies", "checked")
+
+    def __init__(self, value: Any, dependencies: Dict, checked: float):
+        self.value = value
+        self.dependencies = dependencies
+        self.checked = checked
+
+
+class RenderCache(LruCache):
+    """
+    RenderCache holds rendered docs along with every file the render
+    touched: the doc, the tokens and labels files in its chain, including
+    those that were looked for and not found, and the files of any docs
+    pulled in by the template. an entry is good until one of those files
+    changes. entries are checked at most every check_interval seconds.
+    """
+
+    def __init__(self, index: Index, maxsize: int = 1024, check_interval: float = 0):
+        super().__init__(maxsize)
+        self._index = index
+        self._check_interval = check_interval
+
+    @property
+    def index(self) -> Index:
+        return self._index
+
+    @index.setter
+    def index(self, index: Index) -> None:
+        self._index = index
+
+    def render(self, key: Hashable, render: Callable[[], Any]) -> Any:
+        if self.maxsize <= 0:
+            return render()
+        entry = self.get(key)
+        if entry is not None:
+            if self._is_fresh(entry):
+                record_all(entry.dependencies)
+                return entry.value
+            logging.info("RenderCache.render: %s is stale", key)
+            self.remove(key)
+        before = cuts()
+        with track() as deps:
+            value = render()
+        # binary docs are served as they are. there is nothing to save by
+        # keeping them, only memory to lose. a render that pulled in a doc
+        # that was cut short is not the doc, so it is not kept either.
+        if not isinstance(value, bytes) and cuts() == before:
+            self.put(key, RenderEntry(value, deps, time.monotonic()))
+        return value
+
+    def cached(self, key: Hashable) -> Any:
+        """returns a good cached value without rendering, or None"""
+        entry = self.get(key) if self.maxsize > 0 else None
+        if entry is None or not self._is_fresh(entry):
+            return None
+        record_all(entry.dependencies)
+        return entry.value
+
+    def invalidate(self, filepaths: Iterable[FilePath]) -> int:
+        """drops entries that depend on any of filepaths, or on files below them
+        when they are directories. returns the count dropped."""
+        paths = normalize(filepaths)
+        dropped = 0
+        for key, entry in self.items():
+            if any(is_under(f, paths) for f in entry.dependencies):
+                self.remove(key)
+                dropped += 1
+        return dropped
+
+    def _is_fresh(self, entry: RenderEntry) -> bool:
+        now = time.monotonic()
+        if now - entry.checked < self._check_interval:
+            return True
+        for filepath, stamp in entry.dependencies.items():
+            if self._index.stat(filepath) != stamp:
+                return False
+        entry.checked = now
+        return True
@@ -0,0 +1,84 @@
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Set, Tuple
+import cdocs.render_cache as dependencies
+
+#
+# the scope of the outermost render, or session, on this thread
+#
+_local = threading.local()
+
+
+def current() -> Optional["RenderScope"]:
+    return getattr(_local, "scope", None)
+
+
+@contextmanager
+def scope() -> Iterator["RenderScope"]:
+    """
+    enters the scope on this thread, starting one if there is none. the
+    scope ends when the call that started it is done.
+    """
+    outer = current()
+    if outer is not None:
+        yield outer
+        return
+    ascope = RenderScope()
+    _local.scope = ascope
+    try:
+        yield ascope
+    finally:
+        _local.scope = None
+
+
+class RenderScope(object):
+    """
+    RenderScope remembers work done during one outer call: file paths
+    found for docpaths, tokens and labels, and rendered docs. a compose
+    doc that pulls in the same doc many times renders it once. what is
+    remembered is not checked against the files again until the scope
+    ends. the files each result used are kept with it, so that renders
+    in the render cache still know what they depend on.
+
+    the scope also knows which docs are being rendered, so a doc that
+    pulls itself in, directly or not, is caught at once. renders cut
+    short by such a cycle are not remembered here or in the render cache.
+    """
+
+    def __init__(self):
+        self._memos: Dict[Hashable, Tuple[Any, Dict]] = {}
+        self._rendering: Set[Hashable] = set()
+
+    def __len__(self) -> int:
+        return len(self._memos)
+
+    def memo(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        found = self._memos.get(key)
+        if found is not None:
+            dependencies.record_all(found[1])
+            return found[0]
+        with dependencies.track() as deps:
+            value = fn()
+        self._memos[key] = (value, deps)
+        return value
+
+    def render(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        if key in self._rendering:
+            logging.error("RenderScope.render: %s pulls in itself. returning ''", key)
+            dependencies.cut()
+            return ""
+        if key in self._memos:
+            return self.memo(key, fn)
+        self._rendering.add(key)
+        before = dependencies.cuts()
+        try:
+            with dependencies.track() as deps:
+                value = fn()
+        finally:
+            self._rendering.discard(key)
+        # a render that was cut short is only good for the doc that
+        # pulled it in, so it is not remembered
+        if dependencies.cuts() == before:
+            self._memos[key] = (value, deps)
+        return value
@@ -2,6 +2,7 @@ from cdocs.cdocs import Cdocs, DocNotFoundException, BadDocPath
 from cdocs.context import Context
 from cdocs.simple_config import SimpleConfig
 from cdocs.context_metadata import ContextMetadata
+from cdocs.context_registry import registry
 import unittest
 import os
 import logging
@@ -62,9 +63,12 @@ class Repl(object):
             self.ask_debug()
         if configpath is None:
             configpath = self.ask_config()
-        self._config = SimpleConfig(configpath)
-        self._metadata = ContextMetadata(self._config)
-        self._context = Context(self._metadata)
+        self._use(Context.get_shared(configpath))
+
+    def _use(self, context: Context) -> None:
+        self._context = context
+        self._metadata = context.metadata
+        self._config = context.metadata.config
 
     def loop(self):
         print("\n")
@@ -83,7 +87,7 @@ class Repl(object):
             callme()
 
     def config(self):
-        cfg = f"{os.getcwd()}{os.sep}{self._metadata.config.get_config_path()}"
+        cfg = os.path.join(os.getcwd(), self._metadata.config.get_config_path())
         self._response(cfg)
 
     def debug(self):
@@ -103,7 +107,7 @@ class Repl(object):
         return True
 
     def reload(self):
-        self.setup(askdebug=False, configpath=self._metadata.config.get_config_path())
+        self._use(registry.reload(self._metadata.config.get_config_path()))
 
     def read(self):
         roots = self._get_roots()
@@ -0,0 +1,177 @@
+import os
+import logging
+import threading
+from typing import Dict, List, Optional, Set
+from cdocs.contextual_docs import FilePath
+from cdocs.index import Index, Stamp
+from cdocs.simple_index import SimpleIndex
+
+
+class IndexedDir(object):
+    """
+    IndexedDir is one directory of a RootIndex: the stamps of its files
+    by name and the names of its subdirectories.
+    """
+
+    __slots__ = ("files", "dirs")
+
+    def __init__(self):
+        self.files: Dict[str, Stamp] = {}
+        self.dirs: Set[str] = set()
+
+
+class RootIndex(Index):
+    """
+    RootIndex scans a root once with os.scandir and then answers from
+    memory. it does not see changes on disk until refresh() is called,
+    either for the whole root or for the directory or file that changed.
+    paths outside the root are passed through to the filesystem.
+    """
+
+    def __init__(self, root: FilePath):
+        self._root = FilePath(os.path.normpath(root))
+        self._dirs: Dict[str, IndexedDir] = {}
+        self._lock = threading.Lock()
+        self._passthrough = SimpleIndex()
+        self.refresh()
+
+    @property
+    def root(self) -> FilePath:
+        return self._root
+
+    def __len__(self) -> int:
+        return sum(len(d.files) for d in self._dirs.values())
+
+    # ===================
+    # Index methods
+    # ===================
+
+    def exists(self, filepath: FilePath) -> bool:
+        rel = self._relative(filepath)
+        if rel is None:
+            return self._passthrough.exists(filepath)
+        return rel in self._dirs or self._file_stamp(rel) is not None
+
+    def isfile(self, filepath: FilePath) -> bool:
+        rel = self._relative(filepath)
+        if rel is None:
+            return self._passthrough.isfile(filepath)
+        return self._file_stamp(rel) is not None
+
+    def isdir(self, filepath: FilePath) -> bool:
+        rel = self._relative(filepath)
+        if rel is None:
+            return self._passthrough.isdir(filepath)
+        return rel in self._dirs
+
+    def listdir(self, filepath: FilePath) -> List[str]:
+        rel = self._relative(filepath)
+        if rel is None:
+            return self._passthrough.listdir(filepath)
+        adir = self._dirs.get(rel)
+        if adir is None:
+            raise FileNotFoundError(f"RootIndex.listdir: no directory {filepath}")
+        return list(adir.files) + list(adir.dirs)
+
+    def stat(self, filepath: FilePath) -> Optional[Stamp]:
+        rel = self._relative(filepath)
+        if rel is None:
+            return self._passthrough.stat(filepath)
+        return self._file_stamp(rel)
+
+    def refresh(self, filepath: Optional[FilePath] = None) -> None:
+        rel = "" if filepath is None else self._relative(filepath)
+        if rel is None:
+            logging.info(f"RootIndex.refresh: {filepath} is not in {self._root}")
+            return
+        with self._lock:
+            path = self._absolute(rel)
+            if rel == "":
+                # scan into a new tree so readers never see a partial one
+                dirs = {}
+                self._scan(rel, into=dirs)
+                self._dirs = dirs
+            elif os.path.isdir(path):
+                self._drop(rel)
+                self._scan(rel)
+                self._link(rel)
+            else:
+                # a file changed, or something was removed. the parent
+                # directory is rescanned without descending.
+                self._drop(rel)
+                parent = self._parent(rel)
+                if os.path.isdir(self._absolute(parent)):
+                    self._scan(parent, recurse=False)
+
+    # ===================
+    # internal methods
+    # ===================
+
+    def _relative(self, filepath: FilePath) -> Optional[str]:
+        if filepath is None:
+            return None
+        path = os.path.normpath(filepath)
+        if path == self._root:
+            return ""
+        if path.startswith(self._root + os.sep):
+            return path[len(self._root) + 1 :]
+        return None
+
+    def _absolute(self, rel: str) -> FilePath:
+        return FilePath(self._root if rel == "" else os.path.join(self._root, rel))
+
+    def _parent(self, rel: str) -> str:
+        sep = rel.rfind(os.sep)
+        return "" if sep == -1 else rel[0:sep]
+
+    def _file_stamp(self, rel: str) -> Optional[Stamp]:
+        adir = self._dirs.get(self._parent(rel))
+        if adir is None:
+            return None
+        sep = rel.rfind(os.sep)
+        return adir.files.get(rel[sep + 1 :])
+
+    def _scan(
+        self, rel: str, recurse: bool = True, into: Optional[Dict] = None
+    ) -> None:
+        dirs = self._dirs if into is None else into
+        adir = IndexedDir()
+        try:
+            with os.scandir(self._absolute(rel)) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        adir.dirs.add(entry.name)
+                    elif entry.is_file():
+                        st = entry.stat()
+                        adir.files[entry.name] = (st.st_mtime_ns, st.st_size)
+        except OSError as e:
+            logging.warning(f"RootIndex._scan: cannot scan {rel} in {self._root}: {e}")
+            return
+        old = dirs.get(rel)
+        dirs[rel] = adir
+        for name in adir.dirs:
+            sub = name if rel == "" else rel + os.sep + name
+            if recurse or sub not in dirs:
+                self._scan(sub, recurse, into)
+        # subdirectories that went away take their subtrees with them
+        for name in old.dirs if old is not None else []:
+            if name not in adir.dirs:
+                self._drop(name if rel == "" else rel + os.sep + name)
+
+    def _drop(self, rel: str) -> None:
+        prefix = rel + os.sep
+        for key in [k for k in self._dirs if k == rel or k.startswith(prefix)]:
+            del self._dirs[key]
+        parent = self._dirs.get(self._parent(rel))
+        if parent is not None:
+            name = rel[rel.rfind(os.sep) + 1 :]
+            parent.files.pop(name, None)
+            parent.dirs.discard(name)
+
+    def _link(self, rel: str) -> None:
+        # a rescanned directory may be new to its parent
+        if rel == "":
+            return
+        parent = self._dirs.get(self._parent(rel))
+        if parent is not None:
+            parent.dirs.add(rel[rel.rfind(os.sep) + 1 :])
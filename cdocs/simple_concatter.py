@@ -1,7 +1,8 @@
 import logging
-from typing import List
+from typing import Iterable, Iterator, List
 from cdocs.contextual_docs import DocPath, Doc, JsonDict
 from cdocs.concatter import Concatter
+import cdocs.tracer as tracer
 import json
 
 class SimpleConcatter(Concatter):
@@ -10,14 +11,76 @@ class SimpleConcatter(Concatter):
         self._cdocs = cdocs
 
     def concat(self, paths:List[DocPath]) -> Doc:
-        result = ''
-        for apath in paths:
-            if apath.strip() == '':
-                pass
-            else:
-                doc = self._cdocs.get_doc(apath)
-                result += self.join(result, doc)
-        return Doc(result)
+        with tracer.span("concat", parts=len(paths)):
+            docs = [self._cdocs.get_doc(apath) for apath in paths if apath.strip() != '']
+            return Doc(self.join_all(docs))
+
+    def join_all(self, parts:List[str]) -> str:
+        """
+        joins the parts in one pass, the way join_stream() does: text with
+        a space, and each run of json dicts parsed once and merged into one
+        dict that is dumped once.
+        """
+        joined = []
+        merged = None
+        for part in parts:
+            if part is None or part == '':
+                continue
+            j = self._load(part) if part.lstrip()[0:1] == '{' else None
+            if j is not None:
+                if merged is None:
+                    merged = j
+                else:
+                    merged.update(j)
+                continue
+            if merged is not None:
+                joined.append(json.dumps(merged))
+                merged = None
+            joined.append(part)
+        if merged is not None:
+            joined.append(json.dumps(merged))
+        return " ".join(joined)
+
+    def concat_stream(self, paths:List[DocPath]) -> Iterator[str]:
+        streams = (self._cdocs.get_doc_stream(apath) for apath in paths if apath.strip() != '')
+        return self.join_stream(s for s in streams if s is not None)
+
+    def join_stream(self, streams:Iterable[Iterator[str]]) -> Iterator[str]:
+        """
+        joins the streams the way join() joins strings: text with a space,
+        json dicts merged. a part is held back only if it looks like json,
+        so that it can be merged. everything else goes out as it comes.
+        """
+        merged = None
+        first = True
+        for stream in streams:
+            chunks = iter(stream)
+            head = ''
+            for chunk in chunks:
+                head += chunk
+                if head.strip() != '':
+                    break
+            if head == '':
+                continue
+            rest = chunks
+            if head.lstrip()[0:1] == '{':
+                whole = head + ''.join(chunks)
+                j = self._load(whole)
+                if j is not None:
+                    merged = j if merged is None else {**merged, **j}
+                    continue
+                head, rest = whole, iter(())
+            if merged is not None:
+                yield json.dumps(merged) if first else " " + json.dumps(merged)
+                merged = None
+                first = False
+            if not first:
+                yield " "
+            first = False
+            yield head
+            yield from rest
+        if merged is not None:
+            yield json.dumps(merged) if first else " " + json.dumps(merged)
 
     def join(self, content:str, morecontent:str) -> str:
         if content is None:
@@ -30,17 +93,11 @@ class SimpleConcatter(Concatter):
         if morecontent is None:
             logging.warn("SimpleConcatter.join: morecontent is None. cannot concat.")
             return content
-        j1 = self._load(content)
-        if j1 is None:
-            return content + " " + morecontent
-        j2 = self._load(morecontent)
-        if j2 is None:
-            return content + " " + morecontent
-        newdict = {**j1, **j2}
-        return json.dumps(newdict)
+        return self.join_all([content, morecontent])
 
     def _load(self, string) -> JsonDict:
         try:
-            return JsonDict(json.loads(string))
-        except:
+            j = json.loads(string)
+        except ValueError:
             return None
+        return JsonDict(j) if isinstance(j, dict) else None
@@ -10,7 +10,8 @@ class SimpleConfig(Config):
         super().__init__()
         if path is None:
             logging.debug(
-                f"cdocs Config.__init__ without config path. using default: {os.getcwd()}/config/config.ini"
+                "cdocs Config.__init__ without config path. using default: %s/config/config.ini",
+                os.getcwd(),
             )
             self._path = "config/config.ini"
         else:
@@ -25,6 +26,9 @@ class SimpleConfig(Config):
     def get_config_path(self):
         return self._path
 
+    def get_sections(self) -> Optional[List[str]]:
+        return self._parser.sections()
+
     # deprecated: just use get
     #    def get_with_default(self, group, name, default:Optional[str]=None) -> str:
     #        val = self.get(group, name)
@@ -33,16 +37,20 @@ class SimpleConfig(Config):
     #        return val
 
     def get(self, group: str, name: str, default: Optional[str] = None) -> str:
-        logging.info(f"SimpleConfig.get: {group}, {name}, {default}")
+        logging.info("SimpleConfig.get: %s, %s, %s", group, name, default)
         try:
             val = self._parser.get(group, name)
-            logging.info(f"SimpleConfig.get: val: {val}")
+            logging.info("SimpleConfig.get: val: %s", val)
             if val is None:
                 return default
             return val
         except Exception as e:
             logging.info(
-                f"Cdocs Config.get: unable to get [{group}][{name}]: {e}. returning default: {default}."
+                "Cdocs Config.get: unable to get [%s][%s]: %s. returning default: %s.",
+                group,
+                name,
+                e,
+                default,
             )
             return default
 
@@ -61,13 +69,18 @@ class SimpleConfig(Config):
 
     def get_matching_key_for_value(self, group: str, value: str) -> Optional[str]:
         logging.info(
-            f"SimpleConfig.get_matching_key_for_value: group: {group}, value: {value}"
+            "SimpleConfig.get_matching_key_for_value: group: %s, value: %s",
+            group,
+            value,
         )
         items = self.get_items(group)
-        logging.info(f"SimpleConfit.get_matching_key_for_value: items: {items}")
+        logging.info("SimpleConfit.get_matching_key_for_value: items: %s", items)
         for item in items:
             logging.info(
-                f"SimpleConfit.get_matching_key_for_value: {item[1]} == {value}: {item[1] == value}"
+                "SimpleConfit.get_matching_key_for_value: %s == %s: %s",
+                item[1],
+                value,
+                item[1] == value,
             )
             if item[1] == value:
                 return item[0]
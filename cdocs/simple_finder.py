@@ -1,49 +1,100 @@
 from pathlib import Path
 import os
 import json
+import time
 import logging
 from cdocs.contextual_docs import DocPath, FilePath, JsonDict
 from cdocs.finder import Finder
-from typing import Optional
+from cdocs.index import normalize, is_under
+import cdocs.render_cache as dependencies
+import cdocs.tracer as tracer
+from typing import Optional, List, Tuple
 
 class FinderException(Exception):
     pass
 
+
+# a stamp is the (mtime, size) of a file, or None if there is no file
+Stamp = Optional[Tuple[int, int]]
+
 class SimpleFinder(Finder):
 
     def __init__(self, cdocs): #can't type hint cdocs
         self._cdocs = cdocs
         self._docroot = cdocs.get_doc_root()
+        # seconds a cached chain is trusted before its files are stat'd again
+        self._check_interval = float(cdocs.config.get("cache", "check_interval", "0"))
+        # filepath -> (stamp, parsed json). missing files are cached as empty dicts
+        self._files = {}
+        # (path, filename, recurse) -> (filepaths, stamps, merged tokens, time checked)
+        self._chains = {}
 
     def find_tokens(self, path:DocPath=None, filename:str="tokens.json", recurse:Optional[bool]=True) -> JsonDict:
         """ first checks "public", then other roots, last "internal". prefered in that order """
         tokens = JsonDict(dict())
         if path is None:
             return tokens
-        pointer = os.path.join(self._docroot, path)
-        tokens = self._find_tokens( self._docroot, pointer, tokens, filename, recurse)
-        return tokens
+        with tracer.span("finder", root=self._docroot, docpath=path, filename=filename):
+            return self._find_tokens(path, filename, recurse)
 
-    def _find_tokens( self, root:FilePath, pointer:FilePath, tokens:JsonDict, filename:str, recurse:Optional[bool]=True ) -> JsonDict:
-        if pointer == "" or pointer is None:
-            raise FinderException(f"_find_tokens got bad pointer: {pointer} in {root}")
-        if pointer == root:
-            return tokens
-        tfile = self._join(pointer, filename)
-        tdict = self._read_json(tfile)
-        tokens = {**tdict, **tokens}
-        if recurse:
-            logging.info(f"simple_finder._find_tokens: recursing on pointer: {pointer}")
+    def _find_tokens(self, path:DocPath, filename:str, recurse:Optional[bool]) -> JsonDict:
+        key = (path, filename, recurse)
+        now = time.monotonic()
+        chain = self._chains.get(key)
+        if chain is not None:
+            files, stamps, tokens, checked = chain
+            if now - checked < self._check_interval:
+                self._record(files, stamps)
+                return JsonDict(dict(tokens))
+            if [self._stamp(f) for f in files] == stamps:
+                self._chains[key] = (files, stamps, tokens, now)
+                self._record(files, stamps)
+                return JsonDict(dict(tokens))
+        else:
+            pointer = os.path.join(self._docroot, path)
+            files = self.find_files(self._docroot, pointer, filename, recurse)
+        stamps = [self._stamp(f) for f in files]
+        tokens = {}
+        # files are ordered from the docpath up. values found lowest win.
+        for f, stamp in zip(reversed(files), reversed(stamps)):
+            tokens.update(self._read_json(f, stamp))
+        self._chains[key] = (files, stamps, tokens, now)
+        self._record(files, stamps)
+        return JsonDict(dict(tokens))
+
+    def _record(self, files:List[FilePath], stamps:List[Stamp]) -> None:
+        if dependencies.tracking():
+            for f, stamp in zip(files, stamps):
+                dependencies.record(f, stamp)
+
+    def find_files(self, root:FilePath, pointer:FilePath, filename:str, recurse:Optional[bool]=True) -> List[FilePath]:
+        """ returns the files that may hold tokens for pointer, from pointer up to root """
+        files = []
+        while True:
+            if pointer == "" or pointer is None:
+                raise FinderException(f"_find_tokens got bad pointer: {pointer} in {root}")
+            if pointer == root:
+                return files
+            files.append(self._join(pointer, filename))
+            if not recurse:
+                return files
             end = int( pointer.rfind("/") )
-            logging.info(f"simple_finder._find_tokens: end: {end}")
             pointer = pointer[0:end]
             if pointer == root:
                 pointer = pointer + "/"
                 recurse = False
-            logging.info(f"simple_finder._find_tokens: now pointer: {pointer}")
-            return self._find_tokens(root, pointer, tokens, filename, recurse)
-        else:
-            return tokens
+
+    def clear(self) -> None:
+        self._files = {}
+        self._chains = {}
+
+    def invalidate(self, filepaths:List[FilePath]) -> None:
+        paths = normalize(filepaths)
+        for f in [f for f in list(self._files) if is_under(f, paths)]:
+            self._files.pop(f, None)
+        for key, chain in list(self._chains.items()):
+            if any(is_under(f, paths) for f in chain[0]):
+                self._chains.pop(key, None)
 
     def _join(self, pointer:FilePath, filename:str) -> FilePath:
         dot = pointer.find(".")
@@ -52,16 +103,27 @@ class SimpleFinder(Finder):
         else:
             ext = pointer[pointer.rindex('.')+1:]
             p = pointer[0:pointer.rindex('/')]
-            logging.info(f"SimpleFinder._join: p: {p}")
+            logging.info("SimpleFinder._join: p: %s", p)
             j = os.path.join(p, filename)
-            logging.info(f"SimpleFinder._join: j: {j}")
+            logging.info("SimpleFinder._join: j: %s", j)
             return j
 
-    def _read_json(self, path) -> JsonDict:
-        try:
-            with open(path) as f:
-                return JsonDict(json.load(f))
-        except FileNotFoundError as e:
-            logging.debug(f"DictFinder._read_json: no such file {path}. returning empty dict, as expected.")
-            return JsonDict(dict())
+    def _stamp(self, path:FilePath) -> Stamp:
+        return self._cdocs.index.stat(path)
 
+    def _read_json(self, path, stamp:Stamp=None) -> JsonDict:
+        cached = self._files.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        tokens = JsonDict(dict())
+        if stamp is None:
+            logging.debug("DictFinder._read_json: no such file %s. returning empty dict, as expected.", path)
+        else:
+            try:
+                with open(path) as f:
+                    tokens = JsonDict(json.load(f))
+            except FileNotFoundError:
+                logging.debug("DictFinder._read_json: no such file %s. returning empty dict, as expected.", path)
+                stamp = None
+        self._files[path] = (stamp, tokens)
+        return tokens
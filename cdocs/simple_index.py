@@ -0,0 +1,35 @@
+import os
+import stat
+from typing import List, Optional
+from cdocs.contextual_docs import FilePath
+from cdocs.index import Index, Stamp
+
+
+class SimpleIndex(Index):
+    """
+    SimpleIndex holds nothing. it asks the filesystem every time.
+    """
+
+    def exists(self, filepath: FilePath) -> bool:
+        return os.path.exists(filepath)
+
+    def isfile(self, filepath: FilePath) -> bool:
+        return os.path.isfile(filepath)
+
+    def isdir(self, filepath: FilePath) -> bool:
+        return os.path.isdir(filepath)
+
+    def listdir(self, filepath: FilePath) -> List[str]:
+        return os.listdir(filepath)
+
+    def stat(self, filepath: FilePath) -> Optional[Stamp]:
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def refresh(self, filepath: Optional[FilePath] = None) -> None:
+        pass
@@ -10,19 +10,20 @@ class SimpleLister(Lister):
         self._cdocs = cdocs
 
     def list_next_layer(self, path: DocPath) -> List[str]:
-        logging.info(f"SimpleLister.list_next_layer: path: {path}")
+        logging.info("SimpleLister.list_next_layer: path: %s", path)
         apath = path
         if apath[0:1] == "/":
             apath = apath[1:]
-        logging.info(f"SimpleLister.list_next_layer: apath: {apath}")
+        logging.info("SimpleLister.list_next_layer: apath: %s", apath)
         root_path = self._cdocs.get_doc_root()
-        logging.info(f"SimpleLister.list_next_layer: root: {root_path}")
+        logging.info("SimpleLister.list_next_layer: root: %s", root_path)
         the_path = os.path.join(root_path, apath)
-        logging.info(f"SimpleLister.list_next_layer: the_path: {the_path}")
-        if os.path.exists(the_path):
+        logging.info("SimpleLister.list_next_layer: the_path: %s", the_path)
+        index = self._cdocs.index
+        if index.exists(the_path):
             logging.info("SimpleLister.list_next_layer: the path exists")
-            files = os.listdir(the_path)
-            logging.info(f"SimpleLister.list_next_layer: files: {files}")
+            files = index.listdir(the_path)
+            logging.info("SimpleLister.list_next_layer: files: %s", files)
             files = [
                 f
                 for f in files
@@ -37,12 +38,12 @@ class SimpleLister(Lister):
                 else:
                     rf.append(f)
 
-            logging.info(f"SimpleLister.list_next_layer: files filtered: {rf}")
+            logging.info("SimpleLister.list_next_layer: files filtered: %s", rf)
             return rf
         return []
 
     def list_docs(self, path: DocPath) -> List[Doc]:
-        logging.info(f"SimpleLister.list_docs: path: {path}")
+        logging.info("SimpleLister.list_docs: path: %s", path)
         #
         # a docpath points to a directory which may have a sibling file named
         # the same as the directory, but with a file extension.
@@ -86,54 +87,57 @@ class SimpleLister(Lister):
         apath = path
         if apath[0:1] == "/":
             apath = apath[1:]
-        logging.info(f"SimpleLister.list_docs: apath: {apath}")
+        logging.info("SimpleLister.list_docs: apath: %s", apath)
         root_path = self._cdocs.get_doc_root()
-        logging.info(f"SimpleLister.list_docs: root: {root_path}")
+        logging.info("SimpleLister.list_docs: root: %s", root_path)
         the_path = os.path.join(root_path, apath)
-        logging.info(f"SimpleLister.list_docs: the_path: {the_path}")
+        logging.info("SimpleLister.list_docs: the_path: %s", the_path)
         # check if the_path refers to a file path or to a file minus its extension
         if self._name_exists(the_path):
             logging.info("SimpleLister.list_docs: path exists")
             up = the_path[0 : the_path.rindex("/")]
-            logging.info(f"SimpleLister.list_docs: up: {up}")
-            files = os.listdir(up)
-            logging.info(f"SimpleLister.list_docs: files: {files}")
+            logging.info("SimpleLister.list_docs: up: %s", up)
+            index = self._cdocs.index
+            files = index.listdir(up)
+            logging.info("SimpleLister.list_docs: files: %s", files)
             files = [
                 f
                 for f in files
-                if f[0:1] != "." and os.path.isfile(os.path.join(up, f))
+                if f[0:1] != "." and index.isfile(os.path.join(up, f))
             ]
-            logging.info(f"SimpleLister.list_docs: files filtered: {files}")
+            logging.info("SimpleLister.list_docs: files filtered: %s", files)
             return files
         else:
             logging.info(
-                f"SimpleLister.list_docs: directory at {the_path} doesn't exist. no files found. returning []."
+                "SimpleLister.list_docs: directory at %s doesn't exist. no files found. returning [].",
+                the_path,
             )
             return []
 
     def _name_exists(self, the_path: str) -> bool:
-        logging.info(f"SimpleLister._name_exists: {the_path}")
-        if os.path.exists(the_path):
+        logging.info("SimpleLister._name_exists: %s", the_path)
+        index = self._cdocs.index
+        if index.exists(the_path):
             logging.info("SimpleLister._name_exists: the path exists")
             return True
         else:
             logging.info("SimpleLister._name_exists: the path does not exist")
         up = the_path[0 : the_path.rindex("/")]
-        if not os.path.exists(up):
-            logging.info(f"SimpleLister._name_exists: {the_path} does not exist")
+        if not index.exists(up):
+            logging.info("SimpleLister._name_exists: %s does not exist", the_path)
             return False
         else:
-            logging.info(f"SimpleLister._name_exists: up: {up} exists")
+            logging.info("SimpleLister._name_exists: up: %s exists", up)
         name = the_path[the_path.rindex("/") + 1 :]
-        logging.info(f"SimpleLister._name_exists: the name is {name}")
-        files = os.listdir(up)
+        logging.info("SimpleLister._name_exists: the name is %s", name)
+        files = index.listdir(up)
         for f in files:
-            logging.info(f"SimpleLister._name_exists: checking {f} for {name}")
+            logging.info("SimpleLister._name_exists: checking %s for %s", f, name)
             if not f.startswith(name):
-                logging.info(f"SimpleLister._name_exists: {f} not start with {name}")
+                logging.info("SimpleLister._name_exists: %s not start with %s", f, name)
                 continue
             pre = f[: len(name) + 1]
-            logging.info(f"SimpleLister._name_exists: pre: {pre}")
+            logging.info("SimpleLister._name_exists: pre: %s", pre)
             if pre[len(pre) - 1] == ".":
                 return True
         return False
@@ -3,38 +3,52 @@ import logging
 from cdocs.contextual_docs import DocPath, FilePath
 from cdocs.simple_config import SimpleConfig
 from cdocs.pather import Pather
+import cdocs.render_cache as dependencies
+import cdocs.render_scope as render_scope
+import cdocs.tracer as tracer
 from typing import Optional
 
 
 class SimplePather(Pather):
     def __init__(self, metadata, cdocs):
         logging.info(
-            f"SimplePather.__init__: starting with metadata: {metadata} and cdocs: {cdocs}"
+            "SimplePather.__init__: starting with metadata: %s and cdocs: %s",
+            metadata,
+            cdocs,
         )
         cfg = metadata.config
-        logging.info(f"SimplePather.__init__: cfg: {cfg}")
+        logging.info("SimplePather.__init__: cfg: %s", cfg)
         self._hashmark: str = cfg.get("filenames", "hashmark", "#")
-        logging.info(f"SimplePather.__init__: hashmark: {self._hashmark}")
+        logging.info("SimplePather.__init__: hashmark: %s", self._hashmark)
+        self._cdocs = cdocs
         self._docs_path: str = cdocs.get_doc_root()
         self._rootname = cfg.get_matching_key_for_value("docs", cdocs.get_doc_root())
         logging.info(
-            f"SimplePather.__init__: docspath: {cdocs.get_doc_root()}, rootname: {self._rootname}"
+            "SimplePather.__init__: docspath: %s, rootname: %s",
+            cdocs.get_doc_root(),
+            self._rootname,
         )
-        ext = cfg.get("defaults", "ext", "xml")
-        ext = cfg.get("formats", self._rootname, ext)
-        logging.info(f"SinplePather.__init__: ext: {ext}")
-        if ext.find(",") > -1:
-            self._exts = ext.split(",")
-        else:
-            self._exts = [ext]
-        logging.info(f"SimplePather.__init__: exts: {self._exts}")
+        self._exts = cfg.get_exts(self._rootname)
+        logging.info("SimplePather.__init__: exts: %s", self._exts)
 
     def get_full_file_path(self, path: DocPath) -> FilePath:
         return self.get_full_file_path_for_root(path, self._docs_path)
 
     def get_full_file_path_for_root(self, path: DocPath, root: FilePath) -> FilePath:
+        scope = render_scope.current()
+        if scope is None:
+            return self._find_file_path(path, root)
+        return scope.memo(("path", root, path), lambda: self._find_file_path(path, root))
+
+    def _find_file_path(self, path: DocPath, root: FilePath) -> FilePath:
+        with tracer.span("pather", root=root, docpath=path) as span:
+            filepath = self._get_full_file_path_for_root(path, root)
+            span.set("filepath", filepath)
+            return filepath
+
+    def _get_full_file_path_for_root(self, path: DocPath, root: FilePath) -> FilePath:
         logging.info(
-            f"SimplePather.get_full_file_path_for_root: path: {path}, root: {root}"
+            "SimplePather.get_full_file_path_for_root: path: %s, root: %s", path, root
         )
         path = path.strip("/\\")
         if path == "":
@@ -43,11 +57,14 @@ class SimplePather(Pather):
             )
             return root
         logging.info(
-            f"SimplePather.get_full_file_path_for_root: getting filename for {path}"
+            "SimplePather.get_full_file_path_for_root: getting filename for %s", path
         )
         filename = self.get_filename(path)
         logging.info(
-            f"SimplePather.get_full_file_path_for_root: path: {path}, filename: {filename}, root: {root}"
+            "SimplePather.get_full_file_path_for_root: path: %s, filename: %s, root: %s",
+            path,
+            filename,
+            root,
         )
         if filename is None:
             pass
@@ -67,10 +84,12 @@ class SimplePather(Pather):
         path = os.path.join(root, path)
         apath = path
         logging.info(
-            f"SimplePather.get_full_file_path_for_root: joined root: {root} with path to get: {apath}"
+            "SimplePather.get_full_file_path_for_root: joined root: %s with path to get: %s",
+            root,
+            apath,
         )
         i = path.find(".")
-        logging.info(f"SimplePather.get_full_file_path_for_root: index of '.': {i}")
+        logging.info("SimplePather.get_full_file_path_for_root: index of '.': %s", i)
         if filename is None and i <= len(root):
             logging.info(
                 "SimplePather.get_full_file_path_for_root: filename is None and no '.'"
@@ -83,13 +102,18 @@ class SimplePather(Pather):
             pass
         else:
             logging.info(
-                f"SimplePather.get_full_file_path_for_root: apath: {apath}, last char: {apath[-1:]}, filename: {filename}"
+                "SimplePather.get_full_file_path_for_root: apath: %s, last char: %s, filename: %s",
+                apath,
+                apath[-1:],
+                filename,
             )
             apath = apath + ("" if apath[-1:] == "/" else os.path.sep) + filename
             apath = self._find_path(apath)
         if apath is None:
             logging.info(
-                f"SimplePather.get_full_file_path_for_root: apath is None! from: {self._rootname}->{apath}"
+                "SimplePather.get_full_file_path_for_root: apath is None! from: %s->%s",
+                self._rootname,
+                apath,
             )
         return FilePath(apath)
 
@@ -98,26 +122,28 @@ class SimplePather(Pather):
     # 2. see notes below
     #
     def _find_path(self, path) -> Optional[FilePath]:
-        logging.info(f"SimplePather._find_path: starting path: {path}")
+        logging.info("SimplePather._find_path: starting path: %s", path)
         logging.info(
-            f"SimplePather._find_path: looking for path using exts in {self._exts}"
+            "SimplePather._find_path: looking for path using exts in %s", self._exts
         )
         for ext in self._exts:
             apath = None
             anext = path[-1 * len(ext) :]
             logging.info(
-                f"SimplePather._find_path: checking if path's anext: {anext} matches ext: {ext}"
+                "SimplePather._find_path: checking if path's anext: %s matches ext: %s",
+                anext,
+                ext,
             )
             if anext == ext:
                 apath = path
             else:
                 apath = path + "." + ext
             logging.info(
-                f"SimplePather._find_path: checking for a simple file: apath: {apath}"
+                "SimplePather._find_path: checking for a simple file: apath: %s", apath
             )
-            if os.path.exists(apath):
+            if self._exists(apath):
                 logging.info(
-                    f"SimplePather._find_path: apath exists. returning: {apath}"
+                    "SimplePather._find_path: apath exists. returning: %s", apath
                 )
                 return apath
         if len(self._exts) == 1:
@@ -130,22 +156,25 @@ class SimplePather(Pather):
             # if any of the paths exists is knowable. shouldn't we check?
             #
             logging.info(
-                f"SimplePather._find_path: on file. there are {len(self._exts)} exts, so we guess the first one, but check for actual files -- keep in mind, if the file exists or not is not a pather's problem."
+                "SimplePather._find_path: on file. there are %s exts, so we guess the first one, but check for actual files -- keep in mind, if the file exists or not is not a pather's problem.",
+                len(self._exts),
             )
             presumedpath = path + "." + self._exts[0]
             logging.info(
-                f"SimplePather._find_path: presumed path is {presumedpath}. now checking alternatives."
+                "SimplePather._find_path: presumed path is %s. now checking alternatives.",
+                presumedpath,
             )
             for _ in self._exts:
                 apath = path + "." + _
-                logging.info(f"SimplePather._find_path: checking if {apath} exists")
-                if os.path.exists(apath):
+                logging.info("SimplePather._find_path: checking if %s exists", apath)
+                if self._exists(apath):
                     logging.info(
-                        f"SimplePather._find_path: {apath} exists! returning it."
+                        "SimplePather._find_path: %s exists! returning it.", apath
                     )
                     return apath
             logging.info(
-                f"SimplePather._find_path: no path exists. returning presumed path: {presumedpath}"
+                "SimplePather._find_path: no path exists. returning presumed path: %s",
+                presumedpath,
             )
             return presumedpath
         else:
@@ -154,13 +183,22 @@ class SimplePather(Pather):
 
     def get_filename(self, path: str) -> Optional[str]:
         logging.info(
-            f"SimplePather.get_filename: path: {path}. if a hashmark is found it marks a filename. if no hashmark we return none."
+            "SimplePather.get_filename: path: %s. if a hashmark is found it marks a filename. if no hashmark we return none.",
+            path,
         )
         filename = None
         hashmark = path.find(self._hashmark)
         if hashmark > -1:
             filename = path[hashmark + 1 :]
         logging.info(
-            f"SimplePather.get_filename: returning: {filename if filename is not None else 'intentionally returning no filename'}"
+            "SimplePather.get_filename: returning: %s",
+            filename if filename is not None else 'intentionally returning no filename',
         )
         return filename
+
+    def _exists(self, apath: FilePath) -> bool:
+        index = self._cdocs.index
+        if dependencies.tracking():
+            # a file appearing at a path we looked for changes the result
+            dependencies.record(apath, index.stat(apath))
+        return index.exists(apath)
@@ -27,6 +27,6 @@ class SimpleReader(Reader):
             logging.warning(f"SimpleReader.is_available: filepath is None")
             #traceback.print_stack(limit=7)
             return False
-        return os.path.isfile(filepath)
+        return self._cdocs.index.isfile(filepath)
 
 
@@ -1,17 +1,87 @@
+import re
 import logging
-from typing import Optional, Dict
-from jinja2 import Template
+from typing import Optional, Dict, FrozenSet, Iterator, Tuple
+import os
+from jinja2 import Environment, FileSystemBytecodeCache, Template, meta, nodes
 from cdocs.contextual_docs import DocPath, FilePath, JsonDict
 from cdocs.simple_config import SimpleConfig
 from cdocs.transformer import Transformer
 from cdocs.contextual_docs import DocPath
+from cdocs.template_cache import TemplateCache
+from cdocs.cdocs_loader import CdocsLoader
+import cdocs.tracer as tracer
 import inflect
 
+# more filetypes could go here, but for now this is good.
+# todo: make this list a config option?
+TEMPLATE_TYPES = ['html','concat','cdocs','xml','md','txt','xhtml','yaml','json','js']
+# content without any of these is not a template
+TEMPLATE_MARKS = ['{{','{%','{#']
+# a template using one of these may use any name, so it gets every token and label
+OPEN_NODES = (nodes.Include, nodes.Import, nodes.FromImport, nodes.Extends)
+LABEL_PREFIX = "label__"
+NEWLINES = re.compile(r"\r\n|\r|\n")
+
+def is_template(content:str) -> bool:
+    return any(mark in content for mark in TEMPLATE_MARKS)
+
+def as_rendered(content:str) -> str:
+    """ plain content as jinja would render it: newlines as \\n, less one trailing newline """
+    if "\r" in content:
+        content = NEWLINES.sub("\n", content)
+    return content[:-1] if content.endswith("\n") else content
+
 class SimpleTransformer(Transformer):
 
     def __init__(self, cdocs): # can't type hint cdocs because circular
         self._cdocs = cdocs
         self._engine = inflect.engine()
+        size = int(cdocs.config.get("cache", "templates", "256"))
+        self._cache = TemplateCache(size)
+        self._environment = None
+
+    @property
+    def cache(self) -> TemplateCache:
+        return self._cache
+
+    @property
+    def environment(self) -> Environment:
+        # created on first use so that a context set after
+        # the cdocs is constructed still gets its globals
+        if self._environment is None:
+            self._environment = self._create_environment()
+        return self._environment
+
+    def _create_environment(self) -> Environment:
+        size = int(self._cdocs.config.get("cache", "templates", "256"))
+        env = Environment(
+            loader=CdocsLoader(self._cdocs),
+            cache_size=size,
+            auto_reload=True,
+            bytecode_cache=self._create_bytecode_cache(),
+        )
+        env.globals["get_doc"] = self._cdocs.get_doc
+        env.globals["get_compose_doc"] = self._cdocs.get_compose_doc
+        env.globals["get_concat_doc"] = self._cdocs.get_concat_doc
+        env.globals["plural"] = self._plural
+        env.globals["cap"] = self._cap
+        env.globals["article"] = self._article
+        env.globals["docroot"] = self._cdocs.get_doc_root()
+        context = self._cdocs.context
+        if context is not None:
+            env.globals["get_concat_doc_from_roots"] = context.get_concat_doc_from_roots
+            env.globals["get_compose_doc_from_roots"] = context.get_compose_doc_from_roots
+            env.globals["get_doc_from_roots"] = context.get_doc_from_roots
+            env.globals["get_labels_from_roots"] = context.get_labels_from_roots
+            logging.info("SimpleTransformer._create_environment: added multi root methods on context to globals")
+        return env
+
+    def _create_bytecode_cache(self) -> Optional[FileSystemBytecodeCache]:
+        directory = self._cdocs.config.get("cache", "bytecode", None)
+        if directory is None or directory.strip() == "":
+            return None
+        os.makedirs(directory, exist_ok=True)
+        return FileSystemBytecodeCache(directory)
 
     def _plural(self, word):
         return self._engine.plural(word)
@@ -23,38 +93,121 @@ class SimpleTransformer(Transformer):
         return self._engine.a(word)
 
     def transform(self, content:str, path:DocPath=None, \
-                   tokens:Optional[Dict[str,str]]=None, transform_labels=True) -> str:
+                   tokens:Optional[Dict[str,str]]=None, transform_labels=True,
+                   filepath:Optional[FilePath]=None) -> str:
         if content is None:
             logging.info("SimpleTransformer.transform: cannot transform None. returning ''")
             return None
         if path is None:
+            from cdocs.cdocs import BadDocPath  # cdocs imports this module
             raise BadDocPath("you must provide the DocPath")
         filetype = self._cdocs.filer.get_filetype(path)
-        # more filetypes could go here, but for now this is good.
-        # todo: make this list a config option?
-        if filetype in ['html','concat','cdocs','xml','md','txt','xhtml','yaml','json','js']:
-            if tokens is None:
-                tokens:JsonDict = self._cdocs.get_tokens(path)
-            if path is not None and transform_labels:
-                tokens = self._cdocs._add_labels_to_tokens(path, tokens)
-            tokens["get_doc"] = self._cdocs.get_doc
-            tokens["get_compose_doc"] = self._cdocs.get_compose_doc
-            tokens["get_concat_doc"] = self._cdocs.get_concat_doc
-            tokens["plural"] = self._plural
-            tokens["cap"] = self._cap
-            tokens["article"] = self._article
-            tokens["docroot"] = self._cdocs.get_doc_root()
-            if self._cdocs.context is not None:
-                tokens["get_concat_doc_from_roots"] = self._cdocs.context.get_concat_doc_from_roots
-                tokens["get_compose_doc_from_roots"] = self._cdocs.context.get_compose_doc_from_roots
-                tokens["get_doc_from_roots"] = self._cdocs.context.get_doc_from_roots
-                tokens["get_labels_from_roots"] = self._cdocs.context.get_labels_from_roots
-                logging.info("SimpleTransformer.transform: added multi root methods on context to template tokens")
+        if filetype in TEMPLATE_TYPES and is_template(content):
             try:
-                template = Template(content)
-                content = template.render(tokens)
+                with tracer.span("transform", docpath=path, filepath=filepath) as span:
+                    template, names = self._get_compiled(content, filepath)
+                    tokens = self._get_tokens(path, tokens, transform_labels, names)
+                    content = template.render(tokens)
+                    span.set("bytes", len(content))
             except Exception as e:
-                logging.info(f"SimpleTransformer.transform: couldn't transform content: {e}")
+                logging.info("SimpleTransformer.transform: couldn't transform content: %s", e)
+        elif filetype in TEMPLATE_TYPES:
+            content = as_rendered(content)
         return content
 
+    def _get_tokens(self, path:DocPath, tokens:Optional[Dict[str,str]], \
+                     transform_labels:bool, names:Optional[FrozenSet[str]]) -> Dict:
+        """
+        finds the tokens and labels a template uses. names are the names
+        the template uses, or None if it may use any. labels are only found
+        for templates that use a label. a token may have a label's name and
+        win over it, so tokens are found for any template that uses a name.
+        """
+        uses_tokens = names is None or len(names) > 0
+        uses_labels = names is None or any(n.startswith(LABEL_PREFIX) for n in names)
+        if tokens is None:
+            # tokens found here have always had the labels
+            transform_labels = True
+            tokens = self._cdocs.get_tokens(path, addlabels=False) if uses_tokens else {}
+        if transform_labels and uses_labels:
+            tokens = self._cdocs._add_labels_to_tokens(path, tokens)
+        return tokens
+
+    def transform_stream(self, content:str, path:DocPath=None, \
+                   tokens:Optional[Dict[str,str]]=None, transform_labels=True,
+                   filepath:Optional[FilePath]=None) -> Iterator[str]:
+        """
+        yields the content as jinja renders it. tokens are found before the
+        first chunk. a template that fails to compile is yielded as it is,
+        like transform() does, but once chunks have gone out a failure can
+        only end the stream.
+        """
+        if content is None:
+            return iter(())
+        if path is None:
+            from cdocs.cdocs import BadDocPath  # cdocs imports this module
+            raise BadDocPath("you must provide the DocPath")
+        filetype = self._cdocs.filer.get_filetype(path)
+        if filetype not in TEMPLATE_TYPES:
+            return iter([content])
+        if not is_template(content):
+            return iter([as_rendered(content)])
+        try:
+            template, names = self._get_compiled(content, filepath)
+        except Exception as e:
+            logging.info("SimpleTransformer.transform_stream: couldn't compile content: %s", e)
+            return iter([content])
+        tokens = self._get_tokens(path, tokens, transform_labels, names)
+        return self._generate(template, tokens, path)
+
+    def _generate(self, template:Template, tokens:Dict, path:DocPath) -> Iterator[str]:
+        try:
+            yield from template.generate(tokens)
+        except Exception as e:
+            logging.error("SimpleTransformer._generate: stream of %s ended early: %s", path, e)
+
+    def _get_template(self, content:str, filepath:Optional[FilePath]=None) -> Template:
+        return self._get_compiled(content, filepath)[0]
+
+    def _get_compiled(self, content:str, filepath:Optional[FilePath]=None) \
+                        -> Tuple[Template, Optional[FrozenSet[str]]]:
+        """ returns the template and the names it uses, from the cache if possible """
+        stamp = None if filepath is None else self._cdocs.index.stat(filepath)
+        key = self._cache.key_for(content, filepath, stamp)
+        compiled = self._cache.get(key)
+        if compiled is None:
+            compiled = (self._compile(content, filepath), self._find_names(content))
+            self._cache.put(key, compiled)
+        return compiled
+
+    def _find_names(self, content:str) -> Optional[FrozenSet[str]]:
+        """ the undeclared names a template uses, less globals, or None if it may use any """
+        try:
+            ast = self.environment.parse(content)
+        except Exception as e:
+            logging.info("SimpleTransformer._find_names: cannot parse content: %s", e)
+            return None
+        if next(ast.find_all(OPEN_NODES), None) is not None:
+            return None
+        names = meta.find_undeclared_variables(ast)
+        return frozenset(n for n in names if n not in self.environment.globals)
+
+    def compile(self, content:str, filepath:Optional[FilePath]=None) -> Template:
+        """ compiles content ahead of use, warming the cache and any bytecode cache """
+        return self._get_template(content, filepath)
+
+    def _compile(self, content:str, filepath:Optional[FilePath]=None) -> Template:
+        env = self.environment
+        bcc = env.bytecode_cache
+        if bcc is None or filepath is None:
+            return env.from_string(content)
+        # the bucket's checksum is a hash of the source, so bytecode
+        # compiled from a different version of the file is never used
+        bucket = bcc.get_bucket(env, filepath, filepath, content)
+        code = bucket.code
+        if code is None:
+            code = env.compile(content, filepath, filepath)
+            bucket.code = code
+            bcc.set_bucket(bucket)
+        return env.template_class.from_code(env, code, env.make_globals(None))
 
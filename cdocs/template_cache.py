@@ -0,0 +1,30 @@
+import os
+import hashlib
+from typing import Hashable, Optional, Tuple
+from cdocs.contextual_docs import FilePath
+from cdocs.lru_cache import LruCache
+
+
+class TemplateCache(LruCache):
+    """
+    TemplateCache is a bounded LRU of compiled templates. entries are
+    keyed by the physical file a template came from plus the file's
+    mtime and size, or by a hash of the content when there is no file,
+    as is the case for label values.
+    """
+
+    def key_for(
+        self,
+        content: str,
+        filepath: Optional[FilePath] = None,
+        stamp: Optional[Tuple[int, int]] = None,
+    ) -> Hashable:
+        if filepath is not None and stamp is None:
+            try:
+                stat = os.stat(filepath)
+                stamp = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                pass
+        if filepath is not None and stamp is not None:
+            return (filepath, stamp[0], stamp[1])
+        return ("#", hashlib.sha1(content.encode("utf-8")).hexdigest())
@@ -0,0 +1,191 @@
+import os
+import json
+import time
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+
+class Span(object):
+    """
+    one timed stage: a pather lookup, a read, a finder walk, a transform
+    or a concat. attributes are things like root, docpath, filepath and
+    bytes. spans are closed by the tracer that opened them.
+    """
+
+    __slots__ = ("name", "attrs", "start", "end", "thread", "_tracer")
+
+    def __init__(self, tracer: "Tracer", name: str, attrs: Dict[str, Any]):
+        self._tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.thread = threading.get_ident()
+        self.start = time.perf_counter_ns()
+        self.end: Optional[int] = None
+
+    @property
+    def duration(self) -> int:
+        """nanoseconds"""
+        return (self.end or time.perf_counter_ns()) - self.start
+
+    def set(self, key: str, value: Any) -> None:
+        self.attrs[key] = value
+
+    def __enter__(self) -> "Span":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self._tracer.collect(self)
+
+
+class _NoSpan(object):
+    """what span() returns when tracing is off. it does nothing."""
+
+    __slots__ = ()
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+NO_SPAN = _NoSpan()
+
+
+class Tracer(ABC):
+    """
+    Tracer collects spans. subclasses decide what to do with each span
+    when it closes: keep it, log it, or hand it on to another collector.
+    """
+
+    def span(self, name: str, **attrs) -> Span:
+        return Span(self, name, attrs)
+
+    @abstractmethod
+    def collect(self, span: Span) -> None:
+        pass
+
+
+class RecordingTracer(Tracer):
+    """
+    RecordingTracer keeps the most recent spans in memory and can write
+    them as Chrome trace JSON, for chrome://tracing, Perfetto or
+    speedscope flamegraphs.
+    """
+
+    def __init__(self, size: int = 100000):
+        self._spans: deque = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    @property
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+    def collect(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """count, total and max milliseconds by span name"""
+        stats: Dict[str, Dict[str, float]] = {}
+        for span in self.spans:
+            stat = stats.setdefault(span.name, {"count": 0, "total": 0.0, "max": 0.0})
+            ms = span.duration / 1e6
+            stat["count"] += 1
+            stat["total"] += ms
+            stat["max"] = max(stat["max"], ms)
+        return stats
+
+    def to_chrome(self) -> Dict[str, Any]:
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name,
+                "cat": "cdocs",
+                "ph": "X",
+                "ts": span.start / 1000,
+                "dur": span.duration / 1000,
+                "pid": pid,
+                "tid": span.thread,
+                "args": {k: str(v) for k, v in span.attrs.items()},
+            }
+            for span in self.spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.to_chrome(), f)
+
+
+class LoggingTracer(Tracer):
+    """LoggingTracer logs each span at debug level when it closes"""
+
+    def collect(self, span: Span) -> None:
+        logging.debug(
+            "trace: %s %.3fms %s", span.name, span.duration / 1e6, span.attrs
+        )
+
+
+#
+# the tracer for this process. None means tracing is off, and span()
+# costs one global lookup.
+#
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def set_tracer(tracer: Optional[Tracer]) -> Optional[Tracer]:
+    """installs a tracer, or turns tracing off with None. returns the old tracer."""
+    global _tracer
+    old = _tracer
+    _tracer = tracer
+    return old
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def span(name: str, **attrs):
+    tracer = _tracer
+    if tracer is None:
+        return NO_SPAN
+    return tracer.span(name, **attrs)
+
+
+def configure(config) -> Optional[Tracer]:
+    """
+    installs the tracer named in the [trace] section of a config, if
+    there is one and no tracer is installed yet
+    """
+    if _tracer is not None:
+        return _tracer
+    name = config.get("trace", "tracer", None)
+    if name is None or name.strip() == "":
+        return None
+    name = name.strip().lower()
+    if name == "recording":
+        set_tracer(RecordingTracer(int(config.get("trace", "size", "100000"))))
+    elif name == "logging":
+        set_tracer(LoggingTracer())
+    else:
+        logging.warning("tracer.configure: unknown tracer %s. tracing stays off.", name)
+    return _tracer
@@ -1,6 +1,6 @@
 import abc
-from cdocs.contextual_docs import DocPath
-from typing import Optional, Dict
+from cdocs.contextual_docs import DocPath, FilePath
+from typing import Any, Optional, Dict, Iterator
 
 class Transformer(metaclass=abc.ABCMeta):
     """
@@ -9,6 +9,18 @@ class Transformer(metaclass=abc.ABCMeta):
 
     @abc.abstractmethod
     def transform(self, content:str, path:DocPath=None, \
-                   tokens:Optional[Dict[str,str]]=None, transform_labels=True) -> str:
+                   tokens:Optional[Dict[str,str]]=None, transform_labels=True,
+                   filepath:Optional[FilePath]=None) -> str:
+        """ filepath, when known, is the physical file the content was read from """
         pass
 
+    def transform_stream(self, content:str, path:DocPath=None, \
+                   tokens:Optional[Dict[str,str]]=None, transform_labels=True,
+                   filepath:Optional[FilePath]=None) -> Iterator[str]:
+        """ yields the transformed content in chunks. by default in one chunk. """
+        yield self.transform(content, path, tokens, transform_labels, filepath=filepath)
+
+    def compile(self, content:str, filepath:Optional[FilePath]=None) -> Optional[Any]:
+        """ compiles content ahead of its first use, if the transformer compiles
+            anything. by default there is nothing to compile. """
+        return None
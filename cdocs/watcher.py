@@ -0,0 +1,100 @@
+import abc
+import os
+import logging
+import threading
+from typing import Callable, List, Optional
+from cdocs.contextual_docs import FilePath
+
+
+class WatcherException(Exception):
+    pass
+
+
+class Watcher(metaclass=abc.ABCMeta):
+    """
+    Watcher watches one root on a daemon thread. when files change it
+    tells the cdocs which paths changed, so that only what depends on
+    them is dropped from the indexes and caches, and bumps the root's
+    last change. listeners are called with the same paths.
+    """
+
+    def __init__(self, cdocs, interval: float = 1.0):  # can't type hint cdocs
+        self._cdocs = cdocs
+        self._root: FilePath = FilePath(os.path.normpath(cdocs.get_doc_root()))
+        self._interval = interval
+        self._listeners: List[Callable[[List[FilePath]], None]] = []
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def root(self) -> FilePath:
+        return self._root
+
+    @property
+    def interval(self) -> float:
+        return self._interval
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def add_listener(self, listener: Callable[[List[FilePath]], None]) -> None:
+        self._listeners.append(listener)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopping.clear()
+        self._prepare()
+        self._thread = threading.Thread(
+            target=self._loop, name=f"cdocs-watch-{self._cdocs.rootname}", daemon=True
+        )
+        self._thread.start()
+        logging.info("%s.start: watching %s", type(self).__name__, self._root)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._cleanup()
+
+    def _loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                self._watch()
+            except Exception as e:
+                logging.error("%s._loop: error watching %s: %s", type(self).__name__, self._root, e)
+                self._stopping.wait(self._interval)
+
+    @abc.abstractmethod
+    def _watch(self) -> None:
+        """waits up to about one interval for changes and dispatches any it sees"""
+        pass
+
+    def _prepare(self) -> None:
+        """called on start, before the thread runs"""
+        pass
+
+    def _cleanup(self) -> None:
+        """called on stop, after the thread is done"""
+        pass
+
+    def _dispatch(self, paths: List[FilePath]) -> None:
+        # dotfiles, and anything in a dot directory, are ignored. among
+        # them is .last_change, which we write ourselves below.
+        paths = sorted({p for p in paths if not self._is_hidden(p)})
+        if len(paths) == 0:
+            return
+        logging.info("%s._dispatch: changed: %s", type(self).__name__, paths)
+        self._cdocs.invalidate(paths)
+        for listener in self._listeners:
+            try:
+                listener(paths)
+            except Exception as e:
+                logging.error("%s._dispatch: listener failed: %s", type(self).__name__, e)
+        self._cdocs.set_last_change()
+
+    def _is_hidden(self, path: FilePath) -> bool:
+        relative = os.path.relpath(path, self._root)
+        return any(part.startswith(".") for part in relative.split(os.sep))
@@ -0,0 +1,451 @@
+import gzip
+import json
+import asyncio
+import hashlib
+import logging
+import mimetypes
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs
+from cdocs.cdocs import BadDocPath, DocNotFoundException
+from cdocs.context import Context
+from cdocs.contextual_docs import DocPath
+from cdocs.binary_doc import BinaryDoc, parse_range
+from cdocs.lru_cache import LruCache
+from cdocs.simple_index import SimpleIndex
+import cdocs.render_cache as dependencies
+
+# responses smaller than this are not worth compressing
+COMPRESS_MIN = 1024
+# precompressed siblings of a file, by content-encoding, in order of preference
+PRECOMPRESSED = [("br", ".br"), ("gzip", ".gz")]
+# an encoded body is a different representation, so its etag gets a suffix
+ETAG_SUFFIXES = {"gzip": "-gz", "br": "-br"}
+
+STATUS = {
+    200: "200 OK",
+    206: "206 Partial Content",
+    304: "304 Not Modified",
+    400: "400 Bad Request",
+    404: "404 Not Found",
+    405: "405 Method Not Allowed",
+    416: "416 Range Not Satisfiable",
+    500: "500 Internal Server Error",
+}
+
+
+class Request(object):
+    def __init__(self, method: str, path: str, query: str = "", headers: Dict[str, str] = None):
+        self.method = method.upper()
+        self.path = path
+        self.query = {k: v[-1] for k, v in parse_qs(query).items()}
+        # header names are lower case
+        self.headers = {k.lower(): v for k, v in (headers or {}).items()}
+
+    def accepts(self, encoding: str) -> bool:
+        accept = self.headers.get("accept-encoding", "")
+        for part in accept.split(","):
+            name, _, params = part.strip().partition(";")
+            if name.strip() in [encoding, "*"]:
+                return params.replace(" ", "") not in ["q=0", "q=0.0"]
+        return False
+
+
+class Response(object):
+    """body is bytes, or a BinaryDoc to be sent from its file"""
+
+    def __init__(self, status: int, headers: List[Tuple[str, str]] = None, body: Any = b""):
+        self.status = status
+        self.headers = headers or []
+        self.body = body
+
+    def header(self, name: str) -> Optional[str]:
+        for k, v in self.headers:
+            if k.lower() == name.lower():
+                return v
+        return None
+
+    @property
+    def content(self) -> bytes:
+        if isinstance(self.body, BinaryDoc):
+            return b"".join(self.body.chunks())
+        return self.body
+
+
+class Validator(object):
+    """what was last sent for a request: its etag, last modified and the files it used"""
+
+    __slots__ = ("etag", "last_modified", "dependencies", "gzipped")
+
+    def __init__(self, etag: str, last_modified: Optional[datetime], deps: Optional[Dict]):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.dependencies = deps
+        self.gzipped: Optional[bytes] = None
+
+
+class CdocsApp(object):
+    """
+    CdocsApp serves a context over http, as a WSGI app or, with asgi(),
+    an ASGI app. the routes are:
+
+        /doc/<docpath>     get_doc
+        /labels/<docpath>  get_labels, as json
+        /tokens/<docpath>  get_tokens, as json
+        /json/<docpath>    get_json
+        /list/<docpath>    list_docs, as json
+        /layer/<docpath>   list_next_layer, as json
+        /binary/<docpath>  get_binary, with byte ranges
+        /changes?since=t   changes_since, as json
+
+    ?roots=a,b uses the _from_roots methods. ?notfound=false turns off
+    the not found doc. responses carry an etag and last-modified, and
+    if-none-match and if-modified-since are answered with a 304. when
+    the files a response used have not changed, the 304 is sent without
+    rendering anything. bodies are gzipped once per version when the
+    client accepts it, and files with .br or .gz siblings are sent
+    precompressed.
+
+    without a context the app uses Context.get_shared(config_path), so
+    changes to the config are picked up.
+    """
+
+    def __init__(
+        self,
+        context: Optional[Context] = None,
+        config_path: Optional[str] = None,
+        prefix: str = "",
+        validators: int = 4096,
+    ):
+        self._context = context
+        self._config_path = config_path
+        self._prefix = prefix.rstrip("/")
+        self._validators = LruCache(validators)
+        self._index = SimpleIndex()
+        self._routes: Dict[str, Callable] = {
+            "doc": self._get_doc,
+            "labels": self._get_labels,
+            "tokens": self._get_tokens,
+            "json": self._get_json,
+            "list": self._list_docs,
+            "layer": self._list_next_layer,
+        }
+
+    @property
+    def context(self) -> Context:
+        if self._context is not None:
+            return self._context
+        return Context.get_shared(self._config_path)
+
+    # ==== http ==================
+
+    def handle(self, request: Request) -> Response:
+        if request.method not in ["GET", "HEAD"]:
+            return self._text(405, "only GET and HEAD are allowed")
+        path = request.path
+        if self._prefix != "":
+            if not path.startswith(self._prefix + "/"):
+                return self._text(404, f"nothing at {path}")
+            path = path[len(self._prefix) :]
+        route, _, docpath = path.lstrip("/").partition("/")
+        docpath = "/" + docpath
+        roots = request.query.get("roots")
+        rootnames = None if roots is None or roots.strip() == "" else roots.split(",")
+        try:
+            if rootnames is not None:
+                unknown = [n for n in rootnames if n not in self.context.keyed_cdocs]
+                if len(unknown) > 0:
+                    raise BadDocPath(f"no roots named {','.join(unknown)}")
+            if route == "binary":
+                response = self._binary(request, rootnames, docpath)
+            elif route == "changes":
+                response = self._changes(request, rootnames)
+            elif route in self._routes:
+                response = self._rendered(request, route, rootnames, docpath)
+            else:
+                response = self._text(404, f"no route {route}")
+        except (BadDocPath, DocNotFoundException) as e:
+            response = self._text(400, str(e))
+        except Exception as e:
+            logging.error("CdocsApp.handle: %s failed: %s: %s", request.path, type(e).__name__, e)
+            response = self._text(500, "cannot answer")
+        if request.method == "HEAD":
+            response.body = b""
+        return response
+
+    def _rendered(self, request: Request, route: str, rootnames, docpath: DocPath) -> Response:
+        notfound = request.query.get("notfound", "true").lower() != "false"
+        key = (route, None if rootnames is None else tuple(rootnames), docpath, notfound)
+        validator = self._validators.get(key)
+        if validator is not None and self._is_fresh(validator):
+            if self._not_modified(request, validator):
+                return self._304(validator)
+        with dependencies.track() as deps:
+            value = self._routes[route](rootnames, docpath, notfound)
+        if value is None:
+            return self._text(404, f"nothing at {docpath}")
+        if route == "doc":
+            content_type = self._doc_type(docpath)
+            body = value if isinstance(value, bytes) else str(value).encode("utf-8")
+        else:
+            content_type = "application/json"
+            body = json.dumps(value).encode("utf-8")
+        validator = Validator(
+            self._etag(key, deps, body),
+            self._last_modified(rootnames, docpath, deps),
+            dict(deps) if len(deps) > 0 else None,
+        )
+        self._validators.put(key, validator)
+        if self._not_modified(request, validator):
+            return self._304(validator)
+        headers = [("Content-Type", content_type), ("Vary", "Accept-Encoding")]
+        headers += self._validator_headers(validator)
+        if len(body) >= COMPRESS_MIN and request.accepts("gzip"):
+            if validator.gzipped is None:
+                validator.gzipped = gzip.compress(body, 6)
+            body = validator.gzipped
+            headers.append(("Content-Encoding", "gzip"))
+            headers = self._encoded(headers, "gzip")
+        headers.append(("Content-Length", str(len(body))))
+        return Response(200, headers, body)
+
+    def _binary(self, request: Request, rootnames, docpath: DocPath) -> Response:
+        context = self.context
+        if rootnames is None:
+            doc = context.get_binary(docpath)
+        else:
+            doc = context.get_binary_from_roots(rootnames, docpath)
+        if doc is None:
+            return self._text(404, f"nothing at {docpath}")
+        modified = datetime.fromtimestamp(int(doc.mtime), timezone.utc)
+        validator = Validator(f'"{doc.size:x}-{int(doc.mtime * 1e6):x}"', modified, None)
+        if self._not_modified(request, validator):
+            return self._304(validator)
+        headers = [("Content-Type", doc.content_type), ("Accept-Ranges", "bytes")]
+        headers += self._validator_headers(validator)
+        try:
+            span = parse_range(request.headers.get("range"), doc.size)
+        except ValueError:
+            return Response(416, [("Content-Range", f"bytes */{doc.size}")])
+        if span is not None:
+            doc = doc.range(*span)
+            headers.append(("Content-Range", f"bytes {doc.start}-{doc.end - 1}/{doc.size}"))
+            headers.append(("Content-Length", str(doc.length)))
+            return Response(206, headers, doc)
+        headers.append(("Vary", "Accept-Encoding"))
+        compressed = self._precompressed(request, doc)
+        if compressed is not None:
+            encoding, doc = compressed
+            headers.append(("Content-Encoding", encoding))
+            headers = self._encoded(headers, encoding)
+        headers.append(("Content-Length", str(doc.length)))
+        return Response(200, headers, doc)
+
+    def _changes(self, request: Request, rootnames) -> Response:
+        changes = self.context.changes_since(request.query.get("since"), rootnames)
+        body = json.dumps(changes.to_dict()).encode("utf-8")
+        headers = [
+            ("Content-Type", "application/json"),
+            ("Cache-Control", "no-store"),
+            ("Content-Length", str(len(body))),
+        ]
+        return Response(200, headers, body)
+
+    def _precompressed(self, request: Request, doc: BinaryDoc) -> Optional[Tuple[str, BinaryDoc]]:
+        for encoding, ext in PRECOMPRESSED:
+            if not request.accepts(encoding):
+                continue
+            stamp = self._index.stat(doc.filepath + ext)
+            # a sibling older than the file is stale
+            if stamp is not None and stamp[0] / 1e9 >= doc.mtime:
+                variant = BinaryDoc(doc.docpath, doc.filepath + ext, stamp[1], stamp[0] / 1e9)
+                return encoding, variant
+        return None
+
+    # ==== routes ==================
+
+    def _get_doc(self, rootnames, docpath: DocPath, notfound: bool):
+        if rootnames is None:
+            return self.context.get_doc(docpath, notfound)
+        return self.context.get_doc_from_roots(rootnames, docpath, notfound)
+
+    def _get_labels(self, rootnames, docpath: DocPath, notfound: bool):
+        if rootnames is None:
+            return self.context.get_labels(docpath)
+        return self.context.get_labels_from_roots(rootnames, docpath)
+
+    def _get_tokens(self, rootnames, docpath: DocPath, notfound: bool):
+        if rootnames is None:
+            return self.context.get_tokens(docpath)
+        return self.context.get_tokens_from_roots(rootnames, docpath)
+
+    def _get_json(self, rootnames, docpath: DocPath, notfound: bool):
+        if rootnames is None:
+            return self.context.get_json(docpath, readonly=True)
+        return self.context.get_json_from_roots(rootnames, docpath, readonly=True)
+
+    def _list_docs(self, rootnames, docpath: DocPath, notfound: bool):
+        if rootnames is None:
+            return self.context.list_docs(docpath)
+        return self.context.list_docs_from_roots(rootnames, docpath)
+
+    def _list_next_layer(self, rootnames, docpath: DocPath, notfound: bool):
+        if rootnames is None:
+            return self.context.list_next_layer(docpath)
+        return self.context.list_next_layer_from_roots(rootnames, docpath)
+
+    # ==== validators ==================
+
+    def _is_fresh(self, validator: Validator) -> bool:
+        if validator.dependencies is None:
+            return False
+        for filepath, stamp in validator.dependencies.items():
+            if self._index.stat(filepath) != stamp:
+                return False
+        return True
+
+    def _etag(self, key: tuple, deps: Dict, body: bytes) -> str:
+        """a hash of the files the response used, or of the body if it used none"""
+        digest = hashlib.sha1(repr(key).encode("utf-8"))
+        if len(deps) > 0:
+            for filepath in sorted(deps):
+                digest.update(f"{filepath}:{deps[filepath]}".encode("utf-8"))
+        else:
+            digest.update(body)
+        return f'"{digest.hexdigest()}"'
+
+    def _last_modified(self, rootnames, docpath: DocPath, deps: Dict) -> Optional[datetime]:
+        """the newest of the docpath's last change in each root and the files the response used"""
+        context = self.context
+        names = context.metadata.root_names if rootnames is None else rootnames
+        changes = [
+            context.keyed_cdocs[n].get_last_change(docpath) for n in names if n in context.keyed_cdocs
+        ]
+        changes = [c.timestamp() for c in changes if c is not None]
+        changes += [stamp[0] / 1e9 for stamp in deps.values() if stamp is not None]
+        if len(changes) == 0:
+            return None
+        return datetime.fromtimestamp(int(max(changes)), timezone.utc)
+
+    def _not_modified(self, request: Request, validator: Validator) -> bool:
+        inm = request.headers.get("if-none-match")
+        if inm is not None:
+            etags = [e.strip() for e in inm.split(",")]
+            etags = [e[2:] if e.startswith("W/") else e for e in etags]
+            etags = [self._unencoded(e) for e in etags]
+            return "*" in etags or validator.etag in etags
+        ims = request.headers.get("if-modified-since")
+        if ims is not None and validator.last_modified is not None:
+            try:
+                since = parsedate_to_datetime(ims)
+            except (TypeError, ValueError):
+                return False
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            return validator.last_modified.replace(microsecond=0) <= since
+        return False
+
+    def _encoded(self, headers: List[Tuple[str, str]], encoding: str) -> List[Tuple[str, str]]:
+        suffix = ETAG_SUFFIXES[encoding]
+        return [(k, v[:-1] + suffix + '"' if k == "ETag" else v) for k, v in headers]
+
+    def _unencoded(self, etag: str) -> str:
+        for suffix in ETAG_SUFFIXES.values():
+            if etag.endswith(suffix + '"'):
+                return etag[: -len(suffix) - 1] + '"'
+        return etag
+
+    def _validator_headers(self, validator: Validator) -> List[Tuple[str, str]]:
+        headers = [("ETag", validator.etag)]
+        if validator.last_modified is not None:
+            headers.append(("Last-Modified", format_datetime(validator.last_modified, usegmt=True)))
+        return headers
+
+    def _304(self, validator: Validator) -> Response:
+        return Response(304, self._validator_headers(validator) + [("Vary", "Accept-Encoding")])
+
+    def _text(self, status: int, text: str) -> Response:
+        body = text.encode("utf-8")
+        headers = [("Content-Type", "text/plain; charset=utf-8"), ("Content-Length", str(len(body)))]
+        return Response(status, headers, body)
+
+    def _doc_type(self, docpath: DocPath) -> str:
+        guess = mimetypes.guess_type(docpath.split("#")[0])[0]
+        if guess is None or guess.startswith("text/"):
+            return (guess or "text/plain") + "; charset=utf-8"
+        return guess
+
+    # ==== wsgi ==================
+
+    def __call__(self, environ: dict, start_response) -> Iterable[bytes]:
+        headers = {
+            k[5:].replace("_", "-"): v for k, v in environ.items() if k.startswith("HTTP_")
+        }
+        request = Request(
+            environ.get("REQUEST_METHOD", "GET"),
+            environ.get("PATH_INFO", "/"),
+            environ.get("QUERY_STRING", ""),
+            headers,
+        )
+        response = self.handle(request)
+        start_response(STATUS.get(response.status, str(response.status)), response.headers)
+        if isinstance(response.body, BinaryDoc):
+            return response.body.wsgi(environ)
+        return [response.body]
+
+    # ==== asgi ==================
+
+    async def asgi(self, scope: dict, receive, send) -> None:
+        if scope["type"] != "http":
+            return
+        headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope.get("headers", [])}
+        request = Request(
+            scope.get("method", "GET"),
+            scope.get("path", "/"),
+            scope.get("query_string", b"").decode("latin-1"),
+            headers,
+        )
+        # cdocs blocks on files, so it runs off the event loop
+        response = await asyncio.get_running_loop().run_in_executor(None, self.handle, request)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response.status,
+                "headers": [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in response.headers],
+            }
+        )
+        if isinstance(response.body, BinaryDoc):
+            for chunk in response.body.chunks():
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        else:
+            await send({"type": "http.response.body", "body": response.body})
+
+
+class Client(object):
+    """a local test client. it calls an app as a wsgi server would."""
+
+    def __init__(self, app: CdocsApp):
+        self._app = app
+
+    def get(self, path: str, headers: Dict[str, str] = None, method: str = "GET") -> Response:
+        path, _, query = path.partition("?")
+        environ = {
+            "REQUEST_METHOD": method,
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+        }
+        for k, v in (headers or {}).items():
+            environ["HTTP_" + k.upper().replace("-", "_")] = v
+        started = {}
+
+        def start_response(status, response_headers):
+            started["status"] = int(status.split(" ")[0])
+            started["headers"] = response_headers
+
+        body = b"".join(self._app(environ, start_response))
+        return Response(started["status"], started["headers"], body)
+
+    def head(self, path: str, headers: Dict[str, str] = None) -> Response:
+        return self.get(path, headers, "HEAD")
@@ -0,0 +1,67 @@
+from cdocs.cdocs import Cdocs
+from cdocs.context import Context
+from cdocs.context_metadata import ContextMetadata
+from cdocs.async_cdocs import AsyncCdocs
+from cdocs.async_context import AsyncContext
+import unittest
+import asyncio
+import logging
+
+PATH: str = "docs/example"
+
+
+class AsyncTests(unittest.TestCase):
+    def test_async_cdocs(self):
+        logging.info("AsyncTests.test_async_cdocs")
+        docpath = "/app/home/teams/todos/assignee"
+        cdocs = Cdocs(PATH)
+
+        async def run():
+            async with AsyncCdocs(cdocs) as acdocs:
+                doc = await acdocs.get_doc(docpath)
+                labels = await acdocs.get_labels(docpath)
+                docs = await acdocs.list_docs(docpath)
+                return doc, labels, docs
+
+        doc, labels, docs = asyncio.run(run())
+        self.assertEqual(doc, cdocs.get_doc(docpath))
+        self.assertEqual(labels, cdocs.get_labels(docpath))
+        self.assertEqual(docs, cdocs.list_docs(docpath))
+
+    def test_async_context(self):
+        logging.info("AsyncTests.test_async_context")
+        context = Context(ContextMetadata())
+        docpaths = [
+            "/app/home/teams/todos/assignee",
+            "app/home/teams#delete_assignee+todo",
+            "/app/home/teams/todos/assignee#nothing_here",
+        ]
+
+        async def run(path):
+            async with AsyncContext(context=context) as acontext:
+                return (
+                    await acontext.get_doc(path),
+                    await acontext.get_labels(path),
+                    await acontext.get_tokens(path),
+                )
+
+        for path in docpaths:
+            doc, labels, tokens = asyncio.run(run(path))
+            self.assertEqual(doc, context.get_doc(path), msg=f"doc at {path}")
+            self.assertEqual(labels, context.get_labels(path), msg=f"labels at {path}")
+            self.assertEqual(tokens, context.get_tokens(path), msg=f"tokens at {path}")
+
+    def test_async_render(self):
+        logging.info("AsyncTests.test_async_render")
+        docpath = "/app/home/teams/todos/assignee"
+        context = Context(ContextMetadata())
+        content = "{{ get_doc('/app/home/teams/todos/assignee#new_assignee') }}|" + \
+                  "{{ get_doc_from_roots(['public'], '/app/home/teams/todos/assignee#new_assignee') }}"
+
+        async def run():
+            async with AsyncContext(context=context) as acontext:
+                return await acontext.render(content, docpath, "public")
+
+        doc = asyncio.run(run())
+        expected = context.get_doc("/app/home/teams/todos/assignee#new_assignee")
+        self.assertEqual(doc, f"{expected}|{expected}")
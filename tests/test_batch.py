@@ -0,0 +1,88 @@
+from cdocs.cdocs import Cdocs
+from cdocs.context import Context
+from cdocs.context_metadata import ContextMetadata
+from cdocs.batch import BatchIndex, batch
+from cdocs.simple_index import SimpleIndex
+import unittest
+import tempfile
+import os
+import logging
+
+PATH: str = "docs/example"
+
+
+class BatchTests(unittest.TestCase):
+    def test_get_docs(self):
+        logging.info("BatchTests.test_get_docs")
+        cdocs = Cdocs(PATH)
+        paths = [
+            "/app/home/teams/todos/assignee#new_assignee",
+            "/app/home/teams/todos/assignee",
+            "/app/home/teams/todos/assignee#edit_assignee",
+            "/app/home/teams/todos/assignee",
+            "/not/a/doc",
+            "/app/home/teams.cdocs",
+        ]
+        results = cdocs.get_docs(paths)
+        self.assertEqual([r.path for r in results], paths, msg="results must be in order")
+        for result in results[0:5]:
+            self.assertTrue(result.ok, msg=f"{result.path} must not fail: {result.error}")
+            cdocs.render_cache.clear()
+            self.assertEqual(result.value, cdocs.get_doc(result.path))
+        self.assertIs(results[1], results[3], msg="duplicates must share a result")
+        self.assertFalse(results[5].ok, msg="a bad path must fail alone")
+        labels = cdocs.get_labels_many(paths[0:3])
+        self.assertEqual(labels[1].value, cdocs.get_labels(paths[1]))
+
+    def test_get_docs_from_roots(self):
+        logging.info("BatchTests.test_get_docs_from_roots")
+        context = Context(ContextMetadata())
+        paths = [
+            "/app/home/teams",
+            "app/home/teams#delete_assignee+todo",
+            "/app/home/teams/todos/assignee",
+        ]
+        results = context.get_docs_from_roots(["internal", "public"], paths)
+        for path, result in zip(paths, results):
+            self.assertTrue(result.ok, msg=f"{path} must not fail: {result.error}")
+            self.assertEqual(
+                result.value, context.get_doc_from_roots(["internal", "public"], path)
+            )
+        tokens = context.get_tokens_many(paths)
+        self.assertEqual(tokens[2].value, context.get_tokens(paths[2]))
+
+    def test_batch_index(self):
+        logging.info("BatchTests.test_batch_index")
+        index = BatchIndex(SimpleIndex())
+        simple = SimpleIndex()
+        paths = [
+            PATH,
+            os.path.join(PATH, "app"),
+            os.path.join(PATH, "app/home/teams/todos/assignee.xml"),
+            os.path.join(PATH, "app/home/teams/todos/tokens.json"),
+            os.path.join(PATH, "app/home/teams/todos/nothing.json"),
+            os.path.join(PATH, "nothing/here"),
+        ]
+        for path in paths:
+            self.assertEqual(index.exists(path), simple.exists(path), msg=path)
+            self.assertEqual(index.isfile(path), simple.isfile(path), msg=path)
+            self.assertEqual(index.isdir(path), simple.isdir(path), msg=path)
+            self.assertEqual(index.stat(path), simple.stat(path), msg=path)
+        cdocs = Cdocs(PATH)
+        with batch([cdocs]):
+            self.assertIsInstance(cdocs.index, BatchIndex)
+        self.assertIsInstance(cdocs.index, SimpleIndex)
+
+    def test_batch_index_skips_bad_entries(self):
+        logging.info("BatchTests.test_batch_index_skips_bad_entries")
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "a.xml"), "w") as f:
+                f.write("a")
+            # a dangling link can be listed but not stat'd
+            os.symlink(os.path.join(tmp, "nothing"), os.path.join(tmp, "b.xml"))
+            index = BatchIndex(SimpleIndex())
+            self.assertTrue(index.isdir(tmp))
+            self.assertTrue(index.isfile(os.path.join(tmp, "a.xml")))
+            self.assertEqual(index.stat(os.path.join(tmp, "a.xml")), SimpleIndex().stat(os.path.join(tmp, "a.xml")))
+            self.assertFalse(index.exists(os.path.join(tmp, "b.xml")))
+            self.assertEqual(index.listdir(tmp), ["a.xml"])
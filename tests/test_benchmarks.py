@@ -0,0 +1,44 @@
+from benchmarks.generator import Generator
+from benchmarks.runner import Runner, compare
+import unittest
+import tempfile
+import os
+import logging
+
+
+class BenchmarksTests(unittest.TestCase):
+    def _files(self, path: str) -> dict:
+        files = {}
+        for dirpath, dirnames, filenames in os.walk(path):
+            for f in filenames:
+                if f == "config.ini":
+                    continue
+                filepath = os.path.join(dirpath, f)
+                with open(filepath) as fp:
+                    files[os.path.relpath(filepath, path)] = fp.read()
+        return files
+
+    def test_generate(self):
+        logging.info("BenchmarksTests.test_generate")
+        generator = Generator(depth=2, fanout=2, docs=2, roots=2, complexity=2, plus=5)
+        with tempfile.TemporaryDirectory() as a, tempfile.TemporaryDirectory() as b:
+            tree = generator.generate(a)
+            generator.generate(b)
+            self.assertEqual(self._files(a), self._files(b), msg="the files must be the same")
+            self.assertEqual(len(tree.dirpaths), 6)
+            self.assertEqual(len(tree.docpaths), 12)
+            self.assertEqual(len(tree.pluspaths), 5)
+
+    def test_run(self):
+        logging.info("BenchmarksTests.test_run")
+        generator = Generator(depth=1, fanout=2, docs=2, complexity=2, plus=2)
+        with tempfile.TemporaryDirectory() as tmp:
+            tree = generator.generate(tmp)
+            results = Runner(tree, passes=1).run(["get_doc_cold", "context_miss"])
+        result = results["get_doc_cold"]
+        self.assertEqual(result["ops"], len(tree.docpaths))
+        self.assertGreater(result["ops_per_sec"], 0)
+        self.assertGreaterEqual(result["p99_us"], result["p50_us"])
+        self.assertEqual(compare({"results": results}, results), [])
+        slower = {"get_doc_cold": dict(result, p50_us=result["p50_us"] * 2)}
+        self.assertEqual(len(compare({"results": results}, slower)), 1)
@@ -0,0 +1,71 @@
+from cdocs.cdocs import Cdocs
+from cdocs.context import Context
+from cdocs.context_metadata import ContextMetadata
+from cdocs.binary_doc import BinaryDoc, parse_range
+import unittest
+import tempfile
+import socket
+import os
+import logging
+
+PATH: str = "docs/images"
+PNG: str = "/app/home/teams/3-copy.png"
+
+
+class BinaryTests(unittest.TestCase):
+    def _bytes(self, doc: BinaryDoc) -> bytes:
+        with open(doc.filepath, "rb") as f:
+            return f.read()
+
+    def test_get_binary(self):
+        logging.info("BinaryTests.test_get_binary")
+        context = Context(ContextMetadata())
+        doc = context.get_binary(PNG)
+        self.assertIsNotNone(doc, msg=f"{PNG} must be found")
+        self.assertEqual(doc.content_type, "image/png")
+        content = self._bytes(doc)
+        self.assertEqual(doc.size, len(content))
+        self.assertEqual(bytes(doc.memoryview()), content)
+        self.assertEqual(b"".join(doc.chunks(1000)), content)
+        with context.open_doc(PNG) as f:
+            self.assertEqual(f.read(), content)
+        self.assertIsNone(context.get_binary("/app/home/teams/nothing.png"))
+        cdocs = Cdocs(PATH)
+        self.assertEqual(cdocs.get_binary(PNG).filepath, doc.filepath)
+        self.assertIsNone(cdocs.get_binary("/app/home/teams"))
+
+    def test_ranges(self):
+        logging.info("BinaryTests.test_ranges")
+        with tempfile.TemporaryDirectory() as tmp:
+            filepath = os.path.join(tmp, "big.pdf")
+            content = os.urandom(200000)
+            with open(filepath, "wb") as f:
+                f.write(content)
+            doc = BinaryDoc("/big.pdf", filepath, len(content), 0)
+            part = doc.range(70001, 70011)
+            self.assertTrue(part.partial)
+            self.assertEqual(bytes(part.memoryview()), content[70001:70011])
+            self.assertEqual(b"".join(part.chunks()), content[70001:70011])
+            with part.open() as f:
+                self.assertEqual(f.read(10), content[70001:70011])
+            a, b = socket.socketpair()
+            try:
+                self.assertEqual(part.sendfile(a.fileno()), 10)
+                self.assertEqual(b.recv(100), content[70001:70011])
+            finally:
+                a.close()
+                b.close()
+            environ = {"wsgi.file_wrapper": lambda f, size: ("wrapped", f)}
+            wrapped = doc.wsgi(environ)
+            self.assertEqual(wrapped[0], "wrapped")
+            wrapped[1].close()
+            self.assertEqual(b"".join(part.wsgi(environ)), content[70001:70011])
+        self.assertIsNone(parse_range(None, 100))
+        self.assertIsNone(parse_range("bytes=a-b", 100))
+        self.assertIsNone(parse_range("bytes=0-1,5-6", 100))
+        self.assertEqual(parse_range("bytes=0-9", 100), (0, 10))
+        self.assertEqual(parse_range("bytes=90-", 100), (90, 100))
+        self.assertEqual(parse_range("bytes=-10", 100), (90, 100))
+        self.assertEqual(parse_range("bytes=95-200", 100), (95, 100))
+        with self.assertRaises(ValueError):
+            parse_range("bytes=100-", 100)
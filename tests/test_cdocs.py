@@ -299,6 +299,20 @@ class CdocsTests(unittest.TestCase):
         )
         logging.info(f"test_get_concat_doc: concat doc: {doc}")
 
+    def test_concat_parts_once(self):
+        logging.info("CdocsTests.test_concat_parts_once")
+        cdocs = Cdocs(PATH)
+        concatter = cdocs.concatter
+        self.assertEqual(concatter.join_all(["a", "b", "c"]), "a b c")
+        self.assertEqual(concatter.join_all(["a", None, "", "b"]), "a b")
+        parts = ['{"a": 1}', '{"b": 2}', "text", '{"a": 3}', '{"a": 4}']
+        self.assertEqual(concatter.join_all(parts), '{"a": 1, "b": 2} text {"a": 4}')
+        self.assertEqual(concatter.join("a", "b"), "a b")
+        docpath = "/app/home/teams/todos/assignee/concat.concat"
+        doc = cdocs.get_concat_doc(docpath)
+        for part in ["new assignee", "edit assignee"]:
+            self.assertEqual(doc.count(part), 1, msg=f"{part} must be in {doc} once")
+
     def test_get_compose_doc(self):
         logging.info("CdocsTests.test_get_compose_doc")
         docpath = "/app/home/teams/compose.html"
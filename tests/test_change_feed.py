@@ -0,0 +1,129 @@
+from cdocs.context import Context
+from cdocs.context_metadata import ContextMetadata
+from cdocs.simple_config import SimpleConfig
+from cdocs.change_feed import decode_token
+from cdocs.web import CdocsApp, Client
+from cdocs.simple_index import SimpleIndex
+import unittest
+import tempfile
+import shutil
+import json
+import os
+import logging
+
+
+class CountingIndex(SimpleIndex):
+    def __init__(self):
+        self.listdirs = 0
+
+    def listdir(self, filepath):
+        self.listdirs += 1
+        return super().listdir(filepath)
+
+
+class ChangeFeedTests(unittest.TestCase):
+    def _context(self, tmp: str, interval: int = 0) -> Context:
+        root = os.path.join(tmp, "root")
+        os.makedirs(os.path.join(root, "x", "y"))
+        os.makedirs(os.path.join(root, "a"))
+        self._write(os.path.join(root, "x", "y.xml"), "y")
+        self._write(os.path.join(root, "x", "y", "z.xml"), "z")
+        self._write(os.path.join(root, "x", "tokens.json"), "{}")
+        self._write(os.path.join(root, "a", "b.xml"), "b")
+        self._write(os.path.join(root, "c.xml"), "c {{ get_doc('/a/b') }}")
+        path = os.path.join(tmp, "config.ini")
+        with open(path, "w") as f:
+            f.write(f"[docs]\ntmp = {root}\n[formats]\ntmp = xml\n[accepts]\ntmp = cdocs\n[filenames]\nplus = +\n[changes]\ncheck_interval = {interval}\n")
+        return Context(ContextMetadata(SimpleConfig(path)))
+
+    def _write(self, path: str, content: str) -> None:
+        with open(path, "w") as f:
+            f.write(content)
+
+    def test_unchanged_tree_is_not_a_rescan(self):
+        logging.info("ChangeFeedTests.test_unchanged_tree_is_not_a_rescan")
+        with tempfile.TemporaryDirectory() as tmp:
+            context = self._context(tmp, interval=60)
+            index = CountingIndex()
+            context.keyed_cdocs["tmp"].index = index
+            token = context.changes_since().token
+            listed = index.listdirs
+            self.assertGreater(listed, 0)
+            for _ in range(3):
+                changes = context.changes_since(token)
+                self.assertEqual(changes.changes["tmp"], [])
+            self.assertEqual(index.listdirs, listed, msg="an unchanged tree must not be listed again")
+            # a reported change is looked at straight away
+            self._write(os.path.join(tmp, "root", "a", "b.xml"), "bb")
+            context.keyed_cdocs["tmp"].invalidate([os.path.join(tmp, "root", "a", "b.xml")])
+            self.assertEqual(context.changes_since(token).changes["tmp"], ["/a/b"])
+
+    def test_changes_since(self):
+        logging.info("ChangeFeedTests.test_changes_since")
+        with tempfile.TemporaryDirectory() as tmp:
+            context = self._context(tmp)
+            root = os.path.join(tmp, "root")
+            changes = context.changes_since()
+            self.assertEqual(changes.full, ["tmp"])
+            self.assertEqual(changes.changes["tmp"], ["/a/b", "/c", "/x/y", "/x/y/z"])
+            changes = context.changes_since(changes.token)
+            self.assertEqual(changes.full, [])
+            self.assertEqual(changes.changes["tmp"], [])
+            # a doc
+            self._write(os.path.join(root, "x", "y", "z.xml"), "zz")
+            changes = context.changes_since(changes.token)
+            self.assertEqual(changes.changes["tmp"], ["/x/y/z"])
+            # tokens change every doc below them
+            self._write(os.path.join(root, "x", "tokens.json"), '{"a": 1}')
+            changes = context.changes_since(changes.token)
+            self.assertEqual(changes.changes["tmp"], ["/x", "/x/y", "/x/y/z"])
+            # new and removed files, and new directories
+            os.makedirs(os.path.join(root, "x", "new"))
+            self._write(os.path.join(root, "x", "new", "n.xml"), "n")
+            os.remove(os.path.join(root, "x", "y.xml"))
+            changes = context.changes_since(changes.token)
+            self.assertEqual(changes.changes["tmp"], ["/x/new/n", "/x/y"])
+            shutil.rmtree(os.path.join(root, "x", "new"))
+            changes = context.changes_since(changes.token)
+            self.assertEqual(changes.changes["tmp"], ["/x/new/n"])
+
+    def test_touch_is_not_a_change(self):
+        logging.info("ChangeFeedTests.test_touch_is_not_a_change")
+        with tempfile.TemporaryDirectory() as tmp:
+            context = self._context(tmp)
+            filepath = os.path.join(tmp, "root", "a", "b.xml")
+            token = context.changes_since().token
+            # the first change of a file is taken on its stamp. after that
+            # the file has a hash to compare with.
+            os.utime(filepath, (1000, 1000))
+            token = context.changes_since(token).token
+            os.utime(filepath, (2000, 2000))
+            changes = context.changes_since(token)
+            self.assertEqual(changes.changes["tmp"], [])
+
+    def test_rendered_dependents(self):
+        logging.info("ChangeFeedTests.test_rendered_dependents")
+        with tempfile.TemporaryDirectory() as tmp:
+            context = self._context(tmp)
+            self.assertEqual(context.get_doc("/c"), "c b")
+            token = context.changes_since().token
+            self._write(os.path.join(tmp, "root", "a", "b.xml"), "bb")
+            changes = context.changes_since(token)
+            self.assertEqual(changes.changes["tmp"], ["/a/b", "/c"])
+            self.assertEqual(context.get_doc("/c"), "c bb")
+
+    def test_tokens(self):
+        logging.info("ChangeFeedTests.test_tokens")
+        with tempfile.TemporaryDirectory() as tmp:
+            context = self._context(tmp)
+            changes = context.changes_since()
+            self.assertIn("tmp", decode_token(changes.token))
+            self.assertEqual(decode_token("not a token"), {})
+            self.assertEqual(context.changes_since("not a token").full, ["tmp"])
+            # a token from another process, or another context, starts over
+            other = self._context(os.path.join(tmp, "other"))
+            self.assertEqual(other.changes_since(changes.token).full, ["tmp"])
+            client = Client(CdocsApp(context))
+            response = client.get(f"/changes?since={changes.token}")
+            self.assertEqual(response.header("Cache-Control"), "no-store")
+            self.assertEqual(json.loads(response.content)["changes"], {"tmp": []})
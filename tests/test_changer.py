@@ -1,5 +1,8 @@
 from cdocs.cdocs import Cdocs, DocNotFoundException, BadDocPath
+from cdocs.simple_config import SimpleConfig
+from cdocs.simple_index import SimpleIndex
 import unittest
+import tempfile
 import datetime
 import time
 import os
@@ -33,3 +36,79 @@ class ChangerTests(unittest.TestCase):
         cdocs.set_last_change()
         dt4 = cdocs.get_last_change()
         self.assertNotEqual(dt4, dt3, msg=f"last change: {dt4} must not equal {dt3}")
+
+    def test_last_change_of_path(self):
+        logging.info("ChangerTests.test_last_change_of_path")
+        with tempfile.TemporaryDirectory() as tmp:
+            root = os.path.join(tmp, "root")
+            os.makedirs(os.path.join(root, "x", "y"))
+            os.makedirs(os.path.join(root, "a"))
+            files = {
+                "x/y.xml": "y",
+                "x/y/z.xml": "z",
+                "x/tokens.json": "{}",
+                "a/b.xml": "b",
+            }
+            for name, content in files.items():
+                self._write(os.path.join(root, name), content, 1000)
+            config = os.path.join(tmp, "config.ini")
+            with open(config, "w") as f:
+                f.write(f"[docs]\ntmp = {root}\n[formats]\ntmp = xml\n[changes]\ncheck_interval = 0\n")
+            cdocs = Cdocs(root, SimpleConfig(config))
+            self.assertEqual(cdocs.get_last_change("/x/y").timestamp(), 1000)
+            self.assertEqual(cdocs.get_last_change("/x/y#z").timestamp(), 1000)
+            self.assertIsNone(cdocs.get_last_change("/x/nothing"))
+            # a change elsewhere in the root doesn't move /x/y
+            self._write(os.path.join(root, "a", "b.xml"), "bb", 2000)
+            self.assertEqual(cdocs.get_last_change("/x/y").timestamp(), 1000)
+            self.assertEqual(cdocs.get_last_change("/a/b").timestamp(), 2000)
+            # a doc below moves it
+            self._write(os.path.join(root, "x", "y", "z.xml"), "zz", 3000)
+            self.assertEqual(cdocs.get_last_change("/x/y").timestamp(), 3000)
+            # and so do tokens above it
+            self._write(os.path.join(root, "x", "tokens.json"), '{"a":1}', 4000)
+            self.assertEqual(cdocs.get_last_change("/x/y#z").timestamp(), 4000)
+            self.assertEqual(cdocs.get_last_change("/a/b").timestamp(), 2000)
+            # a removal has no mtime. it is the time it was seen.
+            before = time.time()
+            os.remove(os.path.join(root, "x", "y", "z.xml"))
+            self.assertGreaterEqual(cdocs.get_last_change("/x/y").timestamp(), before)
+
+    def _write(self, path: str, content: str, mtime: int) -> None:
+        with open(path, "w") as f:
+            f.write(content)
+        os.utime(path, (mtime, mtime))
+
+    def test_last_change_is_not_a_rescan(self):
+        logging.info("ChangerTests.test_last_change_is_not_a_rescan")
+        with tempfile.TemporaryDirectory() as tmp:
+            root = os.path.join(tmp, "root")
+            for d in ["a", "b", "c"]:
+                os.makedirs(os.path.join(root, d, "x"))
+                self._write(os.path.join(root, d, "x", "y.xml"), "y", 1000)
+            config = os.path.join(tmp, "config.ini")
+            with open(config, "w") as f:
+                f.write(f"[docs]\ntmp = {root}\n[formats]\ntmp = xml\n")
+            cdocs = Cdocs(root, SimpleConfig(config))
+            index = CountingIndex()
+            cdocs.index = index
+            first = cdocs.get_last_change("/")
+            self.assertEqual(index.listdirs, 7)
+            # nothing is listed again until [changes] check_interval has passed
+            self.assertEqual(cdocs.get_last_change("/"), first)
+            self.assertEqual(cdocs.get_last_change("/a"), first)
+            self.assertEqual(index.listdirs, 7)
+            # unless a watcher, or anyone, says a directory changed
+            self._write(os.path.join(root, "b", "x", "y.xml"), "yy", 2000)
+            cdocs.invalidate([os.path.join(root, "b", "x", "y.xml")])
+            self.assertEqual(cdocs.get_last_change("/b").timestamp(), 2000)
+            self.assertEqual(cdocs.get_last_change("/a").timestamp(), 1000)
+
+
+class CountingIndex(SimpleIndex):
+    def __init__(self):
+        self.listdirs = 0
+
+    def listdir(self, filepath):
+        self.listdirs += 1
+        return super().listdir(filepath)
@@ -0,0 +1,77 @@
+from cdocs.cdocs import Cdocs
+from cdocs.compiler import Compiler
+from cdocs.simple_config import SimpleConfig
+from cdocs.transformer import Transformer
+from configparser import ConfigParser
+from jinja2 import Environment
+from unittest import mock
+import unittest
+import tempfile
+import os
+import logging
+
+PATH: str = "docs/example"
+
+
+class CompilerTests(unittest.TestCase):
+    def _config(self, tmp: str) -> SimpleConfig:
+        parser = ConfigParser()
+        parser.read("config/config.ini")
+        parser.set("cache", "bytecode", os.path.join(tmp, "bytecode"))
+        path = os.path.join(tmp, "config.ini")
+        with open(path, "w") as f:
+            parser.write(f)
+        return SimpleConfig(path)
+
+    def test_list_templates(self):
+        logging.info("CompilerTests.test_list_templates")
+        cdocs = Cdocs(PATH)
+        templates = Compiler([cdocs]).list_templates(PATH, ["tokens.json"])
+        logging.info(f"CompilerTests.test_list_templates: {templates}")
+        names = [os.path.basename(t) for t in templates]
+        self.assertIn("assignee.xml", names, msg="assignee.xml must be listed")
+        self.assertNotIn("concat.concat", names, msg="concats are not templates")
+        self.assertNotIn("tokens.json", names, msg="skipped names are not listed")
+
+    def test_compile_writes_bytecode(self):
+        logging.info("CompilerTests.test_compile_writes_bytecode")
+        with tempfile.TemporaryDirectory() as tmp:
+            cfg = self._config(tmp)
+            cdocs = Cdocs(PATH, cfg)
+            count = Compiler([cdocs]).compile()
+            cached = os.listdir(os.path.join(tmp, "bytecode"))
+            logging.info(f"CompilerTests.test_compile_writes_bytecode: {cached}")
+            self.assertGreater(count, 0, msg="must compile templates")
+            self.assertEqual(count, len(cached), msg="must cache every template")
+            #
+            # a new cdocs, like a new worker, renders from the bytecode
+            #
+            cdocs = Cdocs(PATH, cfg)
+            with mock.patch.object(Environment, "compile", autospec=True, side_effect=Environment.compile) as compiled:
+                doc = cdocs.get_doc("/app/home/teams/todos/assignee")
+            self.assertIn("assignee in company starstruck!", doc)
+            # labels are strings, not files, so they are not in the bytecode cache
+            self.assertEqual(self._files(compiled), [], msg="templates must load from the bytecode cache")
+            # with the bytecode gone the same render compiles
+            for name in cached:
+                os.remove(os.path.join(tmp, "bytecode", name))
+            cdocs = Cdocs(PATH, cfg)
+            with mock.patch.object(Environment, "compile", autospec=True, side_effect=Environment.compile) as compiled:
+                cdocs.get_doc("/app/home/teams/todos/assignee")
+            self.assertGreater(len(self._files(compiled)), 0)
+
+    def _files(self, compiled) -> list:
+        """the template files a mocked Environment.compile was called for"""
+        files = [c.args[3] if len(c.args) > 3 else c.kwargs.get("filename") for c in compiled.call_args_list]
+        return [f for f in files if f is not None]
+
+    def test_transformer_without_compile(self):
+        logging.info("CompilerTests.test_transformer_without_compile")
+
+        class Plain(Transformer):
+            def transform(self, content, path=None, tokens=None, transform_labels=True, filepath=None):
+                return content
+
+        cdocs = Cdocs(PATH)
+        cdocs.transformer = Plain()
+        self.assertEqual(Compiler([cdocs]).compile(), 0)
@@ -1,4 +1,7 @@
 from cdocs.simple_config import SimpleConfig
+from cdocs.config_snapshot import ConfigSnapshot, snapshot
+from cdocs.context import Context
+from cdocs.context_metadata import ContextMetadata
 import unittest
 import logging
 
@@ -29,3 +32,37 @@ class ConfigTests(unittest.TestCase):
         name = cfg.get_matching_key_for_value("docs", "fish")
         logging.info(f"ConfigTests.test_get_matching_key_for_value: name2: {name}")
         self.assertNotEqual(name, "internal", msg="must not equal the 'internal' root")
+
+    def test_snapshot(self):
+        logging.info("ConfigTests.test_snapshot")
+        cfg = SimpleConfig()
+        snap = snapshot(cfg)
+        self.assertIsInstance(snap, ConfigSnapshot)
+        self.assertIs(snapshot(snap), snap, msg="a snapshot must not be copied")
+        for group in cfg.get_sections():
+            self.assertEqual(snap.get_items(group), cfg.get_items(group), msg=group)
+            for name, value in cfg.get_items(group):
+                self.assertEqual(snap.get(group, name), cfg.get(group, name))
+                self.assertEqual(
+                    snap.get_matching_key_for_value(group, value),
+                    cfg.get_matching_key_for_value(group, value),
+                )
+        self.assertEqual(snap.get("fish", "bats", "yeah!"), "yeah!")
+        self.assertEqual(snap.get("docs", "fish", "yeah!"), "yeah!")
+        self.assertEqual(snap.get("DOCS", "public", "yeah!"), "yeah!")
+        self.assertEqual(snap.get("docs", "PUBLIC"), cfg.get("docs", "PUBLIC"))
+        self.assertIsNone(snap.get_matching_key_for_value("docs", "fish"))
+        for name, path in cfg.get_items("docs"):
+            self.assertEqual(snap.get_exts(name), cfg.get_exts(name))
+            self.assertEqual(snap.get_accepts(name), cfg.get_accepts(name))
+        self.assertEqual(snap.get_exts("public"), ["xml", "json"])
+        self.assertIsNone(snap.get_accepts("fish"))
+
+    def test_snapshot_is_shared(self):
+        logging.info("ConfigTests.test_snapshot_is_shared")
+        context = Context(ContextMetadata(SimpleConfig()))
+        config = context.metadata.config
+        self.assertIsInstance(config, ConfigSnapshot)
+        for cdocs in context.cdocs:
+            self.assertIs(cdocs.config, config, msg=f"{cdocs.rootname} must share the snapshot")
+            self.assertIs(cdocs.pather._cdocs, cdocs)
@@ -1,7 +1,9 @@
 from cdocs.cdocs import Cdocs, DocNotFoundException, BadDocPath
 from cdocs.context import Context
 from cdocs.context_metadata import ContextMetadata
+from cdocs.simple_config import SimpleConfig
 import unittest
+import tempfile
 import os
 import logging
 
@@ -285,3 +287,57 @@ class ContextTests(unittest.TestCase):
         self.assertNotEqual(
             notfound, -1, msg=f'doc at {docpath} must include "Not found!"'
         )
+
+    def test_get_doc_from_roots_in_parallel(self):
+        logging.info("ContextTests.test_get_doc_from_roots_in_parallel")
+        metadata = ContextMetadata()
+        sequential = Context(metadata, 0)
+        parallel = Context(metadata, 4)
+        self.assertEqual(parallel.concurrency, 4)
+        docpaths = [
+            "/app/home/teams",
+            "/app/home/teams/todos/assignee",
+            "/app/home/teams/todos/assignee#new_assignee",
+            "app/home/teams#delete_assignee+todo",
+            "/not/a/doc",
+        ]
+        roots = ["internal", "public"]
+        for docpath in docpaths:
+            for rootnames in [roots, list(reversed(roots))]:
+                expected = sequential.get_doc_from_roots(rootnames, docpath)
+                doc = parallel.get_doc_from_roots(rootnames, docpath)
+                self.assertEqual(
+                    expected, doc, msg=f"{docpath} in {rootnames} must match sequential"
+                )
+        parallel.concurrency = 0
+        self.assertIsNone(parallel._executor)
+
+    def test_parallel_records_nested_files(self):
+        logging.info("ContextTests.test_parallel_records_nested_files")
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ["a", "b"]:
+                os.makedirs(os.path.join(tmp, name))
+            outer = "outer[{{ get_doc_from_roots(['a', 'b'], '/n') }}]"
+            with open(os.path.join(tmp, "a", "o.xml"), "w") as f:
+                f.write(outer)
+            nested = os.path.join(tmp, "b", "n.xml")
+            with open(nested, "w") as f:
+                f.write("v1")
+            path = os.path.join(tmp, "config.ini")
+            with open(path, "w") as f:
+                f.write(
+                    f"[docs]\na = {tmp}/a\nb = {tmp}/b\n[formats]\na = xml\nb = xml\n"
+                    "[accepts]\na = cdocs\nb = cdocs\n[filenames]\nplus = +\n"
+                )
+            context = Context(ContextMetadata(SimpleConfig(path)), 4)
+            try:
+                # the outer doc renders on this thread. the nested lookup runs on the pool.
+                cdocs = context.keyed_cdocs["a"]
+                self.assertEqual(cdocs.get_doc("/o"), "outer[v1]")
+                with open(nested, "w") as f:
+                    f.write("v2-changed")
+                self.assertEqual(cdocs.get_doc("/o"), "outer[v2-changed]")
+            finally:
+                context.close()
+            self.assertIsNone(context._executor)
+            self.assertEqual(context.get_doc_from_roots(["a", "b"], "/n"), "v2-changed")
@@ -0,0 +1,60 @@
+from cdocs.context import Context
+from cdocs.context_registry import ContextRegistry
+import unittest
+import tempfile
+import time
+import os
+import logging
+
+
+class ContextRegistryTests(unittest.TestCase):
+    def _config(self, tmp: str, roots: list) -> str:
+        path = os.path.join(tmp, "config.ini")
+        with open(path, "w") as f:
+            f.write("[docs]\n")
+            for name in roots:
+                root = os.path.join(tmp, name)
+                os.makedirs(root, exist_ok=True)
+                with open(os.path.join(root, "x.xml"), "w") as doc:
+                    doc.write(name)
+                f.write(f"{name} = {root}\n")
+            f.write("[accepts]\n" + "".join(f"{name} = cdocs\n" for name in roots))
+            f.write("[filenames]\nplus = +\nhashmark = #\n")
+        return path
+
+    def _wait_for(self, registry: ContextRegistry, path: str, old: Context) -> Context:
+        for _ in range(200):
+            context = registry.get(path)
+            if context is not old:
+                return context
+            time.sleep(0.01)
+        self.fail("the context must be replaced")
+
+    def test_get_shared(self):
+        logging.info("ContextRegistryTests.test_get_shared")
+        self.assertIs(Context.get_shared(), Context.get_shared())
+
+    def test_reload(self):
+        logging.info("ContextRegistryTests.test_reload")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = self._config(tmp, ["a"])
+            registry = ContextRegistry(check_interval=0)
+            context = registry.get(path)
+            self.assertIs(registry.get(path), context, msg="an unchanged config must be reused")
+            self.assertEqual(context.get_doc("/x"), "a")
+            time.sleep(0.01)
+            self._config(tmp, ["b", "a"])
+            # the old context answers until the new one is ready
+            self.assertEqual(registry.get(path).get_doc("/x"), "a")
+            new = self._wait_for(registry, path, context)
+            self.assertEqual(new.get_doc("/x"), "b")
+            self.assertEqual(context.get_doc("/x"), "a", msg="the old context must still work")
+            # a config that cannot be built leaves the current context in place
+            time.sleep(0.01)
+            with open(path, "a") as f:
+                f.write("[broken\n")
+            registry.get(path)
+            time.sleep(0.2)
+            self.assertIs(registry.get(path), new)
+            self.assertIsNot(registry.reload(self._config(tmp, ["a"])), new)
+            registry.clear()
@@ -0,0 +1,90 @@
+from cdocs.exporter import Exporter
+from unittest import mock
+import cdocs.exporter as exporter_module
+import unittest
+import tempfile
+import json
+import time
+import os
+import logging
+
+
+class ExporterTests(unittest.TestCase):
+    def _root(self, tmp: str) -> str:
+        root = os.path.join(tmp, "root")
+        os.makedirs(os.path.join(root, "x", "y"))
+        self._write(os.path.join(root, "x", "tokens.json"), json.dumps({"a": "1"}))
+        self._write(os.path.join(root, "x", "y.xml"), "y {{a}}")
+        self._write(os.path.join(root, "x", "y", "z.xml"), "z")
+        self._write(os.path.join(root, "x", "y", "page.html"), "{{ get_doc('/x/y#z') }}!")
+        self._write(os.path.join(root, "x", "y", "all.concat"), "/x/y#z\n/x/y#z")
+        path = os.path.join(tmp, "config.ini")
+        with open(path, "w") as f:
+            f.write(f"[docs]\ntmp = {root}\n[accepts]\ntmp = cdocs\n")
+        return path
+
+    def _write(self, path: str, content: str) -> None:
+        with open(path, "w") as f:
+            f.write(content)
+
+    def _read(self, path: str) -> str:
+        with open(path) as f:
+            return f.read()
+
+    def test_export(self):
+        logging.info("ExporterTests.test_export")
+        with tempfile.TemporaryDirectory() as tmp:
+            config = self._root(tmp)
+            root = os.path.join(tmp, "root")
+            out = os.path.join(tmp, "out")
+            exporter = Exporter(out, config, workers=2)
+            jobs = exporter.list_jobs("tmp")
+            methods = {job[2]: job[1] for job in jobs}
+            self.assertEqual(methods["/x/y"], "get_doc")
+            self.assertEqual(methods["/x/y/page.html"], "get_compose_doc")
+            self.assertEqual(methods["/x/y/all.concat"], "get_concat_doc")
+            counts = exporter.export()
+            self.assertEqual(counts["written"], len(jobs))
+            self.assertEqual(self._read(os.path.join(out, "tmp", "x", "y.xml")), "y 1")
+            self.assertEqual(self._read(os.path.join(out, "tmp", "x", "y", "page.html")), "z!")
+            # nothing changed
+            counts = Exporter(out, config, workers=1).export()
+            self.assertEqual(counts["written"], 0)
+            self.assertEqual(counts["skipped"], len(jobs))
+            # z is used by itself, the page and the concat
+            time.sleep(0.01)
+            self._write(os.path.join(root, "x", "y", "z.xml"), "zz")
+            counts = Exporter(out, config, workers=1).export()
+            self.assertEqual(counts["written"], 3)
+            self.assertEqual(self._read(os.path.join(out, "tmp", "x", "y", "page.html")), "zz!")
+            # a removed doc's output is removed
+            os.remove(os.path.join(root, "x", "y.xml"))
+            counts = Exporter(out, config, workers=1).export()
+            self.assertEqual(counts["removed"], 1)
+            self.assertFalse(os.path.exists(os.path.join(out, "tmp", "x", "y.xml")))
+
+    def test_failed_render_keeps_output(self):
+        logging.info("ExporterTests.test_failed_render_keeps_output")
+        with tempfile.TemporaryDirectory() as tmp:
+            config = self._root(tmp)
+            root = os.path.join(tmp, "root")
+            out = os.path.join(tmp, "out")
+            Exporter(out, config, workers=1).export()
+            export = exporter_module._export
+
+            def failing(out, job):
+                if job[2] == "/x/y":
+                    return job, None, "RuntimeError: no disk"
+                return export(out, job)
+
+            time.sleep(0.01)
+            self._write(os.path.join(root, "x", "y.xml"), "yy {{a}}")
+            with mock.patch.object(exporter_module, "_export", failing):
+                counts = Exporter(out, config, workers=1).export()
+            self.assertEqual(counts["failed"], 1)
+            self.assertEqual(counts["removed"], 0)
+            self.assertEqual(self._read(os.path.join(out, "tmp", "x", "y.xml")), "y 1")
+            # the failed doc is tried again, and written once it renders
+            counts = Exporter(out, config, workers=1).export()
+            self.assertEqual(counts["written"], 1)
+            self.assertEqual(self._read(os.path.join(out, "tmp", "x", "y.xml")), "yy 1")
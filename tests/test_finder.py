@@ -0,0 +1,63 @@
+from cdocs.cdocs import Cdocs
+from cdocs.simple_config import SimpleConfig
+import unittest
+import tempfile
+import json
+import os
+import logging
+
+PATH: str = "docs/example"
+
+
+class FinderTests(unittest.TestCase):
+    def _root(self, tmp: str) -> Cdocs:
+        root = os.path.join(tmp, "root")
+        os.makedirs(os.path.join(root, "x", "y"))
+        self._write(os.path.join(root, "x", "tokens.json"), {"a": "x", "b": "x"})
+        path = os.path.join(tmp, "config.ini")
+        with open(path, "w") as f:
+            f.write(f"[docs]\ntmp = {root}\n")
+        return Cdocs(root, SimpleConfig(path))
+
+    def _write(self, path: str, tokens: dict) -> None:
+        with open(path, "w") as f:
+            json.dump(tokens, f)
+
+    def test_find_files(self):
+        logging.info("FinderTests.test_find_files")
+        cdocs = Cdocs(PATH)
+        pointer = os.path.join(PATH, "app/home/teams")
+        files = cdocs.finder.find_files(PATH, pointer, "tokens.json")
+        logging.info(f"FinderTests.test_find_files: files: {files}")
+        self.assertEqual(files[0], os.path.join(pointer, "tokens.json"))
+        self.assertEqual(files[-1], os.path.join(PATH, "tokens.json"))
+        self.assertEqual(len(files), 4, msg=f"files must go up to root: {files}")
+
+    def test_chain_is_cached(self):
+        logging.info("FinderTests.test_chain_is_cached")
+        cdocs = Cdocs(PATH)
+        tokens1 = cdocs.get_tokens("/app/home/teams/todos/assignee")
+        tokens1["company"] = "changed by a caller"
+        tokens2 = cdocs.get_tokens("/app/home/teams/todos/assignee")
+        self.assertEqual(tokens2["company"], "starstruck", msg="must return copies")
+        chains = cdocs.finder._chains
+        self.assertIn(("app/home/teams/todos/assignee", "tokens.json", True), chains)
+
+    def test_changed_tokens_are_reread(self):
+        logging.info("FinderTests.test_changed_tokens_are_reread")
+        with tempfile.TemporaryDirectory() as tmp:
+            cdocs = self._root(tmp)
+            tokens = cdocs.get_tokens("/x/y", addlabels=False)
+            self.assertEqual(tokens, {"a": "x", "b": "x"})
+            # a new, lower tokens file is found although it was missing before
+            ytokens = os.path.join(cdocs.get_doc_root(), "x", "y", "tokens.json")
+            self._write(ytokens, {"a": "y"})
+            tokens = cdocs.get_tokens("/x/y", addlabels=False)
+            self.assertEqual(tokens, {"a": "y", "b": "x"})
+            # and changes to an existing file are seen
+            self._write(ytokens, {"a": "yy", "c": "y"})
+            tokens = cdocs.get_tokens("/x/y", addlabels=False)
+            self.assertEqual(tokens, {"a": "yy", "b": "x", "c": "y"})
+            os.remove(ytokens)
+            tokens = cdocs.get_tokens("/x/y", addlabels=False)
+            self.assertEqual(tokens, {"a": "x", "b": "x"})
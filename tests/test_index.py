@@ -0,0 +1,111 @@
+from cdocs.cdocs import Cdocs
+from cdocs.root_index import RootIndex
+from cdocs.manifest_index import ManifestIndex, build_manifest, manifest_path
+from cdocs.simple_config import SimpleConfig
+from configparser import ConfigParser
+import unittest
+import tempfile
+import os
+import logging
+
+PATH: str = "docs/example"
+
+
+class IndexTests(unittest.TestCase):
+    def _write(self, path: str, content: str) -> None:
+        with open(path, "w") as f:
+            f.write(content)
+
+    def test_root_index(self):
+        logging.info("IndexTests.test_root_index")
+        index = RootIndex(PATH)
+        teams = os.path.join(PATH, "app/home/teams")
+        self.assertTrue(index.isdir(teams), msg=f"{teams} must be a dir")
+        self.assertTrue(index.exists(teams + ".xml") is False)
+        self.assertTrue(index.isfile(os.path.join(teams, "todo.xml")))
+        self.assertTrue(index.exists(PATH + "/app//home/teams/labels.json"))
+        self.assertFalse(index.exists(os.path.join(teams, "fish.xml")))
+        self.assertIn("todos", index.listdir(teams), msg="must list dirs")
+        self.assertIn("compose.html", index.listdir(teams), msg="must list files")
+        self.assertIsNotNone(index.stat(os.path.join(teams, "todo.xml")))
+        self.assertIsNone(index.stat(teams), msg="dirs have no stamp")
+        # paths outside the root go to the filesystem
+        self.assertTrue(index.isfile("config/config.ini"))
+
+    def test_refresh(self):
+        logging.info("IndexTests.test_refresh")
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, "x", "y"))
+            index = RootIndex(tmp)
+            z = os.path.join(tmp, "x", "y", "z.xml")
+            self.assertFalse(index.exists(z))
+            self._write(z, "z")
+            self.assertFalse(index.exists(z), msg="index must not see unrefreshed changes")
+            index.refresh(z)
+            self.assertTrue(index.isfile(z), msg="refreshed file must be seen")
+            os.makedirs(os.path.join(tmp, "x", "w", "v"))
+            index.refresh(os.path.join(tmp, "x", "w"))
+            self.assertTrue(index.isdir(os.path.join(tmp, "x", "w", "v")))
+            self.assertIn("w", index.listdir(os.path.join(tmp, "x")))
+            os.remove(z)
+            os.rmdir(os.path.join(tmp, "x", "y"))
+            index.refresh(os.path.join(tmp, "x", "y"))
+            self.assertFalse(index.exists(z))
+            self.assertNotIn("y", index.listdir(os.path.join(tmp, "x")))
+
+    def test_cdocs_with_index(self):
+        logging.info("IndexTests.test_cdocs_with_index")
+        with tempfile.TemporaryDirectory() as tmp:
+            parser = ConfigParser()
+            parser.read("config/config.ini")
+            parser.set("index", "enabled", "true")
+            path = os.path.join(tmp, "config.ini")
+            with open(path, "w") as f:
+                parser.write(f)
+            cdocs = Cdocs(PATH, SimpleConfig(path))
+            self.assertIsInstance(cdocs.index, RootIndex)
+            doc = cdocs.get_doc("/app/home/teams/todos/assignee")
+            self.assertIn("assignee in company starstruck!", doc)
+            self.assertIn("my app's name is fruit", doc)
+            docs = cdocs.list_docs("/app/home/teams")
+            self.assertEqual(len(docs), 3, msg=f"must list 3 docs, not {docs}")
+
+    def test_manifest(self):
+        logging.info("IndexTests.test_manifest")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = manifest_path(tmp, "public")
+            count = build_manifest(PATH, path)
+            self.assertGreater(count, 0, msg="manifest must have entries")
+            manifest = ManifestIndex(PATH, path)
+            scanned = RootIndex(PATH)
+            teams = os.path.join(PATH, "app/home/teams")
+            self.assertEqual(len(manifest), count)
+            self.assertTrue(manifest.isdir(teams))
+            self.assertTrue(manifest.isdir(PATH))
+            self.assertTrue(manifest.isfile(os.path.join(teams, "todo.xml")))
+            self.assertFalse(manifest.exists(os.path.join(teams, "fish.xml")))
+            self.assertEqual(
+                sorted(manifest.listdir(teams)), sorted(scanned.listdir(teams))
+            )
+            self.assertEqual(
+                sorted(manifest.listdir(PATH)), sorted(scanned.listdir(PATH))
+            )
+            todo = os.path.join(teams, "todo.xml")
+            self.assertEqual(manifest.stat(todo), scanned.stat(todo))
+            self.assertEqual(len(manifest.hash(todo)), 40, msg="must have a sha1")
+
+    def test_cdocs_with_manifest(self):
+        logging.info("IndexTests.test_cdocs_with_manifest")
+        with tempfile.TemporaryDirectory() as tmp:
+            build_manifest(PATH, manifest_path(tmp, "public"))
+            parser = ConfigParser()
+            parser.read("config/config.ini")
+            parser.set("index", "manifests", tmp)
+            path = os.path.join(tmp, "config.ini")
+            with open(path, "w") as f:
+                parser.write(f)
+            cdocs = Cdocs(PATH, SimpleConfig(path))
+            self.assertIsInstance(cdocs.index, ManifestIndex)
+            doc = cdocs.get_doc("/app/home/teams/todos/assignee+new_assignee")
+            self.assertIn("assignee in company starstruck!", doc)
+            self.assertIn("new assignee", doc)
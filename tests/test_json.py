@@ -0,0 +1,88 @@
+from cdocs.cdocs import Cdocs, JsonDocException
+from cdocs.context import Context
+from cdocs.context_metadata import ContextMetadata
+from cdocs.simple_config import SimpleConfig
+from cdocs.json_cache import deep_merge
+from cdocs.json_codec import JsonCodec, create_codec
+import unittest
+import tempfile
+import json
+import time
+import os
+import logging
+
+
+class CountingCodec(JsonCodec):
+    def __init__(self):
+        self.loads_count = 0
+
+    def loads(self, content):
+        self.loads_count += 1
+        return super().loads(content)
+
+
+class JsonTests(unittest.TestCase):
+    def _root(self, tmp: str) -> Cdocs:
+        root = os.path.join(tmp, "root")
+        os.makedirs(os.path.join(root, "x", "y"))
+        self._write(os.path.join(root, "x", "y.json"), {"a": {"b": 1, "c": [1, 2]}, "d": 1})
+        self._write(os.path.join(root, "x", "y", "z.json"), {"a": {"b": 2, "e": 3}})
+        self._write(os.path.join(root, "x", "y", "tokens.json"), {"name": "fish"})
+        with open(os.path.join(root, "x", "y", "t.json"), "w") as f:
+            f.write('{"name": "{{ name }}"}')
+        with open(os.path.join(root, "x", "y", "bad.json"), "w") as f:
+            f.write("not json")
+        path = os.path.join(tmp, "config.ini")
+        with open(path, "w") as f:
+            f.write(f"[docs]\ntmp = {root}\n[formats]\ntmp = json\n[accepts]\ntmp = json\n")
+        return Cdocs(root, SimpleConfig(path))
+
+    def _write(self, path: str, value) -> None:
+        with open(path, "w") as f:
+            f.write(json.dumps(value))
+
+    def test_get_json(self):
+        logging.info("JsonTests.test_get_json")
+        with tempfile.TemporaryDirectory() as tmp:
+            cdocs = self._root(tmp)
+            codec = CountingCodec()
+            cdocs._codec = codec
+            merged = {"a": {"b": 2, "c": [1, 2], "e": 3}, "d": 1}
+            self.assertEqual(cdocs.get_json("/x/y+z"), merged, msg="plus paths must deep merge")
+            self.assertEqual(cdocs.get_json("/x/y"), {"a": {"b": 1, "c": [1, 2]}, "d": 1})
+            self.assertEqual(codec.loads_count, 2, msg="each file must be parsed once")
+            self.assertIsNone(cdocs.get_json("/x/nothing"))
+            self.assertEqual(cdocs.get_json("/x/y/t"), {"name": "fish"})
+            with self.assertRaises(JsonDocException):
+                cdocs.get_json("/x/y#bad")
+            # a copy can be changed. the cached json can't.
+            copy = cdocs.get_json("/x/y+z")
+            copy["a"]["b"] = 5
+            copy["a"]["c"].append(3)
+            readonly = cdocs.get_json("/x/y+z", readonly=True)
+            self.assertIs(readonly, cdocs.get_json("/x/y+z", readonly=True))
+            self.assertEqual(json.loads(json.dumps(readonly)), merged)
+            with self.assertRaises(TypeError):
+                readonly["a"]["b"] = 5
+            # a new version of a file is parsed again
+            time.sleep(0.01)
+            self._write(os.path.join(tmp, "root", "x", "y", "z.json"), {"e": 4})
+            cdocs.invalidate([os.path.join(tmp, "root", "x", "y", "z.json")])
+            self.assertEqual(cdocs.get_json("/x/y#z"), {"e": 4})
+
+    def test_deep_merge(self):
+        logging.info("JsonTests.test_deep_merge")
+        base = {"a": {"b": 1}, "c": 1}
+        self.assertEqual(deep_merge(base, {"a": {"d": 2}}), {"a": {"b": 1, "d": 2}, "c": 1})
+        self.assertEqual(deep_merge(base, {"a": 1}), {"a": 1, "c": 1})
+        self.assertEqual(base, {"a": {"b": 1}, "c": 1}, msg="the base must not change")
+        self.assertEqual(create_codec("json").name, "json")
+        self.assertIn(create_codec().name, ["json", "orjson"])
+
+    def test_context_get_json(self):
+        logging.info("JsonTests.test_context_get_json")
+        context = Context(ContextMetadata())
+        doc = context.get_json("/app/home+home_screen")
+        self.assertEqual(doc["header"], "Home Screen")
+        self.assertEqual(doc["how-to-use"], "How to use My Home")
+        self.assertIsNone(context.get_json("/app/nothing"))
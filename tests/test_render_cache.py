@@ -0,0 +1,76 @@
+from cdocs.cdocs import Cdocs
+from cdocs.simple_config import SimpleConfig
+import unittest
+import tempfile
+import json
+import os
+import logging
+
+PATH: str = "docs/example"
+
+
+class RenderCacheTests(unittest.TestCase):
+    def _root(self, tmp: str) -> Cdocs:
+        root = os.path.join(tmp, "root")
+        os.makedirs(os.path.join(root, "x", "y"))
+        self._write(os.path.join(root, "x", "tokens.json"), json.dumps({"a": "1"}))
+        self._write(os.path.join(root, "x", "y.xml"), "y {{a}} {{ get_doc('/x/y#z') }}")
+        self._write(os.path.join(root, "x", "y", "z.xml"), "z")
+        self._write(os.path.join(root, "404.xml"), "not found")
+        path = os.path.join(tmp, "config.ini")
+        with open(path, "w") as f:
+            f.write(f"[docs]\ntmp = {root}\n[notfound]\ntmp = /404\n")
+        return Cdocs(root, SimpleConfig(path))
+
+    def _write(self, path: str, content: str) -> None:
+        with open(path, "w") as f:
+            f.write(content)
+
+    def test_rendered_doc_is_cached(self):
+        logging.info("RenderCacheTests.test_rendered_doc_is_cached")
+        docpath = "/app/home/teams/todos/assignee"
+        cdocs = Cdocs(PATH)
+        doc1 = cdocs.get_doc(docpath)
+        hits = cdocs.render_cache.hits
+        doc2 = cdocs.get_doc(docpath.strip("/"))
+        self.assertEqual(doc1, doc2, msg="cached doc must be the same")
+        self.assertGreater(cdocs.render_cache.hits, hits, msg="must hit the cache")
+        key = cdocs._render_key(docpath, "get_doc", True)
+        entry = cdocs.render_cache.get(key)
+        deps = entry.dependencies
+        logging.info(f"RenderCacheTests.test_rendered_doc_is_cached: deps: {deps}")
+        self.assertIn(os.path.join(PATH, "app/home/teams/todos/assignee.xml"), deps)
+        self.assertIn(os.path.join(PATH, "app/home/teams/labels.json"), deps)
+        self.assertIn(os.path.join(PATH, "app/home/teams/todos/tokens.json"), deps)
+
+    def test_dependencies_invalidate(self):
+        logging.info("RenderCacheTests.test_dependencies_invalidate")
+        with tempfile.TemporaryDirectory() as tmp:
+            cdocs = self._root(tmp)
+            root = cdocs.get_doc_root()
+            self.assertEqual(cdocs.get_doc("/x/y"), "y 1 z")
+            # a nested doc
+            self._write(os.path.join(root, "x", "y", "z.xml"), "zz")
+            self.assertEqual(cdocs.get_doc("/x/y"), "y 1 zz")
+            # a tokens file in the chain
+            self._write(os.path.join(root, "x", "tokens.json"), json.dumps({"a": "22"}))
+            self.assertEqual(cdocs.get_doc("/x/y"), "y 22 zz")
+            # a tokens file that didn't exist before
+            self._write(os.path.join(root, "x", "y", "tokens.json"), json.dumps({"a": "3"}))
+            self.assertEqual(cdocs.get_doc("/x/y"), "y 3 zz")
+            hits = cdocs.render_cache.hits
+            self.assertEqual(cdocs.get_doc("/x/y"), "y 3 zz")
+            self.assertGreater(cdocs.render_cache.hits, hits, msg="must hit the cache")
+
+    def test_notfound_is_cached(self):
+        logging.info("RenderCacheTests.test_notfound_is_cached")
+        with tempfile.TemporaryDirectory() as tmp:
+            cdocs = self._root(tmp)
+            root = cdocs.get_doc_root()
+            self.assertEqual(cdocs.get_doc("/x/w"), "not found")
+            hits = cdocs.render_cache.hits
+            self.assertEqual(cdocs.get_doc("/x/w"), "not found")
+            self.assertGreater(cdocs.render_cache.hits, hits, msg="must hit the cache")
+            # the doc that was not found is created
+            self._write(os.path.join(root, "x", "w.xml"), "w")
+            self.assertEqual(cdocs.get_doc("/x/w"), "w")
@@ -0,0 +1,72 @@
+from cdocs.cdocs import Cdocs
+from cdocs.context import Context
+from cdocs.context_metadata import ContextMetadata
+from cdocs.simple_config import SimpleConfig
+import cdocs.render_scope as render_scope
+import unittest
+import tempfile
+import os
+import logging
+
+
+class RenderScopeTests(unittest.TestCase):
+    def _root(self, tmp: str) -> Cdocs:
+        root = os.path.join(tmp, "root")
+        os.makedirs(os.path.join(root, "x", "y"))
+        self._write(os.path.join(root, "x", "y.xml"), "{% for i in range(3) %}{{ get_doc('/x/y#z') }}{% endfor %}")
+        self._write(os.path.join(root, "x", "y", "z.xml"), "z")
+        self._write(os.path.join(root, "x", "y", "self.xml"), "a{{ get_doc('/x/y#other') }}")
+        self._write(os.path.join(root, "x", "y", "other.xml"), "b{{ get_doc('/x/y#self') }}")
+        path = os.path.join(tmp, "config.ini")
+        with open(path, "w") as f:
+            f.write(f"[docs]\ntmp = {root}\n[formats]\ntmp = xml,json\n")
+        return Cdocs(root, SimpleConfig(path))
+
+    def _write(self, path: str, content: str) -> None:
+        with open(path, "w") as f:
+            f.write(content)
+
+    def test_nested_doc_renders_once(self):
+        logging.info("RenderScopeTests.test_nested_doc_renders_once")
+        with tempfile.TemporaryDirectory() as tmp:
+            cdocs = self._root(tmp)
+            calls = []
+            get = cdocs._get_doc_for_root
+
+            def counted(*args, **kwargs):
+                calls.append(args[0])
+                return get(*args, **kwargs)
+
+            cdocs._get_doc_for_root = counted
+            cdocs.render_cache.clear()
+            with cdocs.session() as scope:
+                self.assertEqual(cdocs.get_doc("/x/y"), "zzz")
+                self.assertIs(render_scope.current(), scope)
+                self.assertGreater(len(scope), 0)
+            self.assertEqual(calls.count("/x/y#z"), 1, msg=f"z must render once: {calls}")
+            self.assertIsNone(render_scope.current(), msg="the scope must end with the session")
+
+    def test_cycle(self):
+        logging.info("RenderScopeTests.test_cycle")
+        with tempfile.TemporaryDirectory() as tmp:
+            cdocs = self._root(tmp)
+            # self pulls in other, which pulls in self again. that is cut off.
+            self.assertEqual(cdocs.get_doc("/x/y#self"), "ab")
+            # other was cut short inside self. it is not kept, so on its own
+            # it is whole.
+            self.assertEqual(cdocs.get_doc("/x/y#other"), "ba")
+            self.assertEqual(cdocs.get_doc("/x/y#self"), "ab")
+            with cdocs.session():
+                self.assertEqual(cdocs.get_doc("/x/y#self"), "ab")
+                self.assertEqual(cdocs.get_doc("/x/y#other"), "ba")
+
+    def test_context_session(self):
+        logging.info("RenderScopeTests.test_context_session")
+        context = Context(ContextMetadata())
+        with context.session() as scope:
+            doc = context.get_doc("/app/home/teams/todos/assignee")
+            labels = context.get_labels("/app/home/teams/todos/assignee")
+            with context.session() as inner:
+                self.assertIs(inner, scope)
+        self.assertEqual(doc, context.get_doc("/app/home/teams/todos/assignee"))
+        self.assertEqual(labels, context.get_labels("/app/home/teams/todos/assignee"))
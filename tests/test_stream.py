@@ -0,0 +1,83 @@
+from cdocs.cdocs import Cdocs, BadDocPath
+from cdocs.context import Context
+from cdocs.context_metadata import ContextMetadata
+from cdocs.simple_config import SimpleConfig
+import unittest
+import tempfile
+import json
+import os
+import logging
+
+PATH: str = "docs/example"
+
+
+class StreamTests(unittest.TestCase):
+    def _root(self, tmp: str) -> Cdocs:
+        root = os.path.join(tmp, "root")
+        os.makedirs(os.path.join(root, "x", "y"))
+        with open(os.path.join(root, "x", "y.xml"), "w") as f:
+            f.write("{% for i in range(3) %}{{ i }}{{ get_doc('/x/y#z') }}{% endfor %}")
+        with open(os.path.join(root, "x", "y", "z.xml"), "w") as f:
+            f.write("z")
+        with open(os.path.join(root, "x", "y", "w.xml"), "w") as f:
+            f.write("w")
+        with open(os.path.join(root, "x", "y", "a.json"), "w") as f:
+            f.write(json.dumps({"a": 1}))
+        with open(os.path.join(root, "x", "y", "b.json"), "w") as f:
+            f.write(json.dumps({"b": 2}))
+        with open(os.path.join(root, "x", "y", "page.concat"), "w") as f:
+            f.write("/x/y#z\n/x/y#w")
+        path = os.path.join(tmp, "config.ini")
+        with open(path, "w") as f:
+            f.write(f"[docs]\ntmp = {root}\n[formats]\ntmp = xml,json\n")
+        return Cdocs(root, SimpleConfig(path))
+
+    def test_get_doc_stream(self):
+        logging.info("StreamTests.test_get_doc_stream")
+        cdocs = Cdocs(PATH)
+        for path in [
+            "/app/home/teams/todos/assignee",
+            "/app/home/teams/todos/assignee#new_assignee",
+            "/app/home/teams/todos/assignee#include",
+            "/not/a/doc",
+        ]:
+            cdocs.render_cache.clear()
+            stream = cdocs.get_doc_stream(path)
+            self.assertIsNotNone(stream, msg=f"{path} must have a stream")
+            self.assertEqual("".join(stream), cdocs.get_doc(path), msg=path)
+        self.assertIsNone(cdocs.get_doc_stream("/not/a/doc", False))
+        cdocs.render_cache.clear()
+        path = "/app/home/teams/compose.html"
+        self.assertEqual(
+            "".join(cdocs.get_compose_doc_stream(path)), cdocs.get_compose_doc(path)
+        )
+
+    def test_chunks(self):
+        logging.info("StreamTests.test_chunks")
+        with tempfile.TemporaryDirectory() as tmp:
+            cdocs = self._root(tmp)
+            chunks = list(cdocs.get_doc_stream("/x/y"))
+            self.assertGreater(len(chunks), 1, msg="a template must stream in chunks")
+            self.assertEqual("".join(chunks), "0z1z2z")
+            self.assertEqual("".join(cdocs.get_doc_stream("/x/y#z+w")), "z w")
+            self.assertEqual("".join(cdocs.get_concat_doc_stream("/x/y/page.concat")), "z w")
+            merged = "".join(cdocs.get_doc_stream("/x/y#a+b"))
+            self.assertEqual(json.loads(merged), {"a": 1, "b": 2})
+            with self.assertRaises(BadDocPath):
+                cdocs.transformer.transform_stream("z")
+            with self.assertRaises(BadDocPath):
+                cdocs.transformer.transform("z")
+
+    def test_context_stream(self):
+        logging.info("StreamTests.test_context_stream")
+        context = Context(ContextMetadata())
+        for path in [
+            "/app/home/teams",
+            "/app/home/teams/todos/assignee",
+            "/not/a/doc",
+        ]:
+            stream = context.get_doc_stream(path)
+            self.assertEqual("".join(stream), context.get_doc(path), msg=path)
+        doc = "".join(context.get_doc_stream("app/home/teams#delete_assignee+todo"))
+        self.assertNotEqual(doc.find("edit assignee"), -1)
+        self.assertNotEqual(doc.find("my app name: you should see"), -1)
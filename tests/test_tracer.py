@@ -0,0 +1,44 @@
+from cdocs.cdocs import Cdocs
+import cdocs.tracer as tracer
+import unittest
+import tempfile
+import json
+import os
+import logging
+
+PATH: str = "docs/example"
+
+
+class TracerTests(unittest.TestCase):
+    def test_off(self):
+        logging.info("TracerTests.test_off")
+        self.assertIsNone(tracer.get_tracer())
+        self.assertIs(tracer.span("read", filepath="x"), tracer.NO_SPAN)
+        with tracer.span("read") as span:
+            span.set("bytes", 1)
+
+    def test_spans(self):
+        logging.info("TracerTests.test_spans")
+        recorder = tracer.RecordingTracer()
+        old = tracer.set_tracer(recorder)
+        try:
+            cdocs = Cdocs(PATH)
+            cdocs.render_cache.clear()
+            cdocs.get_doc("/app/home/teams/todos/assignee")
+            cdocs.get_concat_doc("/app/home/teams/todos/assignee/concat.concat")
+        finally:
+            tracer.set_tracer(old)
+        names = {span.name for span in recorder.spans}
+        for name in ["get_doc", "pather", "read", "finder", "transform", "concat"]:
+            self.assertIn(name, names, msg=f"there must be a {name} span")
+        read = [span for span in recorder.spans if span.name == "read"][0]
+        self.assertIn("filepath", read.attrs)
+        self.assertIn("bytes", read.attrs)
+        self.assertGreater(recorder.stats()["get_doc"]["count"], 0)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.json")
+            recorder.write_chrome(path)
+            with open(path) as f:
+                events = json.load(f)["traceEvents"]
+        self.assertEqual(len(events), len(recorder.spans))
+        self.assertEqual(events[0]["ph"], "X")
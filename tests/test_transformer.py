@@ -0,0 +1,103 @@
+from cdocs.cdocs import Cdocs
+from cdocs.template_cache import TemplateCache
+from cdocs.simple_config import SimpleConfig
+import unittest
+import tempfile
+import json
+import os
+import logging
+
+PATH: str = "docs/example"
+
+
+class TransformerTests(unittest.TestCase):
+    def test_template_cache_hits(self):
+        logging.info("TransformerTests.test_template_cache_hits")
+        docpath = "/app/home/teams/todos/assignee"
+        cdocs = Cdocs(PATH)
+        cache = cdocs.transformer.cache
+        doc1 = cdocs.get_doc(docpath)
+        misses = cache.misses
+        hits = cache.hits
+        # the rendered doc is cached too. drop it to render again.
+        cdocs.render_cache.clear()
+        doc2 = cdocs.get_doc(docpath)
+        logging.info(f"TransformerTests.test_template_cache_hits: {cache.stats()}")
+        self.assertEqual(doc1, doc2, msg="cached template must render the same doc")
+        self.assertEqual(misses, cache.misses, msg="second get_doc must not miss")
+        self.assertGreater(cache.hits, hits, msg="second get_doc must hit the cache")
+
+    def test_template_cache_evicts(self):
+        logging.info("TransformerTests.test_template_cache_evicts")
+        cache = TemplateCache(2)
+        for i in range(3):
+            key = cache.key_for(f"content {i}")
+            cache.put(key, i)
+        self.assertEqual(len(cache), 2, msg="cache must not grow past maxsize")
+        self.assertEqual(cache.evictions, 1, msg="one entry must be evicted")
+        self.assertIsNone(cache.get(cache.key_for("content 0")))
+        self.assertEqual(cache.get(cache.key_for("content 2")), 2)
+
+    def test_shared_environment(self):
+        logging.info("TransformerTests.test_shared_environment")
+        cdocs = Cdocs(PATH)
+        env = cdocs.transformer.environment
+        self.assertIs(env, cdocs.transformer.environment, msg="env must be reused")
+        self.assertIn("get_doc", env.globals, msg="get_doc must be a global")
+        self.assertIn("docroot", env.globals, msg="docroot must be a global")
+
+    def test_include_by_docpath(self):
+        logging.info("TransformerTests.test_include_by_docpath")
+        docpath = "/app/home/teams/todos/assignee#include"
+        cdocs = Cdocs(PATH)
+        doc = cdocs.get_doc(docpath)
+        logging.info(f"TransformerTests.test_include_by_docpath: doc: {doc}")
+        self.assertIn("included: new assignee", doc, msg=f"{doc} must include")
+
+    def test_only_used_names_are_found(self):
+        logging.info("TransformerTests.test_only_used_names_are_found")
+        with tempfile.TemporaryDirectory() as tmp:
+            root = os.path.join(tmp, "root")
+            os.makedirs(os.path.join(root, "x"))
+            docs = {
+                "plain.xml": "no template here",
+                "tokens.xml": "a is {{ a }}",
+                "labels.xml": "b is {{ label__b }}",
+                "include.xml": "{% include '/x/labels' %}",
+            }
+            for name, content in docs.items():
+                with open(os.path.join(root, "x", name), "w") as f:
+                    f.write(content)
+            with open(os.path.join(root, "x", "tokens.json"), "w") as f:
+                f.write(json.dumps({"a": "1"}))
+            with open(os.path.join(root, "x", "labels.json"), "w") as f:
+                f.write(json.dumps({"b": "2"}))
+            path = os.path.join(tmp, "config.ini")
+            with open(path, "w") as f:
+                f.write(f"[docs]\ntmp = {root}\n")
+            cdocs = Cdocs(root, SimpleConfig(path))
+            calls = []
+            get_tokens = cdocs.get_tokens
+            get_labels = cdocs.get_labels
+            cdocs.get_tokens = lambda *a, **k: calls.append("tokens") or get_tokens(*a, **k)
+            cdocs.get_labels = lambda *a, **k: calls.append("labels") or get_labels(*a, **k)
+            expected = {
+                "plain": ("no template here", []),
+                "tokens": ("a is 1", ["tokens"]),
+                "labels": ("b is 2", ["tokens", "labels"]),
+                "include": ("b is 2", ["tokens", "labels"]),
+            }
+            for name, (doc, found) in expected.items():
+                calls.clear()
+                self.assertEqual(cdocs.get_doc(f"/x/{name}"), doc)
+                self.assertEqual(sorted(set(calls)), sorted(found), msg=f"{name} found {calls}")
+
+    def test_plain_content_renders_like_jinja(self):
+        logging.info("TransformerTests.test_plain_content_renders_like_jinja")
+        cdocs = Cdocs(PATH)
+        transformer = cdocs.transformer
+        for content in ["NO GOOD!\n", "\nedit assignee\n\n", "a\r\nb\r\n", "no newline"]:
+            expected = transformer.environment.from_string(content).render()
+            self.assertEqual(transformer.transform(content, "/x/y"), expected)
+            self.assertEqual("".join(transformer.transform_stream(content, "/x/y")), expected)
+        self.assertEqual(cdocs.get_doc("/404a"), "NO GOOD!")
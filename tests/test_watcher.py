@@ -0,0 +1,150 @@
+from cdocs.cdocs import Cdocs
+from cdocs.simple_config import SimpleConfig
+from cdocs.polling_watcher import PollingWatcher
+import cdocs.inotify_watcher as inotify
+import unittest
+import tempfile
+import time
+import json
+import os
+import logging
+
+
+class WatcherTests(unittest.TestCase):
+    def _root(self, tmp: str, indexed: str = "false") -> Cdocs:
+        root = os.path.join(tmp, "root")
+        os.makedirs(os.path.join(root, "x", "y"))
+        self._write(os.path.join(root, "x", "tokens.json"), json.dumps({"a": "1"}))
+        self._write(os.path.join(root, "x", "y.xml"), "y {{a}}")
+        self._write(os.path.join(root, "x", "y", "z.xml"), "z")
+        path = os.path.join(tmp, "config.ini")
+        with open(path, "w") as f:
+            f.write(
+                f"[docs]\ntmp = {root}\n[index]\nenabled = {indexed}\n"
+                + "[watch]\ninterval = 0.05\ndebounce = 0.05\n"
+            )
+        return Cdocs(root, SimpleConfig(path))
+
+    def _write(self, path: str, content: str) -> None:
+        with open(path, "w") as f:
+            f.write(content)
+
+    def _wait_for(self, test, seconds: float = 5) -> bool:
+        end = time.monotonic() + seconds
+        while time.monotonic() < end:
+            if test():
+                return True
+            time.sleep(0.02)
+        return False
+
+    def test_invalidate(self):
+        logging.info("WatcherTests.test_invalidate")
+        with tempfile.TemporaryDirectory() as tmp:
+            cdocs = self._root(tmp, "true")
+            root = cdocs.get_doc_root()
+            self.assertEqual(cdocs.get_doc("/x/y"), "y 1")
+            self.assertEqual(cdocs.get_doc("/x/y#z"), "z")
+            self.assertEqual(len(cdocs.render_cache), 2)
+            # the index doesn't see the new file until it is told
+            self._write(os.path.join(root, "x", "y", "w.xml"), "w")
+            self.assertIsNone(cdocs.get_doc("/x/y#w", False))
+            cdocs.invalidate([os.path.join(root, "x", "y")])
+            self.assertEqual(cdocs.get_doc("/x/y#w"), "w")
+            # docs that used anything below x/y were dropped. that includes /x/y,
+            # which looked for x/y/tokens.json
+            self.assertIsNone(cdocs.render_cache.get(cdocs._render_key("/x/y#z", "get_doc", True)))
+            self.assertIsNone(cdocs.render_cache.get(cdocs._render_key("/x/y", "get_doc", True)))
+            # only docs that used x/y.xml are dropped
+            self.assertEqual(cdocs.get_doc("/x/y"), "y 1")
+            self.assertEqual(cdocs.get_doc("/x/y#z"), "z")
+            self._write(os.path.join(root, "x", "y.xml"), "yy {{a}}")
+            cdocs.invalidate([os.path.join(root, "x", "y.xml")])
+            self.assertIsNone(cdocs.render_cache.get(cdocs._render_key("/x/y", "get_doc", True)))
+            self.assertIsNotNone(cdocs.render_cache.get(cdocs._render_key("/x/y#z", "get_doc", True)))
+            self.assertEqual(cdocs.get_doc("/x/y"), "yy 1")
+
+    def test_polling_diff(self):
+        logging.info("WatcherTests.test_polling_diff")
+        old = {"a": (False, 1, 1), "b": (False, 1, 1), "d": (True, 0, 0)}
+        new = {"a": (False, 1, 1), "b": (False, 2, 1), "c": (False, 1, 1)}
+        changed = PollingWatcher.diff(old, new)
+        self.assertEqual(sorted(changed), ["b", "c", "d"])
+
+    def test_dot_paths_are_ignored(self):
+        logging.info("WatcherTests.test_dot_paths_are_ignored")
+        with tempfile.TemporaryDirectory() as tmp:
+            cdocs = self._root(tmp)
+            root = cdocs.get_doc_root()
+            watcher = PollingWatcher(cdocs)
+            seen = []
+            watcher.add_listener(lambda paths: seen.extend(paths))
+            watcher._dispatch([
+                os.path.join(root, ".last_change"),
+                os.path.join(root, ".git", "index"),
+                os.path.join(root, "x", ".cache", "y.xml"),
+                os.path.join(root, "x", "y.xml"),
+            ])
+            self.assertEqual(seen, [os.path.join(root, "x", "y.xml")])
+
+    def _test_watcher(self, method: str):
+        with tempfile.TemporaryDirectory() as tmp:
+            cdocs = self._root(tmp, "true")
+            root = cdocs.get_doc_root()
+            seen = []
+            self.assertEqual(cdocs.get_doc("/x/y"), "y 1")
+            watcher = cdocs.watch(method)
+            try:
+                watcher.add_listener(lambda paths: seen.extend(paths))
+                self.assertTrue(watcher.running)
+                self._write(os.path.join(root, "x", "tokens.json"), json.dumps({"a": "2"}))
+                changed = self._wait_for(lambda: cdocs.get_doc("/x/y") == "y 2")
+                self.assertTrue(changed, msg=f"{method} must see the change")
+                self.assertIn(os.path.join(root, "x", "tokens.json"), seen)
+                self.assertIsNotNone(cdocs.get_last_change())
+                # a new directory and a doc in it
+                os.makedirs(os.path.join(root, "x", "v"))
+                self._write(os.path.join(root, "x", "v", "u.xml"), "u")
+                found = self._wait_for(lambda: cdocs.get_doc("/x/v#u", False) == "u")
+                self.assertTrue(found, msg=f"{method} must see the new doc")
+            finally:
+                cdocs.stop_watching()
+            self.assertFalse(watcher.running)
+
+    def test_polling_watcher(self):
+        logging.info("WatcherTests.test_polling_watcher")
+        self._test_watcher("poll")
+
+    @unittest.skipUnless(inotify.available(), "inotify is not available")
+    def test_inotify_watcher(self):
+        logging.info("WatcherTests.test_inotify_watcher")
+        self._test_watcher("inotify")
+
+    @unittest.skipUnless(inotify.available(), "inotify is not available")
+    def test_inotify_moved_directory(self):
+        logging.info("WatcherTests.test_inotify_moved_directory")
+        with tempfile.TemporaryDirectory() as tmp:
+            cdocs = self._root(tmp)
+            root = cdocs.get_doc_root()
+            seen = []
+            watcher = cdocs.watch("inotify")
+            try:
+                watcher.add_listener(lambda paths: seen.extend(paths))
+                # moved within the root, changes are seen at the new place
+                os.rename(os.path.join(root, "x", "y"), os.path.join(root, "x", "w"))
+                self.assertTrue(self._wait_for(lambda: os.path.join(root, "x", "w") in seen))
+                self._write(os.path.join(root, "x", "w", "z.xml"), "zz")
+                moved = os.path.join(root, "x", "w", "z.xml")
+                self.assertTrue(self._wait_for(lambda: moved in seen), msg=f"{seen}")
+                # moved out of the root, changes are not seen at all
+                outside = os.path.join(tmp, "outside")
+                del seen[:]
+                os.rename(os.path.join(root, "x", "w"), outside)
+                self.assertTrue(self._wait_for(lambda: os.path.join(root, "x", "w") in seen))
+                del seen[:]
+                self._write(os.path.join(outside, "z.xml"), "zzz")
+                time.sleep(0.3)
+                self.assertEqual(seen, [])
+                self.assertTrue(all(p.startswith(root) for p in watcher._paths.values()))
+                self.assertNotIn(os.path.join(root, "x", "w"), watcher._paths.values())
+            finally:
+                cdocs.stop_watching()
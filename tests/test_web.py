@@ -0,0 +1,157 @@
+from cdocs.context import Context
+from cdocs.context_metadata import ContextMetadata
+from cdocs.simple_config import SimpleConfig
+from cdocs.web import CdocsApp, Client
+from email.utils import formatdate
+import unittest
+import tempfile
+import asyncio
+import gzip
+import json
+import time
+import os
+import logging
+
+
+class WebTests(unittest.TestCase):
+    def _context(self, tmp: str) -> Context:
+        root = os.path.join(tmp, "root")
+        os.makedirs(os.path.join(root, "x", "y"))
+        self._write(os.path.join(root, "x", "y.xml"), "{{ name }} is here")
+        self._write(os.path.join(root, "x", "tokens.json"), '{"name": "fred"}')
+        self._write(os.path.join(root, "x", "labels.json"), '{"title": "x"}')
+        self._write(os.path.join(root, "x", "y", "big.xml"), "b" * 5000)
+        self._write(os.path.join(root, "x", "y", "pic.png"), "p" * 1000)
+        path = os.path.join(tmp, "config.ini")
+        with open(path, "w") as f:
+            f.write(
+                f"[docs]\ntmp = {root}\n[formats]\ntmp = xml,json,png\n"
+                "[accepts]\ntmp = cdocs,json,png\n[filenames]\nplus = +\n"
+            )
+        return Context(ContextMetadata(SimpleConfig(path)))
+
+    def _write(self, path: str, content: str) -> None:
+        with open(path, "w") as f:
+            f.write(content)
+
+    def test_get_doc(self):
+        logging.info("WebTests.test_get_doc")
+        with tempfile.TemporaryDirectory() as tmp:
+            context = self._context(tmp)
+            client = Client(CdocsApp(context))
+            response = client.get("/doc/x/y")
+            self.assertEqual(response.status, 200)
+            self.assertEqual(response.content, b"fred is here")
+            etag = response.header("ETag")
+            self.assertIsNotNone(etag)
+            self.assertIsNotNone(response.header("Last-Modified"))
+            self.assertEqual(client.get("/doc/x/y?roots=tmp").content, b"fred is here")
+            self.assertEqual(client.get("/doc/x/nothing?notfound=false").status, 404)
+            self.assertEqual(client.get("/nowhere/x/y").status, 404)
+            self.assertEqual(client.get("/doc/x/y?roots=tmp,nothing").status, 400)
+            self.assertEqual(client.get("/changes?roots=nothing").status, 400)
+            self.assertEqual(client.head("/doc/x/y").content, b"")
+
+    def test_not_modified_without_rendering(self):
+        logging.info("WebTests.test_not_modified_without_rendering")
+        with tempfile.TemporaryDirectory() as tmp:
+            context = self._context(tmp)
+            cdocs = context.keyed_cdocs["tmp"]
+            client = Client(CdocsApp(context))
+            etag = client.get("/doc/x/y").header("ETag")
+            calls = []
+            get = cdocs.get_doc
+
+            def counted(*args, **kwargs):
+                calls.append(args[0])
+                return get(*args, **kwargs)
+
+            cdocs.get_doc = counted
+            response = client.get("/doc/x/y", {"If-None-Match": etag})
+            self.assertEqual(response.status, 304)
+            self.assertEqual(response.content, b"")
+            self.assertEqual(calls, [], msg="a 304 must not render")
+            # a change to a tokens file the doc uses is a new version
+            self._write(os.path.join(tmp, "root", "x", "tokens.json"), '{"name": "barney"}')
+            response = client.get("/doc/x/y", {"If-None-Match": etag})
+            self.assertEqual(response.status, 200)
+            self.assertEqual(response.content, b"barney is here")
+            self.assertNotEqual(response.header("ETag"), etag)
+
+    def test_if_modified_since(self):
+        logging.info("WebTests.test_if_modified_since")
+        with tempfile.TemporaryDirectory() as tmp:
+            client = Client(CdocsApp(self._context(tmp)))
+            response = client.get("/doc/x/y", {"If-Modified-Since": formatdate(time.time() + 60, usegmt=True)})
+            self.assertEqual(response.status, 304)
+            response = client.get("/doc/x/y", {"If-Modified-Since": formatdate(0, usegmt=True)})
+            self.assertEqual(response.status, 200)
+
+    def test_json_routes(self):
+        logging.info("WebTests.test_json_routes")
+        with tempfile.TemporaryDirectory() as tmp:
+            client = Client(CdocsApp(self._context(tmp), prefix="/cdocs"))
+            response = client.get("/cdocs/tokens/x/y")
+            self.assertEqual(response.header("Content-Type"), "application/json")
+            self.assertEqual(json.loads(response.content)["name"], "fred")
+            self.assertEqual(json.loads(client.get("/cdocs/labels/x/y?roots=tmp").content)["title"], "x")
+            docs = json.loads(client.get("/cdocs/list/x/y").content)
+            self.assertIn("y.xml", docs)
+            etag = client.get("/cdocs/list/x/y").header("ETag")
+            self.assertEqual(client.get("/cdocs/list/x/y", {"If-None-Match": etag}).status, 304)
+            self.assertEqual(client.get("/tokens/x/y").status, 404)
+
+    def test_gzip(self):
+        logging.info("WebTests.test_gzip")
+        with tempfile.TemporaryDirectory() as tmp:
+            client = Client(CdocsApp(self._context(tmp)))
+            plain = client.get("/doc/x/y/big")
+            self.assertIsNone(plain.header("Content-Encoding"))
+            zipped = client.get("/doc/x/y/big", {"Accept-Encoding": "gzip, br"})
+            self.assertEqual(zipped.header("Content-Encoding"), "gzip")
+            self.assertEqual(gzip.decompress(zipped.content), plain.content)
+            self.assertNotEqual(zipped.header("ETag"), plain.header("ETag"))
+            response = client.get("/doc/x/y/big", {"If-None-Match": zipped.header("ETag")})
+            self.assertEqual(response.status, 304)
+
+    def test_binary(self):
+        logging.info("WebTests.test_binary")
+        with tempfile.TemporaryDirectory() as tmp:
+            client = Client(CdocsApp(self._context(tmp)))
+            response = client.get("/binary/x/y/pic.png")
+            self.assertEqual(response.status, 200)
+            self.assertEqual(response.header("Content-Type"), "image/png")
+            self.assertEqual(response.content, b"p" * 1000)
+            etag = response.header("ETag")
+            self.assertEqual(client.get("/binary/x/y/pic.png", {"If-None-Match": etag}).status, 304)
+            response = client.get("/binary/x/y/pic.png", {"Range": "bytes=10-19"})
+            self.assertEqual(response.status, 206)
+            self.assertEqual(response.header("Content-Range"), "bytes 10-19/1000")
+            self.assertEqual(response.content, b"p" * 10)
+            self.assertEqual(client.get("/binary/x/y/pic.png", {"Range": "bytes=5000-"}).status, 416)
+            with gzip.open(os.path.join(tmp, "root", "x", "y", "pic.png.gz"), "wb") as f:
+                f.write(b"p" * 1000)
+            response = client.get("/binary/x/y/pic.png", {"Accept-Encoding": "gzip"})
+            self.assertEqual(response.header("Content-Encoding"), "gzip")
+            self.assertEqual(gzip.decompress(response.content), b"p" * 1000)
+            self.assertEqual(response.header("ETag"), etag[:-1] + '-gz"')
+            response = client.get("/binary/x/y/pic.png", {"If-None-Match": response.header("ETag")})
+            self.assertEqual(response.status, 304)
+            self.assertEqual(client.get("/binary/x/y/nothing.png").status, 404)
+
+    def test_asgi(self):
+        logging.info("WebTests.test_asgi")
+        with tempfile.TemporaryDirectory() as tmp:
+            app = CdocsApp(self._context(tmp))
+            sent = []
+
+            async def receive():
+                return {"type": "http.request", "body": b""}
+
+            async def send(message):
+                sent.append(message)
+
+            scope = {"type": "http", "method": "GET", "path": "/doc/x/y", "query_string": b"", "headers": []}
+            asyncio.run(app.asgi(scope, receive, send))
+            self.assertEqual(sent[0]["status"], 200)
+            self.assertEqual(b"".join(m.get("body", b"") for m in sent[1:]), b"fred is here")